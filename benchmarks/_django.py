@@ -0,0 +1,64 @@
+"""
+Shared setup for the benchmark scripts.
+
+The benchmarks run in-process against a throwaway copy of the database so they
+never touch `src/db.sqlite3`.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+SRC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"
+)
+
+
+def setup():
+    """
+    Puts `src` on the path and configures Django.
+    """
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Creates a migrated scratch database for the duration of the block, the same
+    way the Django test runner does.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def throughput(func, duration: float = 2.0) -> float:
+    """
+    Calls `func` repeatedly for roughly `duration` seconds.
+
+    Returns:
+        float: Calls per second.
+    """
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < duration:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+    return calls / elapsed
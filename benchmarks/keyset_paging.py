@@ -0,0 +1,74 @@
+"""
+Compares page latency at increasing depth into a large thread for keyset
+pagination against OFFSET pagination.
+
+    poetry run python benchmarks/keyset_paging.py [--messages 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import _django  # noqa: E402
+
+
+def timed(func, repeat: int = 20) -> float:
+    """
+    Returns the best-of-`repeat` wall time of `func` in milliseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=100000)
+    args = parser.parse_args()
+
+    _django.setup()
+
+    from django.utils import timezone
+
+    from messageboard.factories import TopicFactory, UserFactory
+    from messageboard.models import Message
+    from messageboard.pagination import encode_cursor
+
+    with _django.benchmark_database():
+        author = UserFactory()
+        thread = TopicFactory().create_thread(title="Deep thread", author=author)
+        start = timezone.now()
+        Message.objects.bulk_create(
+            (
+                Message(
+                    content="lorem ipsum",
+                    thread=thread,
+                    author=author,
+                    created_date=start + timedelta(seconds=i),
+                )
+                for i in range(args.messages)
+            )
+        )
+
+        page_size = thread.MESSAGES_PER_PAGE
+        print(f"{'depth':>8} {'keyset ms':>10} {'offset ms':>10}")
+        for fraction in (0, 0.25, 0.5, 0.75, 0.99):
+            depth = int(args.messages * fraction)
+            cursor = None
+            if depth:
+                cursor = encode_cursor(thread.messages[depth - 1])
+            keyset = timed(lambda: thread.paginate_messages(after=cursor))
+            end = depth + page_size
+            offset = timed(lambda: list(thread.messages[depth:end]))
+            print(f"{depth:>8} {keyset:>10.2f} {offset:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
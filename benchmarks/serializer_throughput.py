@@ -0,0 +1,102 @@
+"""
+Compares serializer and renderer throughput for a page of the Message and
+Thread lists: ModelSerializer rows rendered by DRF's JSONRenderer, against
+ValuesSerializer rows rendered by FastJSONRenderer (orjson when installed),
+and checks both produce the same bytes. The last line times the whole API
+request, as clients see it.
+
+    poetry run python benchmarks/serializer_throughput.py [--rows 1000]
+"""
+
+import argparse
+import os
+import sys
+from datetime import timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import _django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    _django.setup()
+
+    from django.test import Client
+    from django.utils import timezone
+    from rest_framework.renderers import JSONRenderer
+
+    from messageboard import renderers
+    from messageboard.factories import TopicFactory, UserFactory
+    from messageboard.models import Message, Thread
+    from messageboard.renderers import FastJSONRenderer
+    from messageboard.serializers import (
+        MessageSerializer,
+        ThreadSerializer,
+        ValuesSerializer,
+    )
+
+    with _django.benchmark_database():
+        author = UserFactory()
+        topic = TopicFactory()
+        start = timezone.now()
+        Thread.objects.bulk_create(
+            Thread(
+                title=f"Thread {i}",
+                topic=topic,
+                author=author,
+                created_date=start + timedelta(seconds=i),
+            )
+            for i in range(args.rows)
+        )
+        thread = Thread.objects.first()
+        Message.objects.bulk_create(
+            Message(
+                content="Lorem ipsum dolor sit amet, “consectetur” adipiscing elit. "
+                * 4,
+                thread=thread,
+                author=author,
+                created_date=start + timedelta(seconds=i),
+            )
+            for i in range(args.rows)
+        )
+
+        print(f"orjson: {'installed' if renderers.orjson else 'not installed'}")
+        print(f"{'':<10} {'path':<28} {'pages/s':>9} {'rows/s':>11}")
+        for name, model, serializer_class in (
+            ("messages", Message, MessageSerializer),
+            ("threads", Thread, ThreadSerializer),
+        ):
+            queryset = model.objects.order_by("created_date", "id")
+            values = ValuesSerializer(serializer_class)
+
+            def baseline():
+                data = serializer_class(list(queryset), many=True).data
+                return JSONRenderer().render(data)
+
+            def fast():
+                return FastJSONRenderer().render(
+                    values.represent(values.rows(queryset))
+                )
+
+            if baseline() != fast():
+                print(f"MISMATCH between the two paths for {name}")
+            for path, func in (
+                ("ModelSerializer + json", baseline),
+                ("values_list + fast renderer", fast),
+            ):
+                rate = _django.throughput(func, args.duration)
+                print(f"{name:<10} {path:<28} {rate:9.1f} {rate * args.rows:11.0f}")
+
+        client = Client()
+        url = f"/api/messages/?page_size={args.rows}"
+        rate = _django.throughput(lambda: client.get(url), args.duration)
+        print(f"{'api':<10} {url:<28} {rate:9.1f} {rate * args.rows:11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Measures concurrent read and write throughput of the REST API on a file
+database, under each SQLite profile of config.settings: writer threads post
+Messages with a token while reader threads list them.
+
+"default" is SQLite's own configuration: a rollback journal, a connection per
+request and no retries. "production" adds write-ahead logging, the other
+PRAGMAs of the profile, persistent connections and retries on lock contention.
+
+    poetry run python benchmarks/sqlite_concurrency.py [--writers 4] [--readers 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import _django  # noqa: E402
+
+# Settings of each profile besides its PRAGMAs
+PROFILES = {
+    "default": {"CONN_MAX_AGE": 0, "MESSAGEBOARD_DB_LOCK_RETRIES": 0},
+    "production": {"CONN_MAX_AGE": 60, "MESSAGEBOARD_DB_LOCK_RETRIES": 3},
+}
+
+
+def worker(kind: str, data: dict, token: str, stop: threading.Event, tally: Counter):
+    """
+    Makes requests until `stop` is set, counting those that succeed and those
+    that fail by kind.
+    """
+    from django.db import OperationalError, close_old_connections, connection
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+    while not stop.is_set():
+        try:
+            if kind == "write":
+                response = client.post("/api/messages/", data, format="json")
+            else:
+                response = client.get("/api/messages/", {"page_size": 20})
+            outcome = "ok" if response.status_code < 400 else "failed"
+        except OperationalError:
+            outcome = "locked"
+        tally[f"{kind} {outcome}"] += 1
+        # The test client skips the end-of-request signal, where Django closes
+        # connections older than CONN_MAX_AGE
+        close_old_connections()
+    connection.close()
+
+
+def run_profile(name: str, writers: int, readers: int, duration: float) -> tuple:
+    from django.conf import settings
+    from django.db import connection
+    from django.test import override_settings
+    from django.utils import timezone
+    from rest_framework.authtoken.models import Token
+
+    from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+
+    profile = dict(PROFILES[name])
+    # New threads' connections are configured from settings.DATABASES
+    settings.DATABASES["default"]["CONN_MAX_AGE"] = profile.pop("CONN_MAX_AGE")
+    path = os.path.join(
+        tempfile.gettempdir(), f"messageboard-concurrency-{name}.sqlite3"
+    )
+    connection.settings_dict["TEST"]["NAME"] = path
+    local_caches = {
+        alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        for alias in ("default", "pages")
+    }
+
+    with override_settings(
+        MESSAGEBOARD_SQLITE_PRAGMAS=settings.SQLITE_PROFILES[name],
+        CACHES=local_caches,
+        **profile,
+    ), _django.benchmark_database():
+        author = UserFactory()
+        thread = ThreadFactory(topic=TopicFactory(), author=author)
+        for i in range(100):
+            thread.create_message(content=f"Message {i}", author=author)
+        token = Token.objects.create(user=author).key
+        data = {
+            "content": "Lorem ipsum dolor sit amet",
+            "thread": thread.id,
+            "author": author.id,
+            "created_date": timezone.now().isoformat(),
+        }
+        connection.close()
+
+        stop = threading.Event()
+        tallies = [Counter() for _ in range(writers + readers)]
+        kinds = ["write"] * writers + ["read"] * readers
+        threads = [
+            threading.Thread(target=worker, args=(kind, data, token, stop, tally))
+            for kind, tally in zip(kinds, tallies)
+        ]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        time.sleep(duration)
+        stop.set()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    return sum(tallies, Counter()), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    _django.setup()
+
+    import logging
+
+    logging.getLogger("messageboard.requests").setLevel(logging.ERROR)
+
+    print(
+        f"{args.writers} writers, {args.readers} readers, {args.duration:g}s\n"
+        f"{'profile':<12} {'writes/s':>9} {'reads/s':>9} {'locked':>7} {'failed':>7}"
+    )
+    for name in PROFILES:
+        tally, elapsed = run_profile(name, args.writers, args.readers, args.duration)
+        print(
+            f"{name:<12} {tally['write ok'] / elapsed:9.1f} "
+            f"{tally['read ok'] / elapsed:9.1f} "
+            f"{tally['write locked'] + tally['read locked']:7d} "
+            f"{tally['write failed'] + tally['read failed']:7d}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Benchmarks every named route of the board and its accounts API, in process
+through the Django test client, against seeded boards of several sizes.
+
+For each size and case, reports throughput, p50/p95/p99 latency and the number
+of SQL statements per request, as JSON. With `--baseline`, compares the run
+against an earlier one and exits with status 1 if any case regressed: slower
+beyond `--threshold` at p50 or p95, or running more queries.
+
+    poetry run python benchmarks/suite.py --output baseline.json
+    poetry run python benchmarks/suite.py --baseline baseline.json
+
+Only the request itself is timed; building its data (such as the Message a
+delete removes) is not. Caches are per run, in memory. The cases are
+those of `src/messageboard/tests/routes.py`, whose queries the tests budget.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import _django  # noqa: E402
+
+# seed_database options per board size
+SIZES = {
+    "small": {"topics": 2, "threads": 5, "messages": 10},
+    "medium": {"topics": 5, "threads": 20, "messages": 50},
+    "large": {"topics": 10, "threads": 50, "messages": 200},
+}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Nearest-rank percentile of sorted `values`.
+    """
+    index = max(0, min(len(values) - 1, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+def run_case(board, case, requests: int, warmup: int) -> dict:
+    from django.db import connections
+
+    from messageboard.middleware import QueryTimer
+
+    client = getattr(board, case.client)
+    call = getattr(client, case.method.lower())
+    count = min(requests, case.limit or requests)
+    if case.limit:
+        warmup = min(warmup, 1)
+    latencies, queries = [], []
+    for i in range(warmup + count):
+        kwargs = case.request(board, i)
+        if case.client == "api" and "data" in kwargs and case.method != "GET":
+            kwargs["format"] = "json"
+        timer = QueryTimer()
+        with connections["default"].execute_wrapper(timer):
+            start = time.perf_counter()
+            response = call(**kwargs)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = time.perf_counter() - start
+        if response.status_code != case.status:
+            raise AssertionError(
+                f"{case.name}: expected {case.status}, got {response.status_code}: "
+                f"{response.content[:500]!r}"
+            )
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            queries.append(timer.count)
+
+    latencies.sort()
+    return {
+        "route": case.route,
+        "method": case.method,
+        "requests": count,
+        "throughput": count / (sum(latencies) / 1000),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "queries": max(queries),
+    }
+
+
+def run(sizes: List[str], requests: int, warmup: int) -> dict:
+    import django
+    from django.core.cache import caches
+    from django.test import override_settings
+
+    from messageboard.tests.routes import CASES, route_names, seed_board
+
+    uncovered = set(route_names()) - {case.route for case in CASES}
+    if uncovered:
+        print(f"Routes without a case: {', '.join(sorted(uncovered))}", file=sys.stderr)
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "requests": requests,
+            "sizes": {size: SIZES[size] for size in sizes},
+        },
+        "results": {},
+    }
+    local_caches = {
+        alias: {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        for alias in ("default", "pages")
+    }
+    with _django.benchmark_database(), override_settings(CACHES=local_caches):
+        for size in sizes:
+            board = seed_board(f"benchmark_{size}", users=20, **SIZES[size])
+            for cache in caches.all():
+                cache.clear()
+            results["results"][size] = {}
+            for case in CASES:
+                result = run_case(board, case, requests, warmup)
+                results["results"][size][case.name] = result
+                print(
+                    f"{size:<7} {case.name:<26} {result['throughput']:9.1f}/s "
+                    f"p50 {result['p50_ms']:7.2f}ms p95 {result['p95_ms']:7.2f}ms "
+                    f"p99 {result['p99_ms']:7.2f}ms {result['queries']:3d} queries",
+                    file=sys.stderr,
+                )
+    return results
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float, min_delta: float
+) -> List[str]:
+    """
+    Compares two runs. Latencies must grow by `threshold` and by `min_delta`
+    milliseconds to count as a regression, so jitter on the fastest cases
+    isn't flagged.
+
+    Returns:
+        List[str]: Description of each regression.
+    """
+    regressions = []
+    for size, results in current["results"].items():
+        for name, result in results.items():
+            base = baseline["results"].get(size, {}).get(name)
+            if base is None:
+                continue
+            for metric in ("p50_ms", "p95_ms"):
+                if result[metric] > max(
+                    base[metric] * (1 + threshold), base[metric] + min_delta
+                ):
+                    regressions.append(
+                        f"{size} {name}: {metric} {base[metric]:.2f} -> "
+                        f"{result[metric]:.2f} "
+                        f"(+{result[metric] / base[metric] - 1:.0%})"
+                    )
+            if result["queries"] > base["queries"]:
+                regressions.append(
+                    f"{size} {name}: queries {base['queries']} -> {result['queries']}"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument(
+        "--requests", type=int, default=100, help="Timed requests per case."
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=3, help="Untimed requests before those."
+    )
+    parser.add_argument("--output", help="Write the results here, not stdout.")
+    parser.add_argument("--baseline", help="Results of an earlier run to compare.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Slowdown flagged as a regression, as a fraction (default 0.25).",
+    )
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.5,
+        help="Smallest slowdown flagged, in milliseconds (default 0.5).",
+    )
+    args = parser.parse_args()
+
+    _django.setup()
+    results = run(args.sizes, args.requests, args.warmup)
+
+    output = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(
+                json.load(file), results, args.threshold, args.min_delta
+            )
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("No regressions.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compares the single-pass `textstats` engine against the TextBlob analysis
+stats.py used to run, on a corpus of seed_database-style messages.
+
+TextBlob joins the corpus into one string and tokenizes it once per
+statistic, so it is only timed on a sample (`--baseline`) and its results
+compared with textstats' on that sample. The full corpus is analyzed by
+textstats alone, in one process and across a process pool.
+
+    poetry run python benchmarks/text_analytics.py [--messages 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import _django  # noqa: E402
+import textstats  # noqa: E402
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def textblob_stats(messages):
+    """
+    The most common word and average words per sentence, as stats.py computed
+    them with TextBlob. Returns None if the NLTK tokenizer data is missing.
+    """
+    from textblob import TextBlob
+    from textblob.exceptions import MissingCorpusError
+
+    try:
+        blob = TextBlob(" ".join(messages))
+        word = sorted(blob.word_counts.items(), key=lambda x: x[1], reverse=True)[0][0]
+        blob = TextBlob(" ".join(messages))
+        return word, round(len(blob.words) / len(blob.sentences), 2)
+    except MissingCorpusError:
+        return None
+
+
+def report(label, count, seconds, stats):
+    print(
+        f"{label:<28} {count:>9} {seconds:>8.2f}s {count / seconds:>11.0f}/s"
+        f"  {stats[0]!r:<16} {stats[1]}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=1000000)
+    parser.add_argument("--baseline", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    _django.setup()
+
+    from messageboard.management.commands.seed_database import paragraph
+
+    rng = random.Random(args.seed)
+    messages, seconds = timed(lambda: [paragraph(rng) for _ in range(args.messages)])
+    print(f"Generated {len(messages)} messages in {seconds:.2f}s\n")
+
+    def summary(result):
+        return result.most_common_word(), result.avg_words_per_sentence()
+
+    sample = messages[: args.baseline]
+    print(f"{'':<28} {'messages':>9} {'time':>9} {'throughput':>12}  result")
+    baseline, seconds = timed(lambda: textblob_stats(sample))
+    if baseline is None:
+        print("TextBlob: skipped, NLTK tokenizer data is not installed")
+    else:
+        report("TextBlob (sample)", len(sample), seconds, baseline)
+    result, seconds = timed(lambda: textstats.analyze_all(sample))
+    report("textstats (sample)", len(sample), seconds, summary(result))
+    if baseline is not None and baseline != summary(result):
+        print("MISMATCH between TextBlob and textstats on the sample")
+
+    result, seconds = timed(lambda: textstats.analyze_all(messages))
+    report("textstats, 1 process", len(messages), seconds, summary(result))
+    parallel, seconds = timed(
+        lambda: textstats.analyze_parallel(messages, workers=args.workers)
+    )
+    report(
+        f"textstats, {args.workers} processes",
+        len(messages),
+        seconds,
+        summary(parallel),
+    )
+    if summary(parallel) != summary(result):
+        print("MISMATCH between the serial and parallel runs")
+
+
+if __name__ == "__main__":
+    main()
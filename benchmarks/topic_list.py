@@ -0,0 +1,39 @@
+"""
+Measures topic list throughput for the HTML view and the topics API.
+
+    poetry run python benchmarks/topic_list.py [--topics 20]
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import _django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--topics", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    _django.setup()
+
+    from django.test import Client
+
+    from messageboard.factories import TopicFactory
+
+    with _django.benchmark_database():
+        for i in range(args.topics):
+            TopicFactory(title=f"Benchmark topic {i}")
+
+        client = Client()
+        for name, url in (("html", "/"), ("api", "/api/topics/")):
+            rate = _django.throughput(lambda: client.get(url), args.duration)
+            print(f"{name:>5} {url:<14} {rate:8.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -34,6 +35,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack
+    "messageboard.middleware.RequestTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -75,9 +78,38 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+        # Seconds a connection is kept for the following requests; 0 closes it
+        # after every request
+        "CONN_MAX_AGE": int(os.environ.get("MESSAGEBOARD_CONN_MAX_AGE", 60)),
     }
 }
 
+# PRAGMAs run on every new SQLite connection, picked by the
+# MESSAGEBOARD_SQLITE_PROFILE environment variable. "default" leaves SQLite's
+# own configuration. "production", an opt-in, lets readers and a writer work at
+# once (write-ahead logging, which keeps -wal and -shm files next to the
+# database), syncs to disk at checkpoints rather than every commit, keeps a 20MB
+# page cache per connection, reads through a 256MB memory map, and waits up to
+# 5 seconds for a lock before failing.
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "wal",
+        "synchronous": "normal",
+        "cache_size": -20000,
+        "mmap_size": 268435456,
+        "busy_timeout": 5000,
+    },
+}
+MESSAGEBOARD_SQLITE_PRAGMAS = SQLITE_PROFILES[
+    os.environ.get("MESSAGEBOARD_SQLITE_PROFILE", "default")
+]
+
+# Times a write is retried while another connection holds the database lock,
+# and the seconds waited before the first retry, doubling for each next one
+MESSAGEBOARD_DB_LOCK_RETRIES = 3
+MESSAGEBOARD_DB_LOCK_RETRY_DELAY = 0.05
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
@@ -114,3 +146,51 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static")
 
 LOGIN_REDIRECT_URL = "topics"
 
+
+# "pages" holds rendered page fragments (messageboard.pagecache). It is file
+# based so that every worker process, and the `warm_cache` command, share it.
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "pages": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(tempfile.gettempdir(), "messageboard-pages"),
+        "TIMEOUT": 600,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+
+# Runs the tests with in-memory caches rather than the ones above
+TEST_RUNNER = "messageboard.tests.runner.TestRunner"
+
+# Seconds the /api/stats/ report is cached before it is recomputed
+MESSAGEBOARD_STATS_TTL = 30
+
+# Rows per page of the REST API's lists, by default and at most
+MESSAGEBOARD_API_PAGE_SIZE = 100
+MESSAGEBOARD_API_MAX_PAGE_SIZE = 1000
+
+# Items a single request can create through the REST API's Thread and Message
+# lists
+MESSAGEBOARD_API_MAX_BATCH_SIZE = 1000
+
+# API tokens each process remembers the user of, and for how many seconds
+MESSAGEBOARD_TOKEN_CACHE_SIZE = 1024
+MESSAGEBOARD_TOKEN_CACHE_TTL = 60
+
+# Requests taking longer than this many milliseconds are logged as warnings,
+# with this many of their slowest SQL statements
+MESSAGEBOARD_SLOW_REQUEST_MS = 500
+MESSAGEBOARD_SLOW_REQUEST_QUERIES = 5
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        # One line per request at INFO, slow requests at WARNING
+        "messageboard.requests": {
+            "handlers": ["console"],
+            "level": os.environ.get("MESSAGEBOARD_REQUEST_LOG_LEVEL", "WARNING"),
+        },
+    },
+}
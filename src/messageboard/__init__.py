@@ -0,0 +1 @@
+default_app_config = "messageboard.apps.MessageboardConfig"
@@ -11,3 +11,10 @@ class MessageboardConfig(AppConfig):
     """
 
     name = "messageboard"
+
+    def ready(self):
+        """
+        Connects the signal handlers maintaining the denormalized counters, and
+        the one tuning SQLite connections.
+        """
+        from messageboard import signals, sqlite  # noqa: F401
@@ -0,0 +1,122 @@
+"""
+Token authentication for the REST API that remembers which user a token
+belongs to, so authenticated requests don't query the token and user tables
+every time.
+
+Tokens are kept in an in-process LRU cache for `MESSAGEBOARD_TOKEN_CACHE_TTL`
+seconds, holding at most `MESSAGEBOARD_TOKEN_CACHE_SIZE` of them.
+messageboard.signals drop a token when it is deleted and every token of a user
+when the user is saved or deleted. Those signals only reach the process making
+the change; other processes notice within the TTL.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    """
+    Least recently used cache of token key to (user, token), whose entries
+    expire `ttl` seconds after being stored. Safe to share between threads.
+    """
+
+    def __init__(self, size: int, ttl: float):
+        self.size = size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def get(self, key: str) -> Optional[Tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Tuple) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def delete_user(self, user_id: int) -> None:
+        """
+        Drops every token of the user `user_id`.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key, (expires, (user, token)) in self._entries.items()
+                if user.pk == user_id
+            ]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def counters(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+            }
+
+
+cache = TokenCache(
+    settings.MESSAGEBOARD_TOKEN_CACHE_SIZE, settings.MESSAGEBOARD_TOKEN_CACHE_TTL
+)
+
+
+def counters() -> Dict[str, float]:
+    """
+    Returns this process's token cache hits, misses, hit rate, evictions,
+    invalidations and current size.
+    """
+    return cache.counters()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication answering from the token cache when it can. Invalid
+    tokens and inactive users are never cached, so they are always checked
+    against the database.
+    """
+
+    def authenticate_credentials(self, key):
+        cached = cache.get(key)
+        if cached is None:
+            cached = super().authenticate_credentials(key)
+            cache.set(key, cached)
+        user, token = cached
+        # Each request gets its own copy, so nothing a view sets on its user
+        # leaks into other requests
+        return copy.copy(user), token
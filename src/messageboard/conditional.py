@@ -0,0 +1,137 @@
+"""
+HTTP validators (ETag and Last-Modified) for the board's pages and API, and
+conditional GET handling with them.
+
+Validators are derived from the `modified_date` messageboard.signals keep on
+Topics and Threads, and a row count, read with a single aggregate or single-row
+query. A client whose copy is still current gets 304 Not Modified before any
+rows are loaded, rendered or serialized.
+"""
+
+from calendar import timegm
+from datetime import datetime
+from typing import Callable, NamedTuple, Optional
+
+from django.db.models import Count, Max, Subquery, Sum
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from messageboard.models import Message, Thread, Topic
+from messageboard.pagination import EPOCH
+
+
+class Validators(NamedTuple):
+    """
+    Attributes:
+        etag (str): Quoted strong ETag.
+        last_modified (Optional[datetime]): Last change, if anything exists yet.
+    """
+
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def validators(last_modified: Optional[datetime], count: int, *vary) -> Validators:
+    """
+    Validators for a resource last modified at `last_modified` and holding
+    `count` rows. `vary` are whatever else the representation depends on,
+    such as the user or the response format.
+    """
+    micros = 0
+    if last_modified is not None:
+        delta = last_modified - EPOCH
+        micros = (delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds
+    parts = [micros, count or 0, *vary]
+    return Validators(
+        '"{}"'.format("-".join(str(part) for part in parts)), last_modified
+    )
+
+
+def topic_list(*vary) -> Validators:
+    """
+    Validators for the list of all Topics.
+    """
+    topics = Topic.objects.aggregate(last=Max("modified_date"), count=Count("id"))
+    return validators(topics["last"], topics["count"], *vary)
+
+
+def topic(topic: Topic, *vary) -> Validators:
+    """
+    Validators for a Topic and its Threads.
+    """
+    return validators(topic.modified_date, topic.thread_count, *vary)
+
+
+def thread_list(*vary) -> Validators:
+    """
+    Validators for the list of all Threads.
+    """
+    threads = Thread.objects.aggregate(last=Max("modified_date"), count=Count("id"))
+    return validators(threads["last"], threads["count"], *vary)
+
+
+def thread(thread: Thread, *vary) -> Validators:
+    """
+    Validators for a Thread and its Messages. The Thread's pages also show its
+    Topic's title and slug, so the Topic's version counts too: unlike its
+    `modified_date`, Messages posted elsewhere in the Topic leave it alone.
+    """
+    topic_version = thread.topic.version if thread.topic_id is not None else 0
+    return validators(thread.modified_date, thread.message_count, topic_version, *vary)
+
+
+def message_list(*vary) -> Optional[Validators]:
+    """
+    Validators for the list of all Messages. Every Message write marks its
+    Thread as modified, but writes to Messages without a Thread (such as those
+    of a deleted Thread) aren't tracked: while any are listed, there are no
+    validators.
+    """
+    without_thread = Message.objects.filter(thread__isnull=True).values("id")[:1]
+    threads = Thread.objects.aggregate(
+        last=Max("modified_date"),
+        count=Sum("message_count"),
+        # Over no Threads at all, this is NULL too
+        without_thread=Max(Subquery(without_thread)),
+    )
+    if threads["without_thread"] is not None or threads["last"] is None:
+        return None
+    return validators(threads["last"], threads["count"], *vary)
+
+
+def respond(
+    request: HttpRequest,
+    validators: Optional[Validators],
+    render: Callable[[], HttpResponse],
+) -> HttpResponse:
+    """
+    Answers a GET or HEAD with 304 Not Modified if the client's copy matches
+    `validators`, and otherwise with `render()` carrying the validators.
+
+    Args:
+        request (django.http.HttpRequest): Incoming HTTP request.
+        validators (Optional[Validators]): Validators of the resource, if known.
+        render (Callable[[], HttpResponse]): Builds the full response.
+
+    Returns:
+        django.http.HttpResponse: The response to send.
+    """
+    if validators is None or request.method not in ("GET", "HEAD"):
+        return render()
+
+    last_modified = None
+    if validators.last_modified is not None:
+        last_modified = timegm(validators.last_modified.utctimetuple())
+    response = get_conditional_response(
+        request, etag=validators.etag, last_modified=last_modified
+    )
+    if response is None:
+        response = render()
+        if response.status_code != 200:
+            return response
+
+    response.setdefault("ETag", validators.etag)
+    if last_modified is not None:
+        response.setdefault("Last-Modified", http_date(last_modified))
+    return response
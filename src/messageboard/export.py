@@ -0,0 +1,146 @@
+"""
+Streams the whole message board as nested Topic > Thread > Message JSON.
+
+The document has the same shape as the results of
+`/api/topics/?expand=threads.messages`, all on one page, but rows are read in
+chunks with `QuerySet.iterator` and encoded as they arrive, so memory use
+doesn't grow with the size of the board.
+"""
+
+import json
+from typing import Any, Callable, Iterator
+
+from django.db import transaction
+from django.db.models import F
+from rest_framework.utils.encoders import JSONEncoder
+
+from messageboard.models import Message, Thread, Topic
+from messageboard.serializers import (
+    MessageSerializer,
+    ThreadSerializer,
+    TopicSerializer,
+)
+
+# Flush encoded output in pieces of about this many characters
+BUFFER_SIZE = 64 * 1024
+
+
+def _encode(data: dict) -> str:
+    """
+    Encodes a row like DRF's JSONRenderer does: compact and unescaped unicode.
+    """
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":"))
+
+
+def _open_object(data: dict, key: str) -> str:
+    """
+    Encodes `data` as a JSON object left open on a trailing `key` list, ready
+    for the nested rows to be streamed into it.
+    """
+    return f'{_encode(data)[:-1]},"{key}":['
+
+
+class _Children:
+    """
+    Hands out the rows of one streamed query, ordered by their parent, a
+    parent at a time.
+    """
+
+    def __init__(self, rows: Iterator, parent_id: Callable[[Any], int]):
+        self.rows = iter(rows)
+        self.parent_id = parent_id
+        self.next = next(self.rows, None)
+
+    def of(self, parent_id: int) -> Iterator:
+        """
+        Yields the rows of the parent `parent_id`, which must be the parent of
+        the next rows or have none.
+        """
+        while self.next is not None and self.parent_id(self.next) == parent_id:
+            row = self.next
+            self.next = next(self.rows, None)
+            yield row
+
+
+def iter_board_json(chunk_size: int = 2000) -> Iterator[str]:
+    """
+    Yields the board as JSON text, in pieces of roughly BUFFER_SIZE.
+
+    Topics, Threads and Messages are each read with a single query, all three
+    ordered the way the document nests them, and merged as they stream in:
+    the number of queries doesn't grow with the size of the board. Everything
+    is read inside one transaction, so the export is a consistent snapshot
+    even while the board is being written to.
+
+    Args:
+        chunk_size (int): Rows fetched from the database at a time.
+
+    Yields:
+        str
+    """
+    # One serializer per level, reused for every row: building a
+    # ModelSerializer's fields is far more expensive than representing a row.
+    topic_serializer = TopicSerializer()
+    thread_serializer = ThreadSerializer()
+    message_serializer = MessageSerializer()
+
+    def pieces(topics, threads, messages) -> Iterator[str]:
+        """
+        Yields the document's pieces, row by row, in order.
+        """
+        yield "["
+        for topic_index, topic in enumerate(topics):
+            piece = _open_object(topic_serializer.to_representation(topic), "threads")
+            yield "," + piece if topic_index else piece
+
+            for thread_index, thread in enumerate(threads.of(topic.id)):
+                data = thread_serializer.to_representation(thread)
+                piece = _open_object(data, "messages")
+                yield "," + piece if thread_index else piece
+
+                for message_index, message in enumerate(messages.of(thread.id)):
+                    piece = _encode(message_serializer.to_representation(message))
+                    yield "," + piece if message_index else piece
+
+                yield "]}"
+            yield "]}"
+        yield "]"
+
+    buffer, size = [], 0
+
+    with transaction.atomic():
+        topics = Topic.objects.order_by("id").iterator(chunk_size)
+        threads = _Children(
+            Thread.objects.filter(topic__isnull=False)
+            .order_by("topic_id", "-created_date", "-id")
+            .iterator(chunk_size),
+            lambda thread: thread.topic_id,
+        )
+        # The same filter as Thread.messages, in the order of the Threads
+        messages = _Children(
+            Message.objects.filter(
+                thread__topic__isnull=False,
+                created_date__gte=F("thread__created_date"),
+            )
+            .order_by(
+                "thread__topic_id",
+                "-thread__created_date",
+                "-thread_id",
+                "created_date",
+                "id",
+            )
+            .iterator(chunk_size),
+            lambda message: message.thread_id,
+        )
+
+        # Flushed whatever the row, so Topics and Threads without Messages are
+        # streamed too
+        for piece in pieces(topics, threads, messages):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= BUFFER_SIZE:
+                yield "".join(buffer)
+                buffer, size = [], 0
+
+    if buffer:
+        yield "".join(buffer)
@@ -21,14 +21,14 @@ class UserFactory(factory.django.DjangoModelFactory):
     password = factory.PostGenerationMethodCall("set_password", "password")
 
 
-class TopicFactory(factory.Factory):
+class TopicFactory(factory.django.DjangoModelFactory):
     """
-    Factory for producing sane Topic objects.
+    Factory for producing sane Topic objects. Topics are saved on creation.
 
-    https://factoryboy.readthedocs.io/en/latest/reference.html#factory.Factory
+    https://factoryboy.readthedocs.io/en/latest/orms.html#django
 
     Args:
-        factory.Factory: Base Factory class.
+        factory.django.DjangoModelFactory: Base Django model Factory class.
     """
 
     class Meta:
@@ -1,6 +1,6 @@
 from django import forms
 
-from messageboard.models import Thread, Message
+from messageboard.models import Thread, Message, Topic
 
 # NOTE: We do not have an AddTopicForm.
 
@@ -91,3 +91,19 @@ class AddMessageForm(forms.ModelForm):
             content=self.cleaned_data["content"],
             author=kwargs["user"],
         )
+
+
+class SearchForm(forms.Form):
+    """
+    Form to search Message content, optionally within a Topic or Thread.
+    """
+
+    q = forms.CharField(label="Search", max_length=200)
+    topic = forms.ModelChoiceField(
+        queryset=Topic.objects.order_by("title"),
+        to_field_name="slug",
+        required=False,
+        empty_label="All topics",
+    )
+    thread = forms.IntegerField(required=False, widget=forms.HiddenInput)
+    offset = forms.IntegerField(required=False, min_value=0, widget=forms.HiddenInput)
@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.core.management.base import BaseCommand
+
+from messageboard.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Message full-text search index from scratch."
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        indexed = rebuild_index()
+        self.stdout.write(f"Messages indexed: {indexed}")
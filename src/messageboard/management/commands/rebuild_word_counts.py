@@ -0,0 +1,13 @@
+from django.db import transaction
+from django.core.management.base import BaseCommand
+
+from messageboard.wordcounts import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-board, per-Topic and per-Thread word counts from scratch."
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        written = rebuild()
+        self.stdout.write(f"Word counts written: {written}")
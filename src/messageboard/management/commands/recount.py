@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.core.management.base import BaseCommand
+
+from messageboard.models import Thread, Topic
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized Topic and Thread counters."
+
+    @transaction.atomic
+    def handle(self, *args, **options):
+        threads = Thread.objects.all().recount()
+        self.stdout.write(f"Threads recounted: {threads}")
+
+        topics = Topic.objects.all().recount()
+        self.stdout.write(f"Topics recounted: {topics}")
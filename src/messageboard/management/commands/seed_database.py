@@ -1,52 +1,265 @@
 import random
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from multiprocessing import Pool
 
-from django.db import transaction
+from django.db import connection, transaction
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
 from django.core.management.base import BaseCommand
+from faker.providers.lorem.la import Provider as LoremProvider
 
-from messageboard.factories import (
-    TopicFactory,
-    ThreadFactory,
-    MessageFactory,
-    UserFactory,
-)
 from messageboard.models import Topic, Thread, Message
+from messageboard.search import rebuild_index
+from messageboard.wordcounts import rebuild as rebuild_word_counts
 
 User = get_user_model()
 
+WORDS = LoremProvider.word_list
+
+
+def sentence(rng: random.Random, nb_words: int) -> str:
+    """
+    Returns a lorem ipsum sentence of roughly `nb_words` words, like
+    Faker's `sentence` with `variable_nb_words`.
+    """
+    words = rng.choices(WORDS, k=max(1, round(nb_words * rng.uniform(0.6, 1.4))))
+    return " ".join(words).capitalize() + "."
+
+
+def paragraph(rng: random.Random) -> str:
+    """
+    Returns a lorem ipsum paragraph of roughly 3 sentences, like the
+    MessageFactory content.
+    """
+    return " ".join(sentence(rng, 6) for _ in range(rng.randint(1, 4)))
+
+
+# Ids of the Users Messages are attributed to, set once per process by
+# `set_author_ids` rather than sent along with every task
+author_ids = []
+
+
+def set_author_ids(ids):
+    global author_ids
+    author_ids = ids
+
+
+def generate_messages(task):
+    """
+    Builds the rows for one Thread's Messages, by authors from `author_ids`.
+    Runs in worker processes, so it only deals in plain values.
+
+    Args:
+        task (tuple): (seed, Thread position, Thread id, Thread created date,
+            number of Messages). The random stream depends on the seed and the
+            Thread's position only, so output doesn't vary with the number of
+            workers or the ids the database hands out.
+
+    Returns:
+        List[tuple]: (content, thread id, author id, created date) rows.
+    """
+    seed, position, thread_id, thread_created, count = task
+    rng = random.Random(f"{seed}-{position}")
+    now = datetime.now(timezone.utc)
+    span = (now - thread_created).total_seconds()
+    return [
+        (
+            paragraph(rng),
+            thread_id,
+            rng.choice(author_ids),
+            thread_created + timedelta(seconds=rng.uniform(0, span)),
+        )
+        for _ in range(count)
+    ]
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 class Command(BaseCommand):
     help = "Seed example data into the database."
 
+    def add_arguments(self, parser):
+        parser.add_argument("--topics", type=int, default=5, help="Number of Topics.")
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=None,
+            help="Threads per Topic (default: random, 10 to 50).",
+        )
+        parser.add_argument(
+            "--messages",
+            type=int,
+            default=None,
+            help="Messages per Thread (default: random, 25 to 100).",
+        )
+        parser.add_argument("--users", type=int, default=50, help="Number of Users.")
+        parser.add_argument("--seed", type=int, default=None, help="Random seed.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Processes generating Message content in parallel.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=10000, help="Rows per bulk insert."
+        )
+
     @transaction.atomic
     def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+
         self.stdout.write("Deleting old data...")
-        models = [Topic, Thread, Message, User]
-        for m in models:
-            m.objects.all().delete()
+        with connection.cursor() as cursor:
+            # Raw deletes: the ORM would load every row to run the cascade
+            for model in (Message, Thread, Topic):
+                cursor.execute(f"DELETE FROM {model._meta.db_table}")
+        User.objects.all().delete()
 
         self.stdout.write("Generating users...")
-        users = []
-        for i in range(50):
-            user = UserFactory()
-            user.save()
-            users.append(user)
+        author_ids = self.create_users(options["users"])
 
         self.stdout.write("Generating messageboard models...")
-        for i in range(5):
-            topic = TopicFactory()
+        topics = self.create_topics(options["topics"])
+        threads = self.create_threads(topics, options["threads"], author_ids)
+        total = self.create_messages(
+            threads,
+            options["messages"],
+            author_ids,
+            options["seed"],
+            options["workers"],
+        )
+        self.stdout.write(f"Messages generated: {total}")
 
-            num_threads = random.randint(10, 50)
-            for _ in range(num_threads):
-                thread = ThreadFactory(
-                    topic=topic, author=random.choice(User.objects.all())
-                )
+        self.stdout.write("Updating counters, search index and word counts...")
+        Thread.objects.all().recount()
+        Topic.objects.all().recount()
+        rebuild_index()
+        rebuild_word_counts()
 
-                num_messages = random.randint(25, 100)
-                for _ in range(num_messages):
-                    MessageFactory(
-                        thread=thread, author=random.choice(User.objects.all())
-                    )
+        for topic in topics:
             self.stdout.write(f"Topic generated: {topic}")
 
-        return
+    def create_users(self, count):
+        """
+        Creates Users in bulk. Every User's password is "password", hashed once.
+        """
+        password = make_password("password")
+        User.objects.bulk_create(
+            User(username=f"username_{i}", password=password) for i in range(count)
+        )
+        return list(User.objects.values_list("id", flat=True))
+
+    def unique_sentences(self, count, nb_words):
+        seen = set()
+        while len(seen) < count:
+            title = sentence(self.rng, nb_words)
+            if title not in seen:
+                seen.add(title)
+                yield title
+
+    def create_topics(self, count):
+        topics = {}
+        titles = self.unique_sentences(float("inf"), 3)
+        while len(topics) < count:
+            title = next(titles)
+            # Titles differing only past the slug's length would share a slug
+            topics.setdefault(Topic.make_slug(title), title)
+        Topic.objects.bulk_create(
+            Topic(title=title, slug=slug) for slug, title in topics.items()
+        )
+        return list(Topic.objects.all())
+
+    def create_threads(self, topics, per_topic, author_ids):
+        """
+        Creates each Topic's Threads, dated between two and one years ago.
+
+        Returns:
+            List[Tuple[int, datetime]]: id and created date of each Thread.
+        """
+        now = datetime.now(timezone.utc)
+        titles = self.unique_sentences(float("inf"), 8)
+        rows = (
+            Thread(
+                title=next(titles),
+                topic=topic,
+                author_id=self.rng.choice(author_ids),
+                created_date=now - timedelta(days=self.rng.uniform(365, 730)),
+            )
+            for topic in topics
+            for _ in range(per_topic or self.rng.randint(10, 50))
+        )
+        for batch in chunked(rows, self.batch_size):
+            Thread.objects.bulk_create(batch)
+        return list(Thread.objects.order_by("id").values_list("id", "created_date"))
+
+    def create_messages(self, threads, per_thread, author_ids, seed, workers):
+        """
+        Creates every Thread's Messages in batches. With several workers, the
+        content is generated in a process pool while this process inserts.
+
+        Returns:
+            int: Number of Messages created.
+        """
+        if seed is None:
+            seed = self.rng.random()
+        tasks = (
+            (
+                seed,
+                position,
+                thread_id,
+                created,
+                per_thread or self.rng.randint(25, 100),
+            )
+            for position, (thread_id, created) in enumerate(threads)
+        )
+        total = 0
+
+        # bulk_create spends most of its time compiling SQL per field per row,
+        # which dominates at millions of rows, so Messages go in through
+        # executemany with the values prepared by the field itself.
+        prepare_date = Message._meta.get_field("created_date").get_db_prep_save
+        sql = (
+            f"INSERT INTO {Message._meta.db_table} "
+            f"(content, thread_id, author_id, created_date) VALUES (%s, %s, %s, %s)"
+        )
+
+        def insert(rows):
+            nonlocal total
+            with connection.cursor() as cursor:
+                for batch in chunked(rows, self.batch_size):
+                    cursor.executemany(
+                        sql,
+                        [
+                            (
+                                content,
+                                thread_id,
+                                author_id,
+                                prepare_date(created, connection),
+                            )
+                            for content, thread_id, author_id, created in batch
+                        ],
+                    )
+                    total += len(batch)
+
+        if workers <= 1:
+            set_author_ids(author_ids)
+            insert(row for task in tasks for row in generate_messages(task))
+            return total
+
+        with Pool(workers, initializer=set_author_ids, initargs=(author_ids,)) as pool:
+            # Hand out a bounded window of Threads at a time, so generated rows
+            # never pile up faster than they can be inserted.
+            for window in chunked(tasks, workers * 8):
+                insert(
+                    row for rows in pool.imap(generate_messages, window) for row in rows
+                )
+        return total
@@ -0,0 +1,51 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from messageboard import pagecache
+from messageboard.models import Thread, Topic
+from messageboard.views import ListMessagesView, ListThreadsView, ListTopicsView
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the Topic list and the first page of every Topic and Thread into "
+        "the page cache, so the first visitors don't pay for rendering them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=None,
+            help="Only warm this many of the most recently active Threads.",
+        )
+
+    def handle(self, *args, **options):
+        pagecache.cached(pagecache.topic_list_key(), ListTopicsView.render_topic_list)
+
+        topics = Topic.objects.all()
+        for topic in topics:
+            pagecache.cached(
+                pagecache.thread_list_key(topic),
+                lambda: ListThreadsView.render_thread_list(topic, None, None),
+            )
+
+        # Message pages are only cached for anonymous visitors
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        view = ListMessagesView()
+        threads = Thread.objects.select_related("topic").order_by(
+            "-last_message_at", "-id"
+        )[: options["threads"]]
+        for thread in threads:
+            pagecache.cached(
+                pagecache.message_list_key(thread),
+                lambda: view.render_message_list(request, thread, None, None),
+            )
+
+        counters = pagecache.counters()
+        self.stdout.write(
+            f"Pages warmed: {1 + len(topics) + len(threads)} "
+            f"(cache hits: {counters['hits']}, misses: {counters['misses']})"
+        )
@@ -0,0 +1,128 @@
+"""
+Per-request timing: how long each request took, how many SQL statements it
+ran and how long they took, by route.
+
+The figures are sent back in a `Server-Timing` header, which browsers' developer
+tools display, and logged to the "messageboard.requests" logger: one INFO line
+per request, with the figures also attached to the record as attributes for
+structured log handlers. Requests slower than `MESSAGEBOARD_SLOW_REQUEST_MS`
+are logged as warnings, with their `MESSAGEBOARD_SLOW_REQUEST_QUERIES` slowest
+statements.
+
+Statements are timed with a database execute wrapper, which costs two clock
+reads per statement, so the middleware can stay on in production. The body of
+a streaming response is produced after the middleware returns, so its
+statements aren't counted.
+"""
+
+import logging
+import time
+from contextlib import ExitStack
+from typing import Callable, List, Tuple
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger("messageboard.requests")
+
+
+class QueryTimer:
+    """
+    Database execute wrapper recording the duration of every statement.
+
+    Attributes:
+        queries (List[Tuple[float, str]]): Milliseconds and SQL of each
+            statement, in the order they ran.
+    """
+
+    def __init__(self):
+        self.queries: List[Tuple[float, str]] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(((time.perf_counter() - start) * 1000, sql))
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def duration(self) -> float:
+        return sum(duration for duration, sql in self.queries)
+
+    def slowest(self, limit: int) -> List[Tuple[float, str]]:
+        return sorted(self.queries, key=lambda query: query[0], reverse=True)[:limit]
+
+
+class RequestTimingMiddleware:
+    """
+    Times each request and its SQL, and reports them in a `Server-Timing`
+    header and the "messageboard.requests" log.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        duration = (time.perf_counter() - start) * 1000
+
+        match = getattr(request, "resolver_match", None)
+        route = (match and match.url_name) or "-"
+        response["Server-Timing"] = (
+            f"total;dur={duration:.1f}, "
+            f'sql;dur={timer.duration:.1f};desc="{timer.count} queries"'
+        )
+        self.log(request, response, route, duration, timer)
+        return response
+
+    @staticmethod
+    def log(
+        request: HttpRequest,
+        response: HttpResponse,
+        route: str,
+        duration: float,
+        timer: QueryTimer,
+    ) -> None:
+        slow = duration >= settings.MESSAGEBOARD_SLOW_REQUEST_MS
+        level = logging.WARNING if slow else logging.INFO
+        if not logger.isEnabledFor(level):
+            return
+
+        message = "%s %s route=%s status=%d duration_ms=%.1f sql_count=%d sql_ms=%.1f"
+        args = [
+            request.method,
+            request.path,
+            route,
+            response.status_code,
+            duration,
+            timer.count,
+            timer.duration,
+        ]
+        if slow:
+            for query in timer.slowest(settings.MESSAGEBOARD_SLOW_REQUEST_QUERIES):
+                message += "\n  %.1fms %s"
+                args.extend(query)
+        logger.log(
+            level,
+            message,
+            *args,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "route": route,
+                "status": response.status_code,
+                "duration_ms": duration,
+                "sql_count": timer.count,
+                "sql_ms": timer.duration,
+            },
+        )
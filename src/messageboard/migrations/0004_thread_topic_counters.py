@@ -0,0 +1,69 @@
+# Generated by Django 2.2.28 on 2026-10-17 10:26
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def _aggregate(queryset, group_by, aggregate):
+    return Subquery(
+        queryset.order_by().values(group_by).annotate(value=aggregate).values("value")[:1]
+    )
+
+
+def backfill_counters(apps, schema_editor):
+    Topic = apps.get_model("messageboard", "Topic")
+    Thread = apps.get_model("messageboard", "Thread")
+    Message = apps.get_model("messageboard", "Message")
+
+    messages = Message.objects.filter(thread=OuterRef("pk"))
+    Thread.objects.update(
+        message_count=Coalesce(_aggregate(messages, "thread", Count("pk")), 0),
+        last_message_at=_aggregate(messages, "thread", Max("created_date")),
+    )
+    threads = Thread.objects.filter(topic=OuterRef("pk"))
+    last_thread = _aggregate(threads, "topic", Max("created_date"))
+    last_message = _aggregate(threads, "topic", Max("last_message_at"))
+    Topic.objects.update(
+        thread_count=Coalesce(_aggregate(threads, "topic", Count("pk")), 0),
+        message_count=Coalesce(_aggregate(threads, "topic", models.Sum("message_count")), 0),
+        last_activity=Greatest(
+            Coalesce(last_thread, last_message), Coalesce(last_message, last_thread)
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messageboard', '0003_auto_20201029_0417'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thread',
+            name='last_message_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='thread',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='last_activity',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='thread_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
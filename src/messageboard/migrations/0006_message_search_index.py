@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messageboard', '0005_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                "CREATE VIRTUAL TABLE messageboard_message_fts "
+                "USING fts5(content, tokenize = 'porter unicode61')",
+                "INSERT INTO messageboard_message_fts (rowid, content) "
+                "SELECT id, content FROM messageboard_message",
+            ],
+            reverse_sql="DROP TABLE messageboard_message_fts",
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 2.2.28 on 2026-10-17 10:46
+
+import re
+from collections import Counter
+
+from django.db import migrations, models
+
+
+def backfill_word_counts(apps, schema_editor):
+    Message = apps.get_model("messageboard", "Message")
+    WordCount = apps.get_model("messageboard", "WordCount")
+
+    counts = Counter()
+    rows = Message.objects.values_list("content", "thread_id", "thread__topic_id")
+    for content, thread_id, topic_id in rows.iterator():
+        words = [w for w in re.findall(r"\w+(?:'\w+)*", content.lower()) if len(w) <= 64]
+        for scope, owner in (("", ""), ("thread:", thread_id), ("topic:", topic_id)):
+            if owner is not None:
+                counts.update((f"{scope}{owner}", word) for word in words)
+    WordCount.objects.bulk_create(
+        WordCount(scope=scope, word=word, count=count)
+        for (scope, word), count in counts.items()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messageboard', '0006_message_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WordCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(blank=True, max_length=32)),
+                ('word', models.CharField(max_length=64)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='wordcount',
+            index=models.Index(fields=['scope', '-count', 'word'], name='wordcount_scope_top_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='wordcount',
+            unique_together={('scope', 'word')},
+        ),
+        migrations.RunPython(backfill_word_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-17 10:55
+
+from django.db import migrations, models
+import messageboard.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messageboard', '0007_word_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thread',
+            name='version',
+            field=models.PositiveIntegerField(default=messageboard.models.new_version),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='version',
+            field=models.PositiveIntegerField(default=messageboard.models.new_version),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 2.2.28 on 2026-10-17 10:58
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messageboard', '0008_cache_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='thread',
+            name='modified_date',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='modified_date',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 2.2.28 on 2026-10-17 11:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messageboard', '0009_modified_dates'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['created_date'], name='message_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='thread',
+            index=models.Index(fields=['created_date'], name='thread_created_idx'),
+        ),
+    ]
@@ -1,14 +1,168 @@
+import random
+from typing import List
+
 from django.utils import timezone
 
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Count, F, Max, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.dispatch import Signal
 from django.urls import reverse
 from django.utils.text import slugify
 
+from messageboard.pagination import KeysetPage, keyset_paginate
+from messageboard.sqlite import retry_on_lock
+
 
 User = get_user_model()
 
 
+def new_version() -> int:
+    """
+    Returns a fresh cache version for a Topic or Thread.
+
+    Versions are random rather than incremented, so neither a stale copy
+    written back by `save()` nor a restored backup can bring back a version
+    that pages were cached under.
+    """
+    return random.getrandbits(31)
+
+
+def _subquery_aggregate(queryset, group_by: str, aggregate):
+    """
+    Wraps an aggregate over `queryset`, grouped by `group_by`, as a scalar
+    Subquery usable in `QuerySet.update`.
+    """
+    return Subquery(
+        queryset.order_by()
+        .values(group_by)
+        .annotate(value=aggregate)
+        .values("value")[:1]
+    )
+
+
+# Sent once by `BatchQuerySet.create_batch` with all the rows it inserted, as
+# bulk_create sends no post_save signals
+post_create_batch = Signal(providing_args=["instances"])
+
+
+class BatchQuerySet(models.QuerySet):
+    def create_batch(self, objs: List[models.Model]) -> List[models.Model]:
+        """
+        Inserts `objs` with bulk INSERTs in one transaction, sets their ids, and
+        sends `post_create_batch` once for all of them.
+
+        Returns:
+            List[models.Model]: `objs`.
+        """
+        with transaction.atomic(using=self.db):
+            self.bulk_create(objs)
+            if objs and objs[0].pk is None:
+                # SQLite doesn't return the ids, but the INSERTs run under the
+                # transaction's write lock, so they got consecutive ids ending
+                # at the last one inserted
+                with connections[self.db].cursor() as cursor:
+                    cursor.execute("SELECT last_insert_rowid()")
+                    last_id = cursor.fetchone()[0]
+                for pk, obj in enumerate(objs, start=last_id - len(objs) + 1):
+                    obj.pk = pk
+            post_create_batch.send(sender=self.model, instances=objs)
+        return objs
+
+
+class TopicQuerySet(models.QuerySet):
+    def touch(self, pages: bool = True) -> int:
+        """
+        Marks every Topic in the QuerySet as modified now.
+
+        Args:
+            pages (bool): Whether the change shows on the Topic's pages, which
+                then get a new cache version.
+        """
+        if pages:
+            return self.update(modified_date=timezone.now(), version=new_version())
+        return self.update(modified_date=timezone.now())
+
+    def recount(self) -> int:
+        """
+        Recomputes the denormalized counters of every Topic in the QuerySet
+        from the Thread and Message tables, in a single UPDATE.
+
+        Returns:
+            int: Number of Topics updated.
+        """
+        threads = Thread.objects.filter(topic=OuterRef("pk"))
+        messages = Message.objects.filter(thread__topic=OuterRef("pk"))
+        last_thread = _subquery_aggregate(threads, "topic", Max("created_date"))
+        last_message = _subquery_aggregate(
+            messages, "thread__topic", Max("created_date")
+        )
+        return self.update(
+            thread_count=Coalesce(
+                _subquery_aggregate(threads, "topic", Count("pk")), 0
+            ),
+            message_count=Coalesce(
+                _subquery_aggregate(messages, "thread__topic", Count("pk")), 0
+            ),
+            # Greatest() is NULL if either side is, so each side falls back to the other
+            last_activity=Greatest(
+                Coalesce(last_thread, last_message), Coalesce(last_message, last_thread)
+            ),
+        )
+
+    def with_threads(self, messages: bool = False) -> "TopicQuerySet":
+        """
+        Prefetches each Topic's `threads`, and their `messages` too if asked,
+        with one query per level however many Topics there are.
+        """
+        threads = Thread.objects.order_by("-created_date", "-id")
+        if messages:
+            threads = threads.with_messages()
+        return self.prefetch_related(Prefetch("thread_set", queryset=threads))
+
+
+class ThreadQuerySet(BatchQuerySet):
+    def touch(self, pages: bool = True) -> int:
+        """
+        Marks every Thread in the QuerySet as modified now.
+
+        Args:
+            pages (bool): Whether the change shows on the Thread's pages, which
+                then get a new cache version.
+        """
+        if pages:
+            return self.update(modified_date=timezone.now(), version=new_version())
+        return self.update(modified_date=timezone.now())
+
+    def recount(self) -> int:
+        """
+        Recomputes the denormalized counters of every Thread in the QuerySet
+        from the Message table, in a single UPDATE.
+
+        Returns:
+            int: Number of Threads updated.
+        """
+        messages = Message.objects.filter(thread=OuterRef("pk"))
+        return self.update(
+            message_count=Coalesce(
+                _subquery_aggregate(messages, "thread", Count("pk")), 0
+            ),
+            last_message_at=_subquery_aggregate(
+                messages, "thread", Max("created_date")
+            ),
+        )
+
+    def with_messages(self) -> "ThreadQuerySet":
+        """
+        Prefetches each Thread's `messages` with a single query.
+        """
+        messages = Message.objects.filter(
+            created_date__gte=F("thread__created_date")
+        ).order_by("created_date", "id")
+        return self.prefetch_related(Prefetch("message_set", queryset=messages))
+
+
 class Topic(models.Model):
     """
     Models the outermost data structure in the message board.
@@ -18,11 +172,48 @@ class Topic(models.Model):
 
     title = models.CharField(max_length=64, unique=True)
     slug = models.CharField(max_length=32, unique=True)
+    # Denormalized counters, maintained by messageboard.signals
+    thread_count = models.PositiveIntegerField(default=0)
+    message_count = models.PositiveIntegerField(default=0)
+    last_activity = models.DateTimeField(null=True, blank=True)
+    # Last change to the Topic or anything in it, set by messageboard.signals;
+    # HTTP validators are derived from it
+    modified_date = models.DateTimeField(default=timezone.now)
+    # Changed by messageboard.signals whenever a page showing the Topic would
+    # change; cached pages are keyed by it
+    version = models.PositiveIntegerField(default=new_version)
+
+    objects = TopicQuerySet.as_manager()
+
+    THREADS_PER_PAGE = 25
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the title the row was loaded with, so `save` can tell whether
+        the slug needs regenerating without another query.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_title = instance.__dict__.get("title")
+        return instance
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.slug = slugify(self.title)
-        self.save()
+    @classmethod
+    def make_slug(cls, title: str) -> str:
+        """
+        Returns the slug of a Topic titled `title`, cut to the slug's length.
+        """
+        max_length = cls._meta.get_field("slug").max_length
+        return slugify(title)[:max_length].rstrip("-")
+
+    def save(self, *args, **kwargs):
+        """
+        Generates the slug when the Topic is created or its title changes.
+        Loading a Topic never writes to the database.
+        """
+        if not self.slug or self.title != getattr(self, "_loaded_title", None):
+            self.slug = self.make_slug(self.title)
+        super().save(*args, **kwargs)
+        self._loaded_title = self.title
 
     def __str__(self):
         return self.slug
@@ -33,6 +224,7 @@ class Topic(models.Model):
         """
         return reverse("threads", args=[str(self.slug)])
 
+    @retry_on_lock
     def create_thread(self, title: str, author: User):
         """
         Helper method creates a Thread within this Topic. Automatically sets
@@ -56,12 +248,49 @@ class Topic(models.Model):
     def threads(self):
         """
         Helper method returns all Threads within this Topic, ordered in reverse
-        chronological order.
+        chronological order. Served from the prefetch cache when the Topic was
+        loaded by `TopicQuerySet.with_threads`.
 
         Returns:
             QuerySet[Thread]
         """
-        return self.thread_set.all().order_by("-created_date")
+        if "thread_set" in getattr(self, "_prefetched_objects_cache", {}):
+            return self.thread_set.all()
+        return self.thread_set.all().order_by("-created_date", "-id")
+
+    def paginate_threads(
+        self,
+        after: str = None,
+        before: str = None,
+        page_size: int = None,
+        queryset: models.QuerySet = None,
+    ) -> KeysetPage:
+        """
+        Helper method returns one page of this Topic's Threads, newest first,
+        using keyset pagination on (created_date, id).
+
+        Args:
+            after (str): Cursor; return the page following this Thread.
+            before (str): Cursor; return the page preceding this Thread.
+            page_size (int): Threads per page. Defaults to THREADS_PER_PAGE.
+            queryset (QuerySet[Thread]): This Topic's Threads, e.g. with
+                select_related() applied. Defaults to all of them.
+
+        Raises:
+            ValueError: A cursor is malformed.
+
+        Returns:
+            KeysetPage
+        """
+        if queryset is None:
+            queryset = self.thread_set.all()
+        return keyset_paginate(
+            queryset,
+            after=after,
+            before=before,
+            page_size=page_size or self.THREADS_PER_PAGE,
+            descending=True,
+        )
 
 
 class Thread(models.Model):
@@ -72,9 +301,50 @@ class Thread(models.Model):
     """
 
     title = models.CharField(max_length=120, blank=False, unique=True)
-    topic = models.ForeignKey(Topic, null=True, blank=False, on_delete=models.SET_NULL)
-    author = models.ForeignKey(User, null=True, blank=False, on_delete=models.CASCADE)
+    # The composite indexes in Meta lead with these columns, so the FKs don't
+    # need their own.
+    topic = models.ForeignKey(
+        Topic, null=True, blank=False, on_delete=models.SET_NULL, db_index=False
+    )
+    author = models.ForeignKey(
+        User, null=True, blank=False, on_delete=models.CASCADE, db_index=False
+    )
     created_date = models.DateTimeField()
+    # Denormalized counters, maintained by messageboard.signals
+    message_count = models.PositiveIntegerField(default=0)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    # Last change to the Thread or anything in it, set by messageboard.signals;
+    # HTTP validators are derived from it
+    modified_date = models.DateTimeField(default=timezone.now)
+    # Changed by messageboard.signals whenever a page showing the Thread would
+    # change; cached pages are keyed by it
+    version = models.PositiveIntegerField(default=new_version)
+
+    objects = ThreadQuerySet.as_manager()
+
+    MESSAGES_PER_PAGE = 50
+
+    class Meta:
+        indexes = [
+            # Serves the API's list of all Threads, in (created_date, id) order
+            models.Index(fields=["created_date"], name="thread_created_idx"),
+            models.Index(
+                fields=["topic", "created_date"], name="thread_topic_created_idx"
+            ),
+            models.Index(
+                fields=["author", "created_date"], name="thread_author_created_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the Topic the row was loaded with, so moving a Thread between
+        Topics can be detected on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_topic_id = instance.__dict__.get("topic_id")
+        return instance
 
     def __str__(self):
         return f"{self.title[:32]}"
@@ -85,6 +355,7 @@ class Thread(models.Model):
         """
         return reverse("messages", args=[str(self.topic.slug), str(self.id)])
 
+    @retry_on_lock
     def create_message(self, content: str, author: User):
         """
         Helper method creates a Message within this Thread. Automatically sets
@@ -109,13 +380,52 @@ class Thread(models.Model):
         """
         Helper method returns all Messages within this Thread, ordered
         chronologically. Filters out any Messages created _before_ the Thread
-        instance.
+        instance. Served from the prefetch cache when the Thread was loaded by
+        `ThreadQuerySet.with_messages`.
 
         Returns:
             QuerySet[Message]
         """
+        if "message_set" in getattr(self, "_prefetched_objects_cache", {}):
+            return self.message_set.all()
         return self.message_set.filter(created_date__gte=self.created_date).order_by(
-            "created_date"
+            "created_date", "id"
+        )
+
+    def paginate_messages(
+        self,
+        after: str = None,
+        before: str = None,
+        page_size: int = None,
+        queryset: models.QuerySet = None,
+    ) -> KeysetPage:
+        """
+        Helper method returns one page of this Thread's Messages, oldest first,
+        using keyset pagination on (created_date, id).
+
+        Args:
+            after (str): Cursor; return the page following this Message.
+            before (str): Cursor; return the page preceding this Message.
+            page_size (int): Messages per page. Defaults to MESSAGES_PER_PAGE.
+            queryset (QuerySet[Message]): This Thread's Messages, e.g. with
+                select_related() applied. Defaults to all of them.
+
+        Raises:
+            ValueError: A cursor is malformed.
+
+        Returns:
+            KeysetPage
+        """
+        # Same rows as `messages`, with the created_date floor applied by the
+        # paginator so it doesn't compete with the cursor for the index range.
+        if queryset is None:
+            queryset = self.message_set.all()
+        return keyset_paginate(
+            queryset,
+            after=after,
+            before=before,
+            page_size=page_size or self.MESSAGES_PER_PAGE,
+            since=self.created_date,
         )
 
 
@@ -127,12 +437,42 @@ class Message(models.Model):
     """
 
     content = models.TextField()
+    # The composite indexes in Meta lead with these columns, so the FKs don't
+    # need their own.
     thread = models.ForeignKey(
-        Thread, null=True, blank=False, on_delete=models.SET_NULL
+        Thread, null=True, blank=False, on_delete=models.SET_NULL, db_index=False
+    )
+    author = models.ForeignKey(
+        User, null=True, blank=False, on_delete=models.CASCADE, db_index=False
     )
-    author = models.ForeignKey(User, null=True, blank=False, on_delete=models.CASCADE)
     created_date = models.DateTimeField()
 
+    objects = BatchQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serves the API's list of all Messages, in (created_date, id) order
+            models.Index(fields=["created_date"], name="message_created_idx"),
+            models.Index(
+                fields=["thread", "created_date"], name="message_thread_created_idx"
+            ),
+            models.Index(
+                fields=["author", "created_date"], name="message_author_created_idx"
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remembers the Thread and content the row was loaded with, so moving or
+        editing a Message can be detected on save.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_thread_id = instance.__dict__.get("thread_id")
+        if "content" in instance.__dict__:
+            instance._loaded_content = instance.content
+        return instance
+
     def __str__(self):
         return f"{self.content[:32]}"
 
@@ -145,3 +485,29 @@ class Message(models.Model):
             Topic
         """
         return self.thread.topic
+
+
+class WordCount(models.Model):
+    """
+    Number of times a word is used in the Messages of a scope: the whole board
+    (""), a Topic ("topic:<id>") or a Thread ("thread:<id>").
+
+    Maintained by messageboard.signals as Messages are written, and rebuilt in
+    bulk by the `rebuild_word_counts` management command.
+    """
+
+    scope = models.CharField(max_length=32, blank=True)
+    word = models.CharField(max_length=64)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("scope", "word")
+        indexes = [
+            # Serves a scope's top words straight off the index
+            models.Index(
+                fields=["scope", "-count", "word"], name="wordcount_scope_top_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.word}: {self.count}"
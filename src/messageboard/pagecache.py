@@ -0,0 +1,110 @@
+"""
+Caches the rendered lists on the board's pages: the Topic list, a Topic's
+Threads and a Thread's Messages.
+
+Fragments are keyed by the `version` of the Topic or Thread they show, which
+messageboard.signals change on every write that affects them, so a write never
+has to find and delete cached fragments: the next read simply misses. Hits and
+misses are counted in memory by each process: counting them in a shared cache
+would add a write to every read.
+"""
+
+from collections import Counter
+from threading import Lock
+from typing import Callable, Dict, Optional
+
+from django.core.cache import caches
+from django.db.models import Count, Max, Sum
+from django.utils.safestring import mark_safe
+
+from messageboard.models import Thread, Topic
+from messageboard.pagination import decode_cursor
+
+# Alias of the cache in settings.CACHES holding the fragments
+CACHE_ALIAS = "pages"
+
+# Fragment cache hits and misses of this process
+_counters = Counter()
+_counters_lock = Lock()
+
+
+def _count(name: str) -> None:
+    with _counters_lock:
+        _counters[name] += 1
+
+
+def counters() -> Dict[str, int]:
+    """
+    Returns the number of fragment cache hits and misses of this process so
+    far.
+    """
+    with _counters_lock:
+        return {"hits": _counters["hits"], "misses": _counters["misses"]}
+
+
+def cached(key: str, render: Callable[[], str]) -> str:
+    """
+    Returns the fragment cached under `key`, rendering and caching it first
+    if needed.
+    """
+    cache = caches[CACHE_ALIAS]
+    html = cache.get(key)
+    if html is None:
+        _count("misses")
+        html = render()
+        cache.set(key, html)
+    else:
+        _count("hits")
+    return mark_safe(html)
+
+
+def _page(after: Optional[str], before: Optional[str]) -> str:
+    """
+    Key part for a page of a listing.
+
+    Raises:
+        ValueError: A cursor is malformed.
+    """
+    parts = []
+    for cursor in (after, before):
+        if cursor:
+            created, pk = decode_cursor(cursor)
+            parts.append(f"{created.isoformat()}/{pk}")
+        else:
+            parts.append("")
+    return ":".join(parts)
+
+
+def topic_list_key() -> str:
+    """
+    Key for the Topic list. Adding, removing or touching any Topic changes at
+    least one of the three figures.
+    """
+    topics = Topic.objects.aggregate(
+        count=Count("id"), last=Max("id"), versions=Sum("version")
+    )
+    return "messageboard:topics:{count}:{last}:{versions}".format(**topics)
+
+
+def thread_list_key(topic: Topic, after: str = None, before: str = None) -> str:
+    """
+    Key for a page of a Topic's Threads.
+
+    Raises:
+        ValueError: A cursor is malformed.
+    """
+    return f"messageboard:threads:{topic.id}:{topic.version}:{_page(after, before)}"
+
+
+def message_list_key(thread: Thread, after: str = None, before: str = None) -> str:
+    """
+    Key for a page of a Thread's Messages. The page also shows the Topic's
+    title, so the Topic's version is part of the key.
+
+    Raises:
+        ValueError: A cursor is malformed.
+    """
+    return (
+        f"messageboard:messages:{thread.id}:{thread.version}:"
+        f"{thread.topic.version if thread.topic else ''}:{_page(after, before)}"
+    )
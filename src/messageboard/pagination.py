@@ -0,0 +1,263 @@
+"""
+Keyset ("seek") pagination over `(created_date, id)`, for the HTML pages and
+the REST API.
+
+Unlike OFFSET pagination, each page is fetched with an index range scan that
+starts at the cursor, so the cost of a page doesn't depend on how deep into the
+listing it is.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class KeysetPage(NamedTuple):
+    """
+    A page of results.
+
+    Attributes:
+        object_list (list): The rows on this page, in display order.
+        next_cursor (Optional[str]): Pass as `after` to get the following page.
+        previous_cursor (Optional[str]): Pass as `before` to get the preceding page.
+    """
+
+    object_list: List
+    next_cursor: Optional[str]
+    previous_cursor: Optional[str]
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+def encode_cursor(obj) -> str:
+    """
+    Encodes the position of `obj`, a model instance or a named `values_list()`
+    row, as "<microseconds since epoch>-<id>".
+    """
+    delta = obj.created_date - EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds
+    return f"{micros}-{obj.id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Raises:
+        ValueError: The cursor is malformed, or outside the range of dates.
+    """
+    micros, _, pk = cursor.rpartition("-")
+    try:
+        return EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except OverflowError as e:
+        raise ValueError(f"Cursor out of range: {cursor}") from e
+
+
+def _seek(cursor: str, forwards: bool, since: Optional[datetime] = None) -> Q:
+    """
+    Predicate selecting rows strictly after (or before) the cursor in
+    `(created_date, id)` order, and not older than `since`.
+
+    Written as a single range on created_date minus the ties already seen,
+    rather than an OR, so SQLite can use it as an index range. SQLite only
+    uses one lower bound per column for the range, so `since` is folded into
+    the cursor's bound instead of being a second filter.
+    """
+    created_date, pk = decode_cursor(cursor)
+    if forwards:
+        if since is not None and since > created_date:
+            return Q(created_date__gte=since)
+        return Q(created_date__gte=created_date) & ~Q(
+            created_date=created_date, pk__lte=pk
+        )
+
+    predicate = Q(created_date__lte=created_date) & ~Q(
+        created_date=created_date, pk__gte=pk
+    )
+    if since is not None:
+        predicate &= Q(created_date__gte=since)
+    return predicate
+
+
+def keyset_queryset(
+    queryset: QuerySet,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    descending: bool = False,
+    since: Optional[datetime] = None,
+) -> QuerySet:
+    """
+    Filters and orders `queryset` to read away from a cursor. Rows before a
+    `before` cursor come back in reverse display order.
+
+    Args:
+        since (Optional[datetime]): Only include rows created at or after this.
+
+    Raises:
+        ValueError: A cursor is malformed.
+
+    Returns:
+        QuerySet
+    """
+    display_order, reverse_order = ["created_date", "id"], ["-created_date", "-id"]
+    if descending:
+        display_order, reverse_order = reverse_order, display_order
+
+    if after is not None:
+        seek = _seek(after, forwards=not descending, since=since)
+        return queryset.filter(seek).order_by(*display_order)
+    if before is not None:
+        seek = _seek(before, forwards=descending, since=since)
+        return queryset.filter(seek).order_by(*reverse_order)
+    if since is not None:
+        queryset = queryset.filter(created_date__gte=since)
+    return queryset.order_by(*display_order)
+
+
+def keyset_paginate(
+    queryset: QuerySet,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    page_size: int = 25,
+    descending: bool = False,
+    since: Optional[datetime] = None,
+) -> KeysetPage:
+    """
+    Returns one page of `queryset` ordered by `(created_date, id)`.
+
+    Args:
+        queryset (QuerySet): Rows to paginate. Any ordering is replaced.
+        after (Optional[str]): Cursor; return the page following this row.
+        before (Optional[str]): Cursor; return the page preceding this row.
+            Ignored if `after` is given.
+        page_size (int): Maximum number of rows on the page.
+        descending (bool): Display newest rows first.
+        since (Optional[datetime]): Only include rows created at or after this.
+
+    Raises:
+        ValueError: A cursor is malformed.
+
+    Returns:
+        KeysetPage
+    """
+    backwards = before is not None and after is None
+    queryset = keyset_queryset(
+        queryset, after=after, before=before, descending=descending, since=since
+    )
+
+    rows = list(queryset[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    if not rows:
+        return KeysetPage([], None, None)
+
+    if backwards:
+        next_cursor = encode_cursor(rows[-1])
+        previous_cursor = encode_cursor(rows[0]) if has_more else None
+    else:
+        next_cursor = encode_cursor(rows[-1]) if has_more else None
+        previous_cursor = encode_cursor(rows[0]) if after is not None else None
+    return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+class PageSizeMixin:
+    """
+    Lets API clients pick the page size with `?page_size=`, up to
+    `MESSAGEBOARD_API_MAX_PAGE_SIZE`.
+    """
+
+    page_size = settings.MESSAGEBOARD_API_PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = settings.MESSAGEBOARD_API_MAX_PAGE_SIZE
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+
+class KeysetCursorPagination(PageSizeMixin, BasePagination):
+    """
+    REST API pagination over `(created_date, id)`, oldest first. Pages link to
+    each other with the same `after` and `before` cursors as the HTML pages.
+
+    A view may set `keyset_options`, extra `keyset_paginate` arguments such as
+    `descending` or `since`.
+    """
+
+    after_query_param = "after"
+    before_query_param = "before"
+
+    def paginate_queryset(self, queryset, request, view=None) -> list:
+        self.request = request
+        try:
+            self.page = keyset_paginate(
+                queryset,
+                after=request.query_params.get(self.after_query_param),
+                before=request.query_params.get(self.before_query_param),
+                page_size=self.get_page_size(request),
+                **getattr(view, "keyset_options", {}),
+            )
+        except ValueError:
+            raise NotFound("Invalid cursor.")
+        return self.page.object_list
+
+    def get_link(self, query_param: str, cursor: Optional[str]) -> Optional[str]:
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.after_query_param)
+        url = remove_query_param(url, self.before_query_param)
+        return replace_query_param(url, query_param, cursor)
+
+    def get_next_link(self) -> Optional[str]:
+        return self.get_link(self.after_query_param, self.page.next_cursor)
+
+    def get_previous_link(self) -> Optional[str]:
+        return self.get_link(self.before_query_param, self.page.previous_cursor)
+
+    def get_paginated_response(self, data) -> Response:
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        link = {"type": "string", "nullable": True, "format": "uri"}
+        return {
+            "type": "object",
+            "properties": {"next": link, "previous": link, "results": schema},
+        }
+
+
+class IdCursorPagination(PageSizeMixin, CursorPagination):
+    """
+    REST API cursor pagination by id, for Topics, which have no created_date.
+    """
+
+    ordering = "id"
@@ -0,0 +1,144 @@
+"""
+Full-text search over Message content, backed by an SQLite FTS5 table.
+
+The `messageboard_message_fts` table holds a copy of each Message's content
+under the Message's id as its rowid. It is kept in sync by the handlers in
+messageboard.signals and can be rebuilt wholesale with `rebuild_index` (or the
+`rebuild_search_index` management command).
+"""
+
+import re
+from typing import Iterable, List, Optional
+
+from django.db import connection
+from django.db.models import prefetch_related_objects
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from messageboard.models import Message
+
+TABLE = "messageboard_message_fts"
+
+# Control characters stand in for the <mark> tags until the snippet has been
+# HTML-escaped. At worst, content containing them gets stray highlighting.
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turns free text into an FTS5 query matching every word in it. Quoting
+    each word keeps FTS5 operators in user input from being interpreted.
+
+    Args:
+        query (str): Free text search query.
+
+    Returns:
+        str: FTS5 MATCH expression, empty if `query` has no words.
+    """
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+
+
+def index_messages(messages: Iterable[Message]) -> None:
+    """
+    Adds Messages to the index, replacing any existing entries for them.
+    """
+    rows = [(message.id, message.content) for message in messages]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {TABLE} WHERE rowid = %s", [(pk,) for pk, _ in rows]
+        )
+        cursor.executemany(
+            f"INSERT INTO {TABLE} (rowid, content) VALUES (%s, %s)", rows
+        )
+
+
+def unindex_messages(message_ids: Iterable[int]) -> None:
+    """
+    Removes Messages from the index.
+    """
+    rows = [(pk,) for pk in message_ids]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {TABLE} WHERE rowid = %s", rows)
+
+
+def rebuild_index() -> int:
+    """
+    Rebuilds the index from the Message table in bulk.
+
+    Returns:
+        int: Number of Messages indexed.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(
+            f"INSERT INTO {TABLE} (rowid, content) "
+            f"SELECT id, content FROM {Message._meta.db_table}"
+        )
+        cursor.execute(f"INSERT INTO {TABLE} ({TABLE}) VALUES ('optimize')")
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE}")
+        return cursor.fetchone()[0]
+
+
+def search_messages(
+    query: str,
+    thread_id: Optional[int] = None,
+    topic_id: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[Message]:
+    """
+    Returns the Messages matching `query`, best match first.
+
+    Each Message has a `rank` (lower is better) and a `snippet`: an HTML-safe
+    excerpt of its content with the matched words wrapped in <mark> tags. Each
+    Message's Thread, Topic and author are prefetched.
+
+    Args:
+        query (str): Free text search query. Every word must match.
+        thread_id (Optional[int]): Only search this Thread.
+        topic_id (Optional[int]): Only search Threads in this Topic.
+        limit (int): Maximum number of results.
+        offset (int): Number of results to skip.
+
+    Returns:
+        List[Message]
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+
+    message_table = Message._meta.db_table
+    joins, where, params = [], [f"{TABLE} MATCH %s"], [_MARK_START, _MARK_END, match]
+    if thread_id is not None:
+        where.append("m.thread_id = %s")
+        params.append(thread_id)
+    if topic_id is not None:
+        joins.append("JOIN messageboard_thread t ON t.id = m.thread_id")
+        where.append("t.topic_id = %s")
+        params.append(topic_id)
+    params.extend([limit, offset])
+
+    sql = f"""
+        SELECT m.id, m.content, m.thread_id, m.author_id, m.created_date,
+               snippet({TABLE}, 0, %s, %s, '…', 16) AS snippet,
+               {TABLE}.rank AS rank
+        FROM {TABLE}
+        JOIN {message_table} m ON m.id = {TABLE}.rowid
+        {" ".join(joins)}
+        WHERE {" AND ".join(where)}
+        ORDER BY rank
+        LIMIT %s OFFSET %s
+    """
+    messages = list(Message.objects.raw(sql, params))
+    for message in messages:
+        message.snippet = mark_safe(
+            escape(message.snippet)
+            .replace(_MARK_START, "<mark>")
+            .replace(_MARK_END, "</mark>")
+        )
+    prefetch_related_objects(messages, "thread__topic", "author")
+    return messages
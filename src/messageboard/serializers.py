@@ -1,4 +1,10 @@
-from rest_framework import serializers
+from datetime import datetime
+from typing import Callable, Iterable, List
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import QuerySet
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from rest_flex_fields import FlexFieldsModelSerializer
 
 from messageboard.models import Message, Thread, Topic
@@ -45,11 +51,18 @@ class ThreadSerializer(FlexFieldsModelSerializer):
         """
         Inherits from the Topic model.
 
-        Exposes all fields.
+        Exposes all fields. The denormalized counters, modification date and
+        cache version are read-only.
         """
 
         model = Thread
         fields = "__all__"
+        read_only_fields = (
+            "message_count",
+            "last_message_at",
+            "modified_date",
+            "version",
+        )
         expandable_fields = {
             'messages': (MessageSerializer, {'many': True})
         }
@@ -68,24 +81,231 @@ class TopicSerializer(FlexFieldsModelSerializer):
             Serializer class.
     """
 
-    thread_count = serializers.SerializerMethodField()
-    message_count = serializers.SerializerMethodField()
-
-    def get_thread_count(self, topic):
-        return topic.threads.count()
-
-    def get_message_count(self, topic):
-        return Message.objects.filter(thread__topic=topic).count()
-
     class Meta:
         """
         Inherits from the Topic model.
 
-        Exposes all fields.
+        Exposes all fields. The denormalized counters, modification date and
+        cache version are read-only.
         """
 
         model = Topic
         fields = "__all__"
+        read_only_fields = (
+            "thread_count",
+            "message_count",
+            "last_activity",
+            "modified_date",
+            "version",
+        )
         expandable_fields = {
             'threads': (ThreadSerializer, {'many': True})
         }
+
+
+class ValuesSerializer:
+    """
+    Builds the representation a ModelSerializer gives, from `values_list()`
+    rows instead of model instances.
+
+    Fields whose representation is the column value itself (integers, strings
+    and primary keys of related rows) are copied as they are, and ISO 8601
+    datetimes are formatted directly; every other field still goes through its
+    `to_representation`, so the output is the same as the ModelSerializer's.
+    """
+
+    # Fields whose `to_representation` returns a column value unchanged
+    passthrough_fields = (
+        serializers.IntegerField,
+        serializers.CharField,
+        serializers.PrimaryKeyRelatedField,
+    )
+
+    def __init__(self, serializer_class: type):
+        fields = [
+            (name, field)
+            for name, field in serializer_class().fields.items()
+            if not field.write_only
+        ]
+        self.names = [name for name, field in fields]
+        self.columns = [field.source for name, field in fields]
+        self.fields = [
+            (index, field)
+            for index, (name, field) in enumerate(fields)
+            if not isinstance(field, self.passthrough_fields)
+        ]
+
+    @staticmethod
+    def converter(field: serializers.Field) -> Callable:
+        """
+        Returns a function giving the representation of a non-null value of
+        `field`.
+        """
+        output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+        if (
+            not isinstance(field, serializers.DateTimeField)
+            or output_format is None
+            or output_format.lower() != ISO_8601
+        ):
+            return field.to_representation
+
+        # DateTimeField.to_representation, for aware datetimes: the timezone
+        # is looked up once per call to `represent` rather than once per value
+        field_timezone = getattr(field, "timezone", field.default_timezone())
+
+        def to_representation(value):
+            aware = isinstance(value, datetime) and value.tzinfo is not None
+            if not aware or field_timezone is None:
+                return field.to_representation(value)
+            value = value.astimezone(field_timezone).isoformat()
+            return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+        return to_representation
+
+    def rows(self, queryset: QuerySet) -> QuerySet:
+        """
+        Returns `queryset` as named `values_list()` rows of the serializer's
+        columns.
+        """
+        return queryset.values_list(*self.columns, named=True)
+
+    def represent(self, rows: Iterable[tuple]) -> List[dict]:
+        """
+        Returns the representation of each row from `rows`.
+        """
+        names = self.names
+        converters = [(index, self.converter(field)) for index, field in self.fields]
+        data = []
+        for row in rows:
+            if converters:
+                row = list(row)
+                for index, convert in converters:
+                    if row[index] is not None:
+                        row[index] = convert(row[index])
+            data.append(dict(zip(names, row)))
+        return data
+
+
+def preload_related(serializer: serializers.Serializer, items: Iterable) -> None:
+    """
+    Loads the rows that the items of a batch name in `serializer`'s writable
+    primary key fields, with one query per field, so validating every item
+    with `serializer` doesn't look each one up separately. Ids that weren't
+    loaded are looked up as usual, giving the usual errors.
+    """
+    for name, field in serializer.fields.items():
+        if field.read_only or not isinstance(
+            field, serializers.PrimaryKeyRelatedField
+        ):
+            continue
+
+        queryset = field.get_queryset()
+        pk_field = queryset.model._meta.pk
+
+        def to_python(data, pk_field=pk_field):
+            try:
+                return pk_field.to_python(data)
+            except (DjangoValidationError, TypeError):
+                return None
+
+        pks = {to_python(item.get(name)) for item in items if isinstance(item, dict)}
+        rows = queryset.in_bulk(pks - {None})
+
+        def to_internal_value(data, field=field, rows=rows, to_python=to_python):
+            row = rows.get(to_python(data))
+            if row is None:
+                return type(field).to_internal_value(field, data)
+            return row
+
+        field.to_internal_value = to_internal_value
+
+
+class MessageSearchSerializer(MessageSerializer):
+    """
+    A Message search result: the Message plus its rank (lower is better) and
+    an HTML snippet with the matching words wrapped in <mark> tags.
+    """
+
+    snippet = serializers.CharField(read_only=True)
+    rank = serializers.FloatField(read_only=True)
+
+
+class MessageSearchQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the Message search endpoint.
+    """
+
+    q = serializers.CharField()
+    thread = serializers.IntegerField(required=False)
+    topic = serializers.IntegerField(required=False)
+    limit = serializers.IntegerField(
+        required=False, default=20, min_value=1, max_value=100
+    )
+    offset = serializers.IntegerField(required=False, default=0, min_value=0)
+
+
+class WordCountQuerySerializer(serializers.Serializer):
+    """
+    Validates the query parameters of the top words endpoint.
+    """
+
+    top = serializers.IntegerField(
+        required=False, default=10, min_value=1, max_value=1000
+    )
+    thread = serializers.IntegerField(required=False)
+    topic = serializers.IntegerField(required=False)
+
+    def validate(self, data):
+        if "thread" in data and "topic" in data:
+            raise serializers.ValidationError("Give either a thread or a topic.")
+        return data
+
+
+class ThreadFilterSerializer(serializers.Serializer):
+    """
+    Validates the filter query parameters of the Thread list, each of which
+    maps onto a column leading one of the Thread indexes.
+
+    `created_after` (inclusive) is applied by the list's keyset pagination,
+    which folds it into the cursor's range on created_date; `created_before`
+    is exclusive.
+    """
+
+    topic = serializers.IntegerField(required=False)
+    author = serializers.IntegerField(required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    ordering = serializers.ChoiceField(
+        choices=["created_date", "-created_date"],
+        required=False,
+        default="created_date",
+    )
+
+    # Query parameters filtered on here, and their lookups
+    lookups = {
+        "topic": "topic",
+        "author": "author",
+        "created_before": "created_date__lt",
+    }
+
+    def filter(self, queryset: QuerySet) -> QuerySet:
+        return queryset.filter(
+            **{
+                self.lookups[name]: value
+                for name, value in self.validated_data.items()
+                if name in self.lookups
+            }
+        )
+
+
+class MessageFilterSerializer(ThreadFilterSerializer):
+    """
+    Validates the filter query parameters of the Message list. Messages have
+    no Topic column, so `topic` joins through the Thread's Topic index.
+    """
+
+    thread = serializers.IntegerField(required=False)
+
+    lookups = dict(
+        ThreadFilterSerializer.lookups, thread="thread", topic="thread__topic"
+    )
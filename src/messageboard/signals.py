@@ -0,0 +1,279 @@
+"""
+Signal handlers that keep derived data in step with writes, whichever path
+makes them: the model helpers, the HTML views, the REST API or cascading
+deletes.
+
+The counter handlers issue single UPDATEs using F() expressions, so concurrent
+writers never overwrite each other's increments. The same UPDATEs mark the
+Topics and Threads affected as modified, and give those whose pages change a
+new cache version.
+"""
+
+from django.db import models
+from django.db.models import Case, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from messageboard import authentication, search, wordcounts
+from messageboard.models import (
+    Message,
+    Thread,
+    Topic,
+    User,
+    new_version,
+    post_create_batch,
+)
+
+
+def _latest(field_name: str, when):
+    """
+    Expression for the later of a nullable DateTimeField column and `when`.
+    """
+    when = Value(when, output_field=models.DateTimeField())
+    return Greatest(Coalesce(F(field_name), when), when)
+
+
+def _unless_latest(field_name: str, when, latest):
+    """
+    Expression for a nullable DateTimeField column, replaced by `latest` where
+    it is `when`.
+    """
+    return Case(
+        When(**{field_name: when}, then=latest),
+        default=F(field_name),
+        output_field=models.DateTimeField(),
+    )
+
+
+def _threads_created(topic_id: int, count: int, latest) -> None:
+    """
+    Counts `count` new Threads, the latest created at `latest`, in a Topic.
+    """
+    Topic.objects.filter(pk=topic_id).update(
+        thread_count=F("thread_count") + count,
+        last_activity=_latest("last_activity", latest),
+        modified_date=timezone.now(),
+        version=new_version(),
+    )
+
+
+def _messages_created(thread_id: int, count: int, latest) -> None:
+    """
+    Counts `count` new Messages, the latest created at `latest`, in a Thread
+    and its Topic.
+    """
+    Thread.objects.filter(pk=thread_id).update(
+        message_count=F("message_count") + count,
+        last_message_at=_latest("last_message_at", latest),
+        modified_date=timezone.now(),
+        version=new_version(),
+    )
+    Topic.objects.filter(thread=thread_id).update(
+        message_count=F("message_count") + count,
+        last_activity=_latest("last_activity", latest),
+        modified_date=timezone.now(),
+    )
+
+
+def _group_latest(instances, field_name: str):
+    """
+    Groups new rows by a foreign key, skipping those without one.
+
+    Returns:
+        Dict[int, Tuple[int, datetime]]: Number of rows and latest
+        `created_date` per key.
+    """
+    groups = {}
+    for instance in instances:
+        key = getattr(instance, field_name)
+        if key is None:
+            continue
+        count, latest = groups.get(key, (0, instance.created_date))
+        groups[key] = (count + 1, max(latest, instance.created_date))
+    return groups
+
+
+@receiver(post_save, sender=Thread)
+def thread_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    loaded_topic_id = getattr(instance, "_loaded_topic_id", instance.topic_id)
+    if created and instance.topic_id is not None:
+        _threads_created(instance.topic_id, 1, instance.created_date)
+    elif not created:
+        topics = Topic.objects.filter(pk__in=[loaded_topic_id, instance.topic_id])
+        if loaded_topic_id != instance.topic_id:
+            topics.recount()
+            wordcounts.move_thread(instance.id, loaded_topic_id, instance.topic_id)
+        Thread.objects.filter(pk=instance.pk).touch()
+        topics.touch()
+    instance._loaded_topic_id = instance.topic_id
+
+
+@receiver(post_create_batch, sender=Thread)
+def threads_created(sender, instances, **kwargs):
+    for topic_id, (count, latest) in _group_latest(instances, "topic_id").items():
+        _threads_created(topic_id, count, latest)
+    for instance in instances:
+        instance._loaded_topic_id = instance.topic_id
+
+
+@receiver(post_delete, sender=Thread)
+def thread_deleted(sender, instance, **kwargs):
+    # A cascading delete may already have decremented the Topic for some of
+    # this Thread's Messages, so recount rather than subtract.
+    if instance.topic_id is not None:
+        Topic.objects.filter(pk=instance.topic_id).recount()
+        Topic.objects.filter(pk=instance.topic_id).touch()
+    wordcounts.move_thread(instance.id, instance.topic_id, None)
+    wordcounts.drop_scope(wordcounts.thread_scope(instance.id))
+
+
+@receiver(post_save, sender=Topic)
+def topic_saved(sender, instance, created, raw=False, **kwargs):
+    # A new Topic changes the Topic list's cache key by itself
+    if not raw and not created:
+        Topic.objects.filter(pk=instance.pk).touch()
+
+
+@receiver(pre_delete, sender=Topic)
+def topic_deleting(sender, instance, **kwargs):
+    # The Topic's Threads are about to lose their topic
+    Thread.objects.filter(topic=instance.pk).touch(pages=False)
+
+
+@receiver(post_delete, sender=Topic)
+def topic_deleted(sender, instance, **kwargs):
+    wordcounts.drop_scope(wordcounts.topic_scope(instance.id))
+
+
+@receiver(post_save, sender=Message)
+def message_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    loaded_thread_id = getattr(instance, "_loaded_thread_id", instance.thread_id)
+    if created and instance.thread_id is not None:
+        _messages_created(instance.thread_id, 1, instance.created_date)
+    elif not created:
+        thread_ids = [loaded_thread_id, instance.thread_id]
+        if loaded_thread_id != instance.thread_id:
+            Thread.objects.filter(pk__in=thread_ids).recount()
+            Topic.objects.filter(thread__in=thread_ids).recount()
+        Thread.objects.filter(pk__in=thread_ids).touch()
+        Topic.objects.filter(thread__in=thread_ids).touch(pages=False)
+    instance._loaded_thread_id = instance.thread_id
+
+
+@receiver(post_create_batch, sender=Message)
+def messages_created(sender, instances, **kwargs):
+    for thread_id, (count, latest) in _group_latest(instances, "thread_id").items():
+        _messages_created(thread_id, count, latest)
+    search.index_messages(instances)
+    wordcounts.add_messages(instances)
+    for instance in instances:
+        instance._loaded_thread_id = instance.thread_id
+        instance._loaded_content = instance.content
+
+
+@receiver(post_delete, sender=Message)
+def message_deleted(sender, instance, **kwargs):
+    if instance.thread_id is None:
+        return
+
+    # The latest dates are only recomputed when the Message deleted was the
+    # latest, from the (thread, created_date) index and the Topic's Threads
+    Thread.objects.filter(pk=instance.thread_id).update(
+        message_count=Greatest(F("message_count") - 1, 0),
+        last_message_at=_unless_latest(
+            "last_message_at",
+            instance.created_date,
+            Subquery(
+                Message.objects.filter(thread=OuterRef("pk"))
+                .order_by("-created_date")
+                .values("created_date")[:1]
+            ),
+        ),
+        modified_date=timezone.now(),
+        version=new_version(),
+    )
+    Topic.objects.filter(thread=instance.thread_id).update(
+        message_count=Greatest(F("message_count") - 1, 0),
+        last_activity=_unless_latest(
+            "last_activity",
+            instance.created_date,
+            Subquery(
+                Thread.objects.filter(topic=OuterRef("pk"))
+                .annotate(
+                    latest=Greatest(
+                        "created_date", Coalesce("last_message_at", "created_date")
+                    )
+                )
+                .order_by("-latest")
+                .values("latest")[:1]
+            ),
+        ),
+        modified_date=timezone.now(),
+    )
+
+
+@receiver(post_save, sender=Message)
+def message_saved_search(sender, instance, raw=False, **kwargs):
+    if not raw:
+        search.index_messages([instance])
+
+
+@receiver(post_delete, sender=Message)
+def message_deleted_search(sender, instance, **kwargs):
+    search.unindex_messages([instance.id])
+
+
+@receiver(pre_save, sender=Message)
+def message_saving_words(sender, instance, raw=False, **kwargs):
+    # Note what an existing Message's words are currently counted under. Rows
+    # loaded without their content are looked up again.
+    if raw or instance._state.adding:
+        return
+    if hasattr(instance, "_loaded_content"):
+        previous = (instance._loaded_content, instance._loaded_thread_id)
+    else:
+        previous = (
+            Message.objects.filter(pk=instance.pk)
+            .values_list("content", "thread_id")
+            .first()
+        )
+    instance._counted_words = previous
+
+
+@receiver(post_save, sender=Message)
+def message_saved_words(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    previous = instance.__dict__.pop("_counted_words", None)
+    if created or previous is None:
+        wordcounts.add_message(instance.content, instance.thread_id)
+    else:
+        wordcounts.change_message(*previous, instance.content, instance.thread_id)
+    instance._loaded_content = instance.content
+
+
+@receiver(post_delete, sender=Message)
+def message_deleted_words(sender, instance, **kwargs):
+    wordcounts.remove_message(instance.content, instance.thread_id)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    authentication.cache.delete(instance.key)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # The cached user may be stale, or inactive now
+    authentication.cache.delete_user(instance.pk)
@@ -0,0 +1,71 @@
+"""
+SQLite tuning for several processes or threads sharing the database.
+
+`configure_connection` applies the PRAGMAs of `MESSAGEBOARD_SQLITE_PRAGMAS` to
+every new SQLite connection. The production profile in config.settings, chosen
+with `MESSAGEBOARD_SQLITE_PROFILE=production`, turns on write-ahead logging, so
+readers no longer wait for writers, and sets a busy timeout, so writers queue
+for the lock rather than fail at once.
+
+Some conflicts aren't waited out by the busy timeout, such as a transaction
+that read before writing while another connection committed. `retry_on_lock`
+runs a write in its own transaction, and runs it again, a bounded number of
+times, when it fails with "database is locked".
+"""
+
+import random
+import time
+from functools import wraps
+from typing import Callable
+
+from django.conf import settings
+from django.db import OperationalError, transaction
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Messages of the OperationalErrors worth retrying
+LOCK_ERRORS = ("database is locked", "database table is locked")
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    pragmas = getattr(settings, "MESSAGEBOARD_SQLITE_PRAGMAS", {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+def is_lock_error(error: OperationalError) -> bool:
+    return any(message in str(error) for message in LOCK_ERRORS)
+
+
+def retry_on_lock(func: Callable) -> Callable:
+    """
+    Decorates a write to run in a transaction, retried up to
+    `MESSAGEBOARD_DB_LOCK_RETRIES` times while the database is locked, with
+    jittered exponential backoff from `MESSAGEBOARD_DB_LOCK_RETRY_DELAY`
+    seconds.
+
+    Inside an enclosing transaction the write just runs: only the outermost
+    transaction can be retried.
+    """
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if transaction.get_connection().in_atomic_block:
+            return func(*args, **kwargs)
+
+        retries = settings.MESSAGEBOARD_DB_LOCK_RETRIES
+        delay = settings.MESSAGEBOARD_DB_LOCK_RETRY_DELAY
+        for attempt in range(retries + 1):
+            try:
+                with transaction.atomic():
+                    return func(*args, **kwargs)
+            except OperationalError as error:
+                if attempt == retries or not is_lock_error(error):
+                    raise
+            time.sleep(delay * 2**attempt * random.uniform(0.5, 1.5))
+
+    return wrapper
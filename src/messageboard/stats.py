@@ -0,0 +1,132 @@
+"""
+Aggregate statistics about the whole message board, computed in SQL.
+
+Counts come from the denormalized Topic and Thread counters, or from
+COUNT/GROUP BY queries, so building the report never loads a Message body.
+The report is cached for `MESSAGEBOARD_STATS_TTL` seconds.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, Max, Min
+from django.utils import timezone
+
+from messageboard import authentication, pagecache
+from messageboard.models import Message, Thread, Topic
+
+CACHE_KEY = "messageboard:stats"
+
+# Percentiles of the number of Messages per Thread included in the report
+PERCENTILES = (50, 90, 99)
+
+
+def _average(total: int, count: int) -> float:
+    return round(total / count, 2) if count else 0.0
+
+
+def _percentile(threads, count: int, percentile: int) -> Optional[int]:
+    """
+    Returns the nearest-rank `percentile` of Thread.message_count, letting the
+    database sort and pick the single row at that rank.
+    """
+    if not count:
+        return None
+    rank = max(math.ceil(percentile / 100 * count), 1)
+    return threads.order_by("message_count").values_list("message_count", flat=True)[
+        rank - 1
+    ]
+
+
+def _topic_stats() -> List[Dict]:
+    topics = Topic.objects.order_by("title").values(
+        "id", "title", "slug", "thread_count", "message_count"
+    )
+    return [
+        dict(
+            topic,
+            avg_messages_per_thread=_average(
+                topic["message_count"], topic["thread_count"]
+            ),
+        )
+        for topic in topics
+    ]
+
+
+def _thread_stats() -> Dict:
+    """
+    Returns the number of Threads and the distribution of Messages per Thread.
+    """
+    threads = Thread.objects.all()
+    summary = threads.aggregate(
+        count=Count("id"),
+        min=Min("message_count"),
+        max=Max("message_count"),
+        avg=Avg("message_count"),
+    )
+    stats = {
+        "count": summary["count"],
+        "min": summary["min"],
+        "max": summary["max"],
+        "avg": round(summary["avg"] or 0, 2),
+    }
+    for percentile in PERCENTILES:
+        stats[f"p{percentile}"] = _percentile(threads, summary["count"], percentile)
+    return stats
+
+
+def _author_stats() -> List[Dict]:
+    """
+    Returns the number of Threads and Messages written by each author who has
+    written anything, most prolific first.
+    """
+    authors = {}
+    for model, field in ((Thread, "thread_count"), (Message, "message_count")):
+        rows = (
+            model.objects.filter(author__isnull=False)
+            .order_by()
+            .values_list("author_id", "author__username")
+            .annotate(count=Count("id"))
+        )
+        for user_id, username, count in rows:
+            author = authors.setdefault(
+                user_id, {"username": username, "thread_count": 0, "message_count": 0}
+            )
+            author[field] = count
+    authors = list(authors.values())
+    authors.sort(key=lambda author: (-author["message_count"], author["username"]))
+    return authors
+
+
+def compute_board_stats() -> Dict:
+    """
+    Computes the statistics report straight from the database.
+    """
+    topics = _topic_stats()
+    per_thread = _thread_stats()
+    threads = per_thread.pop("count")
+    messages = Message.objects.count()
+    return {
+        "generated_at": timezone.now(),
+        "topic_count": len(topics),
+        "thread_count": threads,
+        "message_count": messages,
+        "avg_messages_per_thread": _average(messages, threads),
+        "messages_per_thread": per_thread,
+        "topics": topics,
+        "authors": _author_stats(),
+        "page_cache": pagecache.counters(),
+        "token_cache": authentication.counters(),
+    }
+
+
+def board_stats() -> Dict:
+    """
+    Returns the statistics report, recomputing it at most once every
+    `MESSAGEBOARD_STATS_TTL` seconds.
+    """
+    return cache.get_or_set(
+        CACHE_KEY, compute_board_stats, settings.MESSAGEBOARD_STATS_TTL
+    )
@@ -0,0 +1,407 @@
+"""
+A request to every named route of the board and its accounts API, shared by
+the query budget tests and the benchmark suite (`benchmarks/suite.py`).
+"""
+
+from io import StringIO
+from typing import Any, Callable, List, NamedTuple, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client
+from django.urls import URLResolver
+from django.urls.base import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from messageboard import urls
+from messageboard.accounts.api import urls as account_urls
+from messageboard.models import Message, Thread
+
+SEARCH_WORDS = "lorem"
+
+
+class Board(NamedTuple):
+    """
+    What the cases request: rows of the seeded board, a logged in client, a
+    client authenticating with a token, and an anonymous one.
+    """
+
+    topic: Any
+    thread: Any
+    message: Any
+    user: Any
+    anonymous: Any
+    session: Any
+    api: Any
+
+
+class Case(NamedTuple):
+    """
+    A request to a route.
+
+    Attributes:
+        name (str): Unique name.
+        route (str): URL name of the route requested.
+        method (str): HTTP method.
+        client (str): "anonymous", "session" (logged in) or "api" (token).
+        request (Callable[[Board, int], dict]): Builds the path and data of the
+            `i`th request, plus any extra headers.
+        status (int): Expected response status.
+        limit (Optional[int]): Caps the number of benchmarked requests, for
+            slow cases.
+    """
+
+    name: str
+    route: str
+    method: str
+    client: str
+    request: Callable[[Board, int], dict]
+    status: int = 200
+    limit: Optional[int] = None
+
+
+def seed_board(username: str, **options) -> Board:
+    """
+    Seeds a board with the `seed_database` `options`, and adds the user
+    `username`, with a Message in the busiest Thread, for the cases to use.
+    """
+    call_command("seed_database", seed=0, stdout=StringIO(), **options)
+    user = get_user_model().objects.create_user(username=username, password="password")
+    # The busiest Thread, in the middle of the board
+    thread = Thread.objects.select_related("topic").order_by("-message_count").first()
+    message = thread.create_message(content="Seeded message", author=user)
+
+    session = Client()
+    session.force_login(user)
+    api = APIClient()
+    api.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+    return Board(
+        topic=thread.topic,
+        thread=thread,
+        message=message,
+        user=user,
+        anonymous=Client(),
+        session=session,
+        api=api,
+    )
+
+
+def page(name: str, **params) -> Callable[[Board, int], dict]:
+    return lambda board, i: {"path": reverse(name), "data": params}
+
+
+def thread_kwargs(board: Board) -> dict:
+    return {"topic_slug": board.topic.slug, "thread_id": board.thread.id}
+
+
+def message_kwargs(board: Board, message: Message) -> dict:
+    return dict(thread_kwargs(board), pk=message.id)
+
+
+def own_message(board: Board, i: int) -> Message:
+    # A fresh Message of the logged in user for each delete
+    return board.thread.create_message(content=f"Own {i}", author=board.user)
+
+
+def api_message(board: Board, i: int) -> dict:
+    return {
+        "content": f"API message {i}",
+        "thread": board.thread.id,
+        "author": board.user.id,
+        "created_date": timezone.now().isoformat(),
+    }
+
+
+def revoke(board: Board, i: int) -> dict:
+    # A fresh token for each revocation, leaving the api client's alone
+    user = get_user_model().objects.create_user(username=f"revoked_{i}")
+    token = Token.objects.create(user=user)
+    return {
+        "path": reverse("accounts:token"),
+        "HTTP_AUTHORIZATION": f"Token {token.key}",
+    }
+
+
+CASES = [
+    # Pages
+    Case("topics", "topics", "GET", "anonymous", page("topics")),
+    Case(
+        "threads",
+        "threads",
+        "GET",
+        "anonymous",
+        lambda board, i: {"path": board.topic.get_url()},
+    ),
+    Case(
+        "messages",
+        "messages",
+        "GET",
+        "anonymous",
+        lambda board, i: {"path": board.thread.get_url()},
+    ),
+    Case(
+        "messages (logged in)",
+        "messages",
+        "GET",
+        "session",
+        lambda board, i: {"path": board.thread.get_url()},
+    ),
+    Case("search", "search", "GET", "anonymous", page("search", q=SEARCH_WORDS)),
+    Case("export", "export", "GET", "anonymous", page("export"), limit=3),
+    Case(
+        "new_thread form",
+        "new_thread",
+        "GET",
+        "session",
+        lambda board, i: {"path": reverse("new_thread", args=[board.topic.slug])},
+    ),
+    Case(
+        "new_thread",
+        "new_thread",
+        "POST",
+        "session",
+        lambda board, i: {
+            "path": reverse("new_thread", args=[board.topic.slug]),
+            "data": {"title": f"New thread {i}"},
+        },
+        status=302,
+    ),
+    Case(
+        "new_message form",
+        "new_message",
+        "GET",
+        "session",
+        lambda board, i: {"path": reverse("new_message", kwargs=thread_kwargs(board))},
+    ),
+    Case(
+        "new_message",
+        "new_message",
+        "POST",
+        "session",
+        lambda board, i: {
+            "path": reverse("new_message", kwargs=thread_kwargs(board)),
+            "data": {"content": f"New message {i}"},
+        },
+        status=302,
+    ),
+    Case(
+        "update_message form",
+        "update_message",
+        "GET",
+        "session",
+        lambda board, i: {
+            "path": reverse(
+                "update_message", kwargs=message_kwargs(board, board.message)
+            )
+        },
+    ),
+    Case(
+        "update_message",
+        "update_message",
+        "POST",
+        "session",
+        lambda board, i: {
+            "path": reverse(
+                "update_message", kwargs=message_kwargs(board, board.message)
+            ),
+            "data": {"content": f"Edited {i}", "author": board.user.id},
+        },
+        status=302,
+    ),
+    Case(
+        "delete_message form",
+        "delete_message",
+        "GET",
+        "session",
+        lambda board, i: {
+            "path": reverse(
+                "delete_message", kwargs=message_kwargs(board, board.message)
+            )
+        },
+    ),
+    Case(
+        "delete_message",
+        "delete_message",
+        "POST",
+        "session",
+        lambda board, i: {
+            "path": reverse(
+                "delete_message", kwargs=message_kwargs(board, own_message(board, i))
+            )
+        },
+        status=302,
+    ),
+    # REST API
+    Case("api-root", "api-root", "GET", "anonymous", page("api-root")),
+    Case("topic-list", "topic-list", "GET", "anonymous", page("topic-list")),
+    Case(
+        "topic-list expanded",
+        "topic-list",
+        "GET",
+        "anonymous",
+        page("topic-list", expand="threads.messages", page_size=2),
+    ),
+    Case(
+        "topic-detail",
+        "topic-detail",
+        "GET",
+        "anonymous",
+        lambda board, i: {"path": reverse("topic-detail", args=[board.topic.id])},
+    ),
+    Case(
+        "topic-list create",
+        "topic-list",
+        "POST",
+        "api",
+        lambda board, i: {
+            "path": reverse("topic-list"),
+            "data": {"title": f"API topic {i}", "slug": f"api-topic-{i}"},
+        },
+        status=201,
+    ),
+    Case("thread-list", "thread-list", "GET", "anonymous", page("thread-list")),
+    Case(
+        "thread-list expanded",
+        "thread-list",
+        "GET",
+        "anonymous",
+        page("thread-list", expand="~all", page_size=10),
+    ),
+    Case(
+        "thread-detail",
+        "thread-detail",
+        "GET",
+        "anonymous",
+        lambda board, i: {"path": reverse("thread-detail", args=[board.thread.id])},
+    ),
+    Case(
+        "thread-list create",
+        "thread-list",
+        "POST",
+        "api",
+        lambda board, i: {
+            "path": reverse("thread-list"),
+            "data": {
+                "title": f"API thread {i}",
+                "topic": board.topic.id,
+                "author": board.user.id,
+                "created_date": timezone.now().isoformat(),
+            },
+        },
+        status=201,
+    ),
+    Case("message-list", "message-list", "GET", "anonymous", page("message-list")),
+    Case(
+        "message-list filtered",
+        "message-list",
+        "GET",
+        "anonymous",
+        lambda board, i: {
+            "path": reverse("message-list"),
+            "data": {"topic": board.topic.id, "ordering": "-created_date"},
+        },
+    ),
+    Case(
+        "message-detail",
+        "message-detail",
+        "GET",
+        "anonymous",
+        lambda board, i: {"path": reverse("message-detail", args=[board.message.id])},
+    ),
+    Case(
+        "message-list create",
+        "message-list",
+        "POST",
+        "api",
+        lambda board, i: {
+            "path": reverse("message-list"),
+            "data": api_message(board, i),
+        },
+        status=201,
+    ),
+    Case(
+        "message-list create 100",
+        "message-list",
+        "POST",
+        "api",
+        lambda board, i: {
+            "path": reverse("message-list"),
+            "data": [api_message(board, i * 100 + j) for j in range(100)],
+        },
+        status=201,
+        limit=20,
+    ),
+    Case(
+        "message-search",
+        "message-search",
+        "GET",
+        "anonymous",
+        page("message-search", q=SEARCH_WORDS),
+    ),
+    Case("stats-list", "stats-list", "GET", "anonymous", page("stats-list")),
+    Case("stats-words", "stats-words", "GET", "anonymous", page("stats-words")),
+    # Accounts API; password hashing dominates these
+    Case(
+        "accounts:create",
+        "accounts:create",
+        "POST",
+        "anonymous",
+        lambda board, i: {
+            "path": reverse("accounts:create"),
+            "data": {"username": f"created_{i}", "password": "password"},
+        },
+        status=201,
+        limit=20,
+    ),
+    Case(
+        "accounts:token",
+        "accounts:token",
+        "POST",
+        "anonymous",
+        lambda board, i: {
+            "path": reverse("accounts:token"),
+            "data": {"username": board.user.username, "password": "password"},
+        },
+        limit=20,
+    ),
+    Case(
+        "accounts:token revoke",
+        "accounts:token",
+        "DELETE",
+        "anonymous",
+        revoke,
+        status=204,
+        limit=20,
+    ),
+    Case("accounts:me", "accounts:me", "GET", "api", page("accounts:me")),
+    Case(
+        "accounts:me update",
+        "accounts:me",
+        "PATCH",
+        "api",
+        lambda board, i: {
+            "path": reverse("accounts:me"),
+            "data": {"first_name": f"Name {i}"},
+        },
+    ),
+]
+
+
+def route_names() -> List[str]:
+    """
+    Returns the URL names of `messageboard.urls` and the accounts API.
+    """
+
+    def names(patterns, prefix=""):
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from names(pattern.url_patterns, prefix)
+            elif pattern.name:
+                yield prefix + pattern.name
+
+    return sorted(
+        set(names(urls.urlpatterns))
+        | set(names(account_urls.urlpatterns, f"{account_urls.app_name}:"))
+    )
@@ -0,0 +1,98 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from messageboard import authentication
+from messageboard.authentication import TokenCache
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+
+
+class CachedTokenAuthenticationTestCases(TestCase):
+    """
+    Automated tests for the token cache of the REST API's authentication.
+    """
+
+    def setUp(self):
+        authentication.cache.clear()
+        self.author = UserFactory()
+        self.thread = ThreadFactory(topic=TopicFactory(), author=self.author)
+        self.token = Token.objects.create(user=self.author)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def post_message(self):
+        return self.client.post(
+            reverse("message-list"),
+            {
+                "content": "Authenticated",
+                "thread": self.thread.id,
+                "author": self.author.id,
+                "created_date": "2030-01-01T00:00:00Z",
+            },
+        )
+
+    def token_queries(self):
+        """
+        Posts a Message, and returns the status and number of queries of the
+        token table.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post_message()
+        return response.status_code, sum(
+            "authtoken_token" in query["sql"] for query in queries
+        )
+
+    def test_token_cached(self):
+        self.assertEqual(self.token_queries(), (201, 1))
+        self.assertEqual(self.token_queries(), (201, 0))
+        counters = authentication.counters()
+        self.assertEqual((counters["hits"], counters["misses"]), (1, 1))
+        self.assertEqual(counters["hit_rate"], 0.5)
+
+    def test_revoked_token(self):
+        self.post_message()
+        response = self.client.delete(reverse("accounts:token"))
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Token.objects.filter(key=self.token.key).exists())
+        self.assertEqual(self.post_message().status_code, 401)
+
+    def test_token_deleted(self):
+        self.post_message()
+        self.token.delete()
+        self.assertEqual(self.post_message().status_code, 401)
+
+    def test_user_changed(self):
+        self.post_message()
+        self.author.is_active = False
+        self.author.save()
+        self.assertEqual(self.post_message().status_code, 401)
+
+    def test_profile_update_is_seen(self):
+        self.assertEqual(self.client.get(reverse("accounts:me")).status_code, 200)
+        self.client.patch(reverse("accounts:me"), {"first_name": "Renamed"})
+        response = self.client.get(reverse("accounts:me"))
+        self.assertEqual(response.json()["first_name"], "Renamed")
+
+    def test_ttl(self):
+        cache = TokenCache(size=10, ttl=60)
+        with mock.patch("time.monotonic", return_value=1000):
+            cache.set("key", ("user", "token"))
+            self.assertEqual(cache.get("key"), ("user", "token"))
+        with mock.patch("time.monotonic", return_value=1060):
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(cache.counters()["size"], 0)
+
+    def test_least_recently_used_evicted(self):
+        cache = TokenCache(size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(cache.counters()["evictions"], 1)
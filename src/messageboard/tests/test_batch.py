@@ -0,0 +1,171 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from rest_framework.test import APIClient
+
+from messageboard import wordcounts
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+from messageboard.models import Message, Thread, WordCount
+from messageboard.search import search_messages
+
+
+class BatchCreateTestCases(TestCase):
+    """
+    Automated tests for creating many Threads or Messages with one request.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(topic=self.topic, author=self.author)
+        self.start = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.author)
+
+    def message(self, i, **data):
+        return dict(
+            {
+                "content": f"Batched message number{i}",
+                "thread": self.thread.id,
+                "author": self.author.id,
+                "created_date": (self.start + timedelta(minutes=i)).isoformat(),
+            },
+            **data,
+        )
+
+    def post(self, name, items):
+        return self.client.post(reverse(name), items, format="json")
+
+    def test_create_messages(self):
+        version = self.thread.version
+        items = [self.message(i) for i in range(3)]
+        items += [self.message(3, content=""), self.message(4, thread=0), "nope"]
+        response = self.post("message-list", items)
+        self.assertEqual(response.status_code, 201, response.content)
+
+        body = response.json()
+        self.assertEqual(sorted(body["errors"]), ["3", "4", "5"])
+        self.assertIn("content", body["errors"]["3"])
+        self.assertIn("thread", body["errors"]["4"])
+        self.assertEqual(
+            [(row["id"], row["content"]) for row in body["created"]],
+            list(Message.objects.order_by("id").values_list("id", "content")),
+        )
+
+        self.thread.refresh_from_db()
+        self.topic.refresh_from_db()
+        self.assertEqual(self.thread.message_count, 3)
+        self.assertEqual(self.topic.message_count, 3)
+        self.assertEqual(self.thread.last_message_at, self.start + timedelta(minutes=2))
+        self.assertEqual(self.topic.last_activity, self.start + timedelta(minutes=2))
+        self.assertNotEqual(self.thread.version, version)
+
+        self.assertEqual(
+            [message.id for message in search_messages("number1")],
+            [body["created"][1]["id"]],
+        )
+        self.assertEqual(
+            wordcounts.top_words(wordcounts.topic_scope(self.topic.id), 1)[0],
+            {"word": "batched", "count": 3},
+        )
+
+    def test_word_counts_match_rebuild(self):
+        other = ThreadFactory(topic=TopicFactory(), author=self.author)
+        items = [self.message(i) for i in range(4)]
+        items += [self.message(i, thread=other.id) for i in range(4, 6)]
+        self.assertEqual(self.post("message-list", items).status_code, 201)
+
+        rows = set(WordCount.objects.values_list("scope", "word", "count"))
+        wordcounts.rebuild()
+        self.assertEqual(
+            rows, set(WordCount.objects.values_list("scope", "word", "count"))
+        )
+
+    def test_create_threads(self):
+        items = [
+            {
+                "title": f"Batched thread {i}",
+                "topic": self.topic.id,
+                "author": self.author.id,
+                "created_date": (self.start + timedelta(minutes=i)).isoformat(),
+            }
+            for i in range(3)
+        ]
+        response = self.post("thread-list", items + [{"title": "No topic"}])
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(list(response.json()["errors"]), ["3"])
+
+        created = response.json()["created"]
+        self.assertEqual(
+            [row["id"] for row in created],
+            list(
+                Thread.objects.filter(title__startswith="Batched")
+                .order_by("id")
+                .values_list("id", flat=True)
+            ),
+        )
+        self.topic.refresh_from_db()
+        self.assertEqual(self.topic.thread_count, 4)
+        self.assertEqual(self.topic.last_activity, self.start + timedelta(minutes=2))
+
+    def test_repeated_unique_value(self):
+        item = {
+            "title": "Batched thread",
+            "topic": self.topic.id,
+            "author": self.author.id,
+            "created_date": self.start.isoformat(),
+        }
+        other = dict(item, title="Other batched thread")
+        response = self.post("thread-list", [item, other, item, dict(other)])
+        self.assertEqual(response.status_code, 201, response.content)
+
+        body = response.json()
+        self.assertEqual(sorted(body["errors"]), ["2", "3"])
+        self.assertIn("title", body["errors"]["2"])
+        self.assertEqual(
+            [row["title"] for row in body["created"]],
+            ["Batched thread", "Other batched thread"],
+        )
+        self.assertEqual(Thread.objects.filter(title="Batched thread").count(), 1)
+
+    def test_nothing_valid(self):
+        response = self.post("message-list", [self.message(0, content="")])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["created"], [])
+        self.assertFalse(Message.objects.exists())
+
+    def test_empty_batch(self):
+        response = self.post("message-list", [])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json(), {"non_field_errors": ["Expected a non-empty list."]}
+        )
+
+    @override_settings(MESSAGEBOARD_API_MAX_BATCH_SIZE=2)
+    def test_batch_size_limit(self):
+        response = self.post("message-list", [self.message(i) for i in range(3)])
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Message.objects.exists())
+
+    def test_queries_per_batch(self):
+        """
+        A batch costs the same number of queries whatever its size.
+        """
+        counts = []
+        for size in (2, 20):
+            items = [self.message(i) for i in range(size)]
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.post("message-list", items).status_code, 201)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_only_threads_and_messages(self):
+        response = self.post("topic-list", [{"title": "Batched topic"}])
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(user=None)
+        response = self.post("message-list", [self.message(0)])
+        self.assertIn(response.status_code, (401, 403))
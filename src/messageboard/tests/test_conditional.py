@@ -0,0 +1,150 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from rest_framework.test import APIClient
+
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+from messageboard.models import Message
+
+
+class ConditionalGetTestCases(TestCase):
+    """
+    Automated tests for the ETag and Last-Modified validators of the pages and
+    the API, and the 304 responses they allow.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(topic=self.topic, author=self.author)
+        self.message = self.thread.create_message(
+            content="First message", author=self.author
+        )
+        self.messages_url = reverse(
+            "messages",
+            kwargs={"topic_slug": self.topic.slug, "thread_id": self.thread.id},
+        )
+
+    def revalidate(self, url, client=None):
+        """
+        Fetches `url`, then asks for it again with its ETag. Returns the ETag
+        and the status and query count of the second request.
+        """
+        client = client or self.client
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        return etag, response.status_code, len(queries)
+
+    def test_pages_not_modified(self):
+        for url in (reverse("topics"), self.topic.get_url(), self.messages_url):
+            etag, status, queries = self.revalidate(url)
+            self.assertEqual(status, 304, url)
+            self.assertEqual(queries, 1, url)
+
+    def test_api_not_modified(self):
+        client = APIClient()
+        for url in (
+            reverse("topic-list"),
+            reverse("topic-detail", args=[self.topic.id]),
+            reverse("thread-list"),
+            reverse("thread-detail", args=[self.thread.id]),
+            reverse("message-list"),
+            reverse("message-detail", args=[self.message.id]),
+        ):
+            etag, status, queries = self.revalidate(url, client)
+            self.assertEqual(status, 304, url)
+            self.assertEqual(queries, 1, url)
+
+    def test_writes_change_etag(self):
+        """
+        Adding, editing and deleting a Message through the views changes the
+        validators of every page and API list showing it.
+        """
+        client = APIClient()
+        urls = [self.messages_url, self.topic.get_url(), reverse("topics")]
+        urls += [reverse("thread-list"), reverse("message-list")]
+        thread_kwargs = {"topic_slug": self.topic.slug, "thread_id": self.thread.id}
+        message_kwargs = dict(thread_kwargs, pk=self.message.id)
+        writes = [
+            (reverse("new_message", kwargs=thread_kwargs), {"content": "Second"}),
+            (
+                reverse("update_message", kwargs=message_kwargs),
+                {"content": "Edited", "author": self.author.id},
+            ),
+            (reverse("delete_message", kwargs=message_kwargs), {}),
+        ]
+
+        self.client.force_login(user=self.author)
+        etags = [client.get(url)["ETag"] for url in urls]
+        for write_url, data in writes:
+            self.assertEqual(self.client.post(write_url, data).status_code, 302)
+            for url, etag in zip(urls, etags):
+                with self.subTest(write=write_url, url=url):
+                    self.assertNotEqual(client.get(url)["ETag"], etag)
+            etags = [client.get(url)["ETag"] for url in urls]
+
+    def test_quiet_thread_not_modified(self):
+        """
+        Messages posted to another Thread of the Topic leave a Thread's pages
+        unmodified, but renaming the Topic doesn't.
+        """
+        busy = ThreadFactory(topic=self.topic, author=self.author)
+        etag = self.client.get(self.messages_url)["ETag"]
+
+        busy.create_message(content="Elsewhere", author=self.author)
+        response = self.client.get(self.messages_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.topic.title = "Renamed"
+        self.topic.save()
+        response = self.client.get(self.messages_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_messages_without_thread(self):
+        """
+        Messages left without a Thread have no validators, and neither has the
+        list of all Messages while it holds any, as their changes aren't
+        tracked.
+        """
+        client = APIClient()
+        self.assertTrue(client.get(reverse("message-list")).has_header("ETag"))
+        ThreadFactory(topic=self.topic, author=self.author).create_message(
+            content="Kept", author=self.author
+        )
+
+        self.thread.delete()
+        for url in (
+            reverse("message-list"),
+            reverse("message-detail", args=[self.message.id]),
+        ):
+            response = client.get(url, HTTP_IF_NONE_MATCH="*")
+            self.assertEqual(response.status_code, 200, url)
+            self.assertFalse(response.has_header("ETag"), url)
+
+        # Without the deleted Thread's Messages, the list is validated again
+        Message.objects.filter(thread__isnull=True).delete()
+        self.assertTrue(client.get(reverse("message-list")).has_header("ETag"))
+
+    def test_etag_depends_on_user(self):
+        anonymous = self.client.get(self.messages_url)["ETag"]
+        self.client.force_login(user=self.author)
+        response = self.client.get(self.messages_url, HTTP_IF_NONE_MATCH=anonymous)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], anonymous)
+
+    def test_missing_resources(self):
+        response = self.client.get(
+            reverse(
+                "messages",
+                kwargs={"topic_slug": self.topic.slug, "thread_id": 0},
+            ),
+            HTTP_IF_NONE_MATCH="*",
+        )
+        self.assertEqual(response.status_code, 404)
+        response = APIClient().get(reverse("message-detail", args=["nope"]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,173 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls.base import reverse
+from rest_framework.test import APIClient
+
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+from messageboard.models import Message, Thread, Topic
+
+
+class CounterTestCases(TestCase):
+    """
+    Automated tests for the denormalized Topic and Thread counters.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topic = TopicFactory()
+
+    def assertCounts(self, obj, **expected):
+        obj.refresh_from_db()
+        for field, value in expected.items():
+            self.assertEqual(getattr(obj, field), value, field)
+
+    def test_create_thread_and_message(self):
+        """
+        'create_thread' and 'create_message' increment the counters and move the
+        last activity forward.
+        """
+        thread = self.topic.create_thread(title="Counted", author=self.author)
+        self.assertCounts(self.topic, thread_count=1, message_count=0)
+        self.assertEqual(self.topic.last_activity, thread.created_date)
+
+        message = thread.create_message(content="Foo", author=self.author)
+        thread.create_message(content="Bar", author=self.author)
+
+        self.assertCounts(thread, message_count=2)
+        self.assertCounts(self.topic, thread_count=1, message_count=2)
+        self.assertGreaterEqual(thread.last_message_at, message.created_date)
+        self.assertEqual(self.topic.last_activity, thread.last_message_at)
+
+    def test_delete_message_view(self):
+        """
+        Deleting a Message through 'MessageDelete' decrements the counters.
+        """
+        thread = self.topic.create_thread(title="Counted", author=self.author)
+        message = thread.create_message(content="Foo", author=self.author)
+        self.client.force_login(user=self.author)
+
+        url = reverse(
+            "delete_message",
+            kwargs={
+                "topic_slug": self.topic.slug,
+                "thread_id": thread.id,
+                "pk": message.id,
+            },
+        )
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertCounts(thread, message_count=0)
+        self.assertCounts(self.topic, thread_count=1, message_count=0)
+
+    def test_delete_latest_message(self):
+        """
+        Deleting the latest Message moves the last activity back to the
+        Message or Thread before it.
+        """
+        thread = self.topic.create_thread(title="Counted", author=self.author)
+        older = thread.create_message(content="Foo", author=self.author)
+        newer = thread.create_message(content="Bar", author=self.author)
+        self.client.force_login(user=self.author)
+
+        for message, latest in ((newer, older.created_date), (older, None)):
+            url = reverse(
+                "delete_message",
+                kwargs={
+                    "topic_slug": self.topic.slug,
+                    "thread_id": thread.id,
+                    "pk": message.id,
+                },
+            )
+            self.assertEqual(self.client.post(url).status_code, 302)
+            self.assertCounts(thread, last_message_at=latest)
+            self.assertCounts(self.topic, last_activity=latest or thread.created_date)
+
+    def test_delete_older_message(self):
+        thread = self.topic.create_thread(title="Counted", author=self.author)
+        older = thread.create_message(content="Foo", author=self.author)
+        newer = thread.create_message(content="Bar", author=self.author)
+
+        older.delete()
+
+        self.assertCounts(thread, message_count=1, last_message_at=newer.created_date)
+        self.assertCounts(self.topic, last_activity=newer.created_date)
+
+    def test_api_create_and_move_message(self):
+        """
+        Messages created or moved through the API update both Threads.
+        """
+        first = self.topic.create_thread(title="First", author=self.author)
+        other_topic = TopicFactory()
+        second = other_topic.create_thread(title="Second", author=self.author)
+        client = APIClient()
+        client.force_authenticate(user=self.author)
+
+        response = client.post(
+            "/api/messages/",
+            {
+                "content": "Foo",
+                "thread": first.id,
+                "author": self.author.id,
+                "created_date": "2020-01-01T00:00:00Z",
+            },
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertCounts(first, message_count=1)
+        self.assertCounts(self.topic, message_count=1)
+
+        response = client.patch(
+            f"/api/messages/{response.data['id']}/", {"thread": second.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertCounts(first, message_count=0)
+        self.assertCounts(second, message_count=1)
+        self.assertCounts(self.topic, message_count=0)
+        self.assertCounts(other_topic, message_count=1)
+
+    def test_delete_thread(self):
+        """
+        Deleting a Thread leaves its Messages behind (SET_NULL) but removes
+        them from the Topic's counts.
+        """
+        thread = self.topic.create_thread(title="Counted", author=self.author)
+        thread.create_message(content="Foo", author=self.author)
+
+        thread.delete()
+
+        self.assertCounts(self.topic, thread_count=0, message_count=0)
+        self.assertEqual(Message.objects.count(), 1)
+
+    def test_delete_author_cascades(self):
+        """
+        Deleting a User cascades to their Threads and Messages, including
+        Messages other Users posted in those Threads.
+        """
+        other = UserFactory()
+        kept = self.topic.create_thread(title="Kept", author=other)
+        kept.create_message(content="Foo", author=self.author)
+        kept.create_message(content="Bar", author=other)
+        dropped = self.topic.create_thread(title="Dropped", author=self.author)
+        dropped.create_message(content="Baz", author=other)
+
+        self.author.delete()
+
+        self.assertCounts(kept, message_count=1)
+        self.assertCounts(self.topic, thread_count=1, message_count=1)
+
+    def test_recount_command(self):
+        """
+        The 'recount' command repairs counters that have drifted.
+        """
+        thread = ThreadFactory(topic=self.topic)
+        thread.create_message(content="Foo", author=self.author)
+        Thread.objects.update(message_count=10, last_message_at=None)
+        Topic.objects.update(thread_count=0, message_count=0, last_activity=None)
+
+        call_command("recount", stdout=StringIO())
+
+        self.assertCounts(thread, message_count=1)
+        self.assertCounts(self.topic, thread_count=1, message_count=1)
+        self.assertEqual(self.topic.last_activity, thread.last_message_at)
@@ -0,0 +1,105 @@
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from django.utils import timezone
+
+from messageboard.factories import TopicFactory, UserFactory
+from messageboard.models import Message, Thread, Topic
+
+
+class ExportTestCases(TestCase):
+    """
+    Automated tests for the streaming board export.
+    """
+
+    def setUp(self):
+        self.author = author = UserFactory()
+        now = timezone.now()
+        for i in range(3):
+            topic = TopicFactory()
+            for j in range(i):
+                thread = Thread.objects.create(
+                    title=f"Thread {i}.{j}",
+                    topic=topic,
+                    author=author,
+                    created_date=now - timedelta(days=j + 1),
+                )
+                for k in range(3):
+                    thread.create_message(content=f"Message “{i}.{j}.{k}”", author=author)
+
+    def test_matches_expanded_topics(self):
+        """
+        The export is the same document as the fully expanded topics endpoint.
+        """
+        expanded = self.client.get("/api/topics/", {"expand": "threads.messages"})
+
+        response = self.client.get(reverse("export"))
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/json")
+        exported = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(exported, json.loads(expanded.content)["results"])
+
+    def test_output_split_into_pieces(self):
+        """
+        Output is flushed in pieces as the buffer fills.
+        """
+        with mock.patch("messageboard.export.BUFFER_SIZE", 100):
+            response = self.client.get(reverse("export"))
+            pieces = list(response.streaming_content)
+
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual(len(json.loads(b"".join(pieces))), 3)
+
+    def test_threads_without_messages_split(self):
+        """
+        Topics and Threads without Messages are flushed as the buffer fills
+        too, not kept for the end.
+        """
+        Message.objects.all().delete()
+        for i in range(20):
+            TopicFactory().create_thread(title=f"Quiet {i}", author=self.author)
+
+        with mock.patch("messageboard.export.BUFFER_SIZE", 1000):
+            response = self.client.get(reverse("export"))
+            pieces = list(response.streaming_content)
+
+        self.assertTrue(all(len(piece) < 2000 for piece in pieces), pieces)
+        self.assertEqual(len(json.loads(b"".join(pieces))), 23)
+
+    def test_queries_constant(self):
+        """
+        The export runs the same queries however many Topics and Threads
+        there are.
+        """
+        counts = []
+        for _ in range(2):
+            with CaptureQueriesContext(connection) as queries:
+                b"".join(self.client.get(reverse("export")).streaming_content)
+            counts.append(len(queries))
+            topic = TopicFactory()
+            for j in range(5):
+                topic.create_thread(title=f"More {topic.id}.{j}", author=self.author)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_messages_before_thread_skipped(self):
+        thread = Thread.objects.order_by("id").first()
+        Message.objects.create(
+            content="Too early",
+            thread=thread,
+            author=self.author,
+            created_date=thread.created_date - timedelta(days=1),
+        )
+        response = self.client.get(reverse("export"))
+        self.assertNotIn(b"Too early", b"".join(response.streaming_content))
+
+    def test_empty_board(self):
+        Topic.objects.all().delete()
+        response = self.client.get(reverse("export"))
+
+        self.assertEqual(json.loads(b"".join(response.streaming_content)), [])
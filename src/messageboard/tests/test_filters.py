@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta, timezone
+
+from django.test import TestCase
+from django.urls.base import reverse
+
+from messageboard.factories import (
+    MessageFactory,
+    ThreadFactory,
+    TopicFactory,
+    UserFactory,
+)
+
+
+class ListFilterTestCases(TestCase):
+    """
+    Automated tests for the filter and ordering query parameters of the Thread
+    and Message lists.
+    """
+
+    def setUp(self):
+        self.start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.authors = [UserFactory(), UserFactory()]
+        self.topics = [TopicFactory(), TopicFactory()]
+        self.threads = [
+            ThreadFactory(
+                topic=self.topics[i % 2],
+                author=self.authors[i % 2],
+                created_date=self.start + timedelta(days=i),
+            )
+            for i in range(4)
+        ]
+        self.messages = [
+            MessageFactory(
+                thread=self.threads[i % 4],
+                author=self.authors[i // 4 % 2],
+                created_date=self.start + timedelta(days=4 + i),
+            )
+            for i in range(8)
+        ]
+
+    def ids(self, name, params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row["id"] for row in response.json()["results"]]
+
+    def test_message_filters(self):
+        thread, topic, author = self.threads[1], self.topics[0], self.authors[1]
+        cases = [
+            ({"thread": thread.id}, lambda m: m.thread == thread),
+            ({"topic": topic.id}, lambda m: m.thread.topic == topic),
+            ({"author": author.id}, lambda m: m.author == author),
+            (
+                {"topic": topic.id, "author": author.id},
+                lambda m: m.thread.topic == topic and m.author == author,
+            ),
+            (
+                {
+                    "created_after": self.messages[2].created_date.isoformat(),
+                    "created_before": self.messages[6].created_date.isoformat(),
+                },
+                lambda m: self.messages[2].created_date
+                <= m.created_date
+                < self.messages[6].created_date,
+            ),
+        ]
+        for params, selected in cases:
+            with self.subTest(**params):
+                expected = [m.id for m in self.messages if selected(m)]
+                self.assertTrue(expected)
+                self.assertEqual(self.ids("message-list", params), expected)
+
+    def test_thread_filters(self):
+        topic, author = self.topics[1], self.authors[0]
+        self.assertEqual(
+            self.ids("thread-list", {"topic": topic.id}),
+            [thread.id for thread in self.threads if thread.topic == topic],
+        )
+        self.assertEqual(
+            self.ids("thread-list", {"author": author.id}),
+            [thread.id for thread in self.threads if thread.author == author],
+        )
+
+    def test_newest_first(self):
+        """
+        `ordering=-created_date` pages through the list newest first, and
+        `created_after` still applies on later pages.
+        """
+        params = {
+            "ordering": "-created_date",
+            "page_size": 2,
+            "created_after": self.messages[3].created_date.isoformat(),
+        }
+        response = self.client.get(reverse("message-list"), params).json()
+        ids = [row["id"] for row in response["results"]]
+        while response["next"]:
+            response = self.client.get(response["next"]).json()
+            ids += [row["id"] for row in response["results"]]
+        self.assertEqual(ids, [message.id for message in self.messages[:2:-1]])
+
+    def test_invalid_parameters(self):
+        for params in (
+            {"thread": "x"},
+            {"created_after": "yesterday"},
+            {"ordering": "id"},
+        ):
+            with self.subTest(**params):
+                response = self.client.get(reverse("message-list"), params)
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,59 @@
+import re
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+from messageboard.middleware import QueryTimer
+
+SERVER_TIMING_RE = re.compile(
+    r'total;dur=[\d.]+, sql;dur=[\d.]+;desc="(?P<queries>\d+) queries"'
+)
+
+
+class RequestTimingTestCases(TestCase):
+    """
+    Automated tests for the request timing middleware.
+    """
+
+    def setUp(self):
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(topic=self.topic, author=UserFactory())
+
+    def test_server_timing(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.topic.get_url())
+        match = SERVER_TIMING_RE.fullmatch(response["Server-Timing"])
+        self.assertIsNotNone(match, response["Server-Timing"])
+        self.assertEqual(int(match["queries"]), len(queries))
+
+    def test_log_line(self):
+        with self.assertLogs("messageboard.requests", "INFO") as logs:
+            self.client.get(reverse("message-list"))
+            self.client.get(self.thread.get_url())
+            self.client.get("/nowhere/")
+        self.assertEqual(
+            [record.route for record in logs.records], ["message-list", "messages", "-"]
+        )
+        record = logs.records[0]
+        self.assertEqual((record.levelname, record.status), ("INFO", 200))
+        self.assertGreater(record.sql_count, 0)
+        self.assertIn("route=message-list status=200", record.getMessage())
+
+    @override_settings(
+        MESSAGEBOARD_SLOW_REQUEST_MS=0, MESSAGEBOARD_SLOW_REQUEST_QUERIES=1
+    )
+    def test_slow_request(self):
+        with self.assertLogs("messageboard.requests", "WARNING") as logs:
+            self.client.get(reverse("topics"))
+        lines = logs.records[0].getMessage().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertRegex(lines[1], r"^  [\d.]+ms SELECT ")
+
+    def test_slowest(self):
+        timer = QueryTimer()
+        timer.queries = [(1.0, "a"), (3.0, "b"), (2.0, "c")]
+        self.assertEqual(timer.slowest(2), [(3.0, "b"), (2.0, "c")])
+        self.assertEqual((timer.count, timer.duration), (3, 6.0))
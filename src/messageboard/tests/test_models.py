@@ -1,7 +1,9 @@
 import random
 
+from django.db import connection
 from django.db.utils import IntegrityError
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from messageboard.factories import (
     ThreadFactory,
@@ -73,6 +75,44 @@ class TopicTestCases(TestCase):
         for (a, b) in zip(topic.threads, all_topics_sorted):
             self.assertEqual(a, b)
 
+    def test_loading_topics_does_not_write(self):
+        """
+        Loading Topics, directly or through a Thread, only issues SELECTs.
+        """
+        topic = TopicFactory()
+        ThreadFactory(topic=topic)
+
+        with CaptureQueriesContext(connection) as queries:
+            list(Topic.objects.all())
+            Topic.objects.get(pk=topic.pk)
+            _ = Thread.objects.get().topic
+
+        statements = [query["sql"] for query in queries.captured_queries]
+        self.assertEqual(len(statements), 4)
+        for sql in statements:
+            self.assertTrue(sql.startswith("SELECT"), sql)
+
+    def test_topic_slug_follows_title(self):
+        """
+        Renaming a Topic regenerates its slug.
+        """
+        topic = TopicFactory(title="Old Title")
+        topic = Topic.objects.get(pk=topic.pk)
+
+        topic.title = "New Title"
+        topic.save()
+
+        topic.refresh_from_db()
+        self.assertEqual(topic.slug, "new-title")
+
+    def test_topic_slug_length(self):
+        """
+        Long titles are cut to the slug's length, without a trailing dash.
+        """
+        topic = TopicFactory(title="A rather long title for a topic, on purpose")
+        self.assertEqual(topic.slug, "a-rather-long-title-for-a-topic")
+        self.assertLessEqual(len(topic.slug), 32)
+
     def test_topic_url(self):
         """
         Topic URLs should be of the Form
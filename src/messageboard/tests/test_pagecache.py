@@ -0,0 +1,138 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+
+from messageboard import pagecache
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+
+
+class PageCacheTestCases(TestCase):
+    """
+    Automated tests for the page cache of the Topic, Thread and Message lists.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(topic=self.topic, author=self.author)
+        self.message = self.thread.create_message(
+            content="First message", author=self.author
+        )
+        self.messages_url = reverse(
+            "messages",
+            kwargs={"topic_slug": self.topic.slug, "thread_id": self.thread.id},
+        )
+
+    def get(self, url):
+        """
+        Returns the page content and whether its list came from the cache.
+        """
+        before = pagecache.counters()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        hits = pagecache.counters()["hits"] - before["hits"]
+        return response.content.decode(), bool(hits)
+
+    def message_url(self, name):
+        return reverse(
+            name,
+            kwargs={
+                "topic_slug": self.topic.slug,
+                "thread_id": self.thread.id,
+                "pk": self.message.id,
+            },
+        )
+
+    def test_message_list_follows_writes(self):
+        """
+        'create_message', 'MessageUpdate' and 'MessageDelete' each invalidate
+        the cached page, and the next request caches it again.
+        """
+        content, hit = self.get(self.messages_url)
+        self.assertFalse(hit)
+        content, hit = self.get(self.messages_url)
+        self.assertTrue(hit)
+        self.assertIn("First message", content)
+
+        self.thread.create_message(content="Second message", author=self.author)
+        content, hit = self.get(self.messages_url)
+        self.assertFalse(hit)
+        self.assertIn("Second message", content)
+
+        self.client.force_login(user=self.author)
+        self.client.post(
+            self.message_url("update_message"),
+            {"content": "Edited message", "author": self.author.id},
+        )
+        self.client.post(self.message_url("delete_message"))
+        self.client.logout()
+
+        content, hit = self.get(self.messages_url)
+        self.assertFalse(hit)
+        self.assertNotIn("First message", content)
+        self.assertNotIn("Edited message", content)
+        self.assertIn("Second message", content)
+
+    def test_cache_hit_queries(self):
+        """
+        A cached page of Messages costs only the Thread lookup.
+        """
+        self.get(self.messages_url)
+        with CaptureQueriesContext(connection) as queries:
+            content, hit = self.get(self.messages_url)
+        self.assertTrue(hit)
+        self.assertEqual(len(queries), 1)
+
+    def test_logged_in_pages_are_not_cached(self):
+        """
+        Logged in users get their own edit and delete buttons, never a cached
+        page.
+        """
+        self.get(self.messages_url)
+        self.client.force_login(user=self.author)
+        content, hit = self.get(self.messages_url)
+        self.assertFalse(hit)
+        self.assertIn(self.message_url("update_message"), content)
+
+        self.client.logout()
+        content, hit = self.get(self.messages_url)
+        self.assertTrue(hit)
+        self.assertNotIn(self.message_url("update_message"), content)
+
+    def test_topic_and_thread_lists(self):
+        """
+        'create_thread' and renaming a Topic invalidate the lists showing them.
+        """
+        threads_url = self.topic.get_url()
+        self.get(reverse("topics"))
+        self.get(threads_url)
+
+        self.topic.create_thread(title="Brand new thread", author=self.author)
+        content, hit = self.get(reverse("topics"))
+        self.assertFalse(hit)
+        self.assertIn("<i>Threads:</i> 2", content)
+        content, hit = self.get(threads_url)
+        self.assertFalse(hit)
+        self.assertIn("Brand new thread", content)
+
+        self.get(self.messages_url)
+        self.topic.title = "Renamed topic"
+        self.topic.save()
+        content, hit = self.get(reverse("topics"))
+        self.assertFalse(hit)
+        self.assertIn("Renamed topic", content)
+        content, hit = self.get(self.messages_url)
+        self.assertFalse(hit)
+
+    def test_warm_cache(self):
+        output = StringIO()
+        call_command("warm_cache", stdout=output)
+        self.assertIn("Pages warmed: 3", output.getvalue())
+
+        for url in (reverse("topics"), self.topic.get_url(), self.messages_url):
+            content, hit = self.get(url)
+            self.assertTrue(hit, url)
@@ -0,0 +1,205 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.test import TestCase
+from django.urls.base import reverse
+
+from messageboard.factories import (
+    MessageFactory,
+    ThreadFactory,
+    TopicFactory,
+    UserFactory,
+)
+from messageboard.models import Thread
+from messageboard.pagination import (
+    KeysetCursorPagination,
+    decode_cursor,
+    encode_cursor,
+)
+
+# A well-formed cursor far beyond the dates datetime can hold
+OUT_OF_RANGE = "99999999999999999999-1"
+
+
+class KeysetPaginationTestCases(TestCase):
+    """
+    Automated tests for keyset pagination of Threads and Messages.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(
+            topic=self.topic,
+            author=self.author,
+            created_date=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        )
+        # Pairs of Messages share a timestamp, so pages must break ties on id
+        self.messages = [
+            MessageFactory(
+                thread=self.thread,
+                author=self.author,
+                created_date=self.thread.created_date + timedelta(minutes=i // 2),
+            )
+            for i in range(7)
+        ]
+
+    def test_cursor_round_trip(self):
+        message = self.messages[3]
+        created_date, pk = decode_cursor(encode_cursor(message))
+
+        self.assertEqual(created_date, message.created_date)
+        self.assertEqual(pk, message.pk)
+
+        for cursor in ("x", "1-x", OUT_OF_RANGE, f"-{OUT_OF_RANGE}"):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+    def test_walk_messages_forwards_and_back(self):
+        """
+        Following 'after' cursors visits every Message once, in order, and
+        'before' cursors walk back through the same pages.
+        """
+        pages = [self.thread.paginate_messages(page_size=3)]
+        while pages[-1].has_next:
+            pages.append(
+                self.thread.paginate_messages(after=pages[-1].next_cursor, page_size=3)
+            )
+
+        seen = [message for page in pages for message in page.object_list]
+        self.assertEqual(seen, self.messages)
+        self.assertEqual([len(page.object_list) for page in pages], [3, 3, 1])
+        self.assertFalse(pages[0].has_previous)
+
+        previous = self.thread.paginate_messages(
+            before=pages[2].previous_cursor, page_size=3
+        )
+        self.assertEqual(previous.object_list, pages[1].object_list)
+        first = self.thread.paginate_messages(
+            before=previous.previous_cursor, page_size=3
+        )
+        self.assertEqual(first.object_list, pages[0].object_list)
+        self.assertFalse(first.has_previous)
+
+    def test_messages_before_thread_excluded(self):
+        """
+        Like 'Thread.messages', pages skip Messages older than the Thread.
+        """
+        MessageFactory(
+            thread=self.thread,
+            author=self.author,
+            created_date=self.thread.created_date - timedelta(days=1),
+        )
+        first = self.thread.paginate_messages(page_size=3)
+        last = self.thread.paginate_messages(before=first.next_cursor, page_size=3)
+
+        self.assertEqual(first.object_list, self.messages[:3])
+        self.assertEqual(last.object_list, self.messages[:2])
+
+    def test_threads_newest_first(self):
+        """
+        Topic Threads are paginated newest first.
+        """
+        newer = ThreadFactory(
+            topic=self.topic,
+            author=self.author,
+            created_date=self.thread.created_date + timedelta(days=1),
+        )
+
+        page = self.topic.paginate_threads(page_size=1)
+        self.assertEqual(page.object_list, [newer])
+        page = self.topic.paginate_threads(after=page.next_cursor, page_size=1)
+        self.assertEqual(page.object_list, [self.thread])
+        self.assertFalse(page.has_next)
+
+    def test_messages_view_pages(self):
+        """
+        The Messages page links to the next page with an 'after' cursor.
+        """
+        url = reverse(
+            "messages",
+            kwargs={"topic_slug": self.topic.slug, "thread_id": self.thread.id},
+        )
+        with mock.patch.object(Thread, "MESSAGES_PER_PAGE", 5):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["messages"]), self.messages[:5])
+        self.assertContains(response, f"?after={encode_cursor(self.messages[4])}")
+
+        response = self.client.get(url, {"after": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(url, {"after": OUT_OF_RANGE})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(self.topic.get_url(), {"before": OUT_OF_RANGE})
+        self.assertEqual(response.status_code, 404)
+
+
+class APIPaginationTestCases(TestCase):
+    """
+    Automated tests for cursor pagination of the REST API's lists.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topics = [TopicFactory() for _ in range(3)]
+        self.thread = ThreadFactory(
+            topic=self.topics[0],
+            author=self.author,
+            created_date=datetime(2020, 1, 1, tzinfo=timezone.utc),
+        )
+        # Pairs of Messages share a timestamp, so pages must break ties on id
+        self.messages = [
+            MessageFactory(
+                thread=self.thread,
+                author=self.author,
+                created_date=self.thread.created_date + timedelta(minutes=i // 2),
+            )
+            for i in range(7)
+        ]
+
+    def walk(self, url, params):
+        """
+        Follows 'next' links from `url`, returning the pages' results.
+        """
+        pages = [self.client.get(url, params).json()]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).json())
+        return [page["results"] for page in pages]
+
+    def test_walk_messages(self):
+        pages = self.walk(reverse("message-list"), {"page_size": 3})
+
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        ids = [message["id"] for page in pages for message in page]
+        self.assertEqual(ids, [message.id for message in self.messages])
+
+        invalid = self.client.get(reverse("message-list"), {"after": "x"})
+        self.assertEqual(invalid.status_code, 404)
+        for url in (reverse("message-list"), reverse("thread-list")):
+            invalid = self.client.get(url, {"after": OUT_OF_RANGE})
+            self.assertEqual(invalid.status_code, 404, url)
+
+    def test_previous_link(self):
+        first = self.client.get(reverse("message-list"), {"page_size": 3}).json()
+        second = self.client.get(first["next"]).json()
+        self.assertIsNone(first["previous"])
+        self.assertEqual(self.client.get(second["previous"]).json(), first)
+
+    def test_page_size_cap(self):
+        with mock.patch.object(KeysetCursorPagination, "max_page_size", 5):
+            response = self.client.get(reverse("message-list"), {"page_size": 1000})
+        self.assertEqual(len(response.json()["results"]), 5)
+
+    def test_topics_by_id(self):
+        pages = self.walk(reverse("topic-list"), {"page_size": 2})
+        ids = [topic["id"] for page in pages for topic in page]
+        self.assertEqual(ids, [topic.id for topic in self.topics])
+
+    def test_expand(self):
+        """
+        Each Thread on a page still expands to all of its Messages.
+        """
+        response = self.client.get(reverse("thread-list"), {"expand": "messages"})
+        (thread,) = response.json()["results"]
+        self.assertEqual(len(thread["messages"]), len(self.messages))
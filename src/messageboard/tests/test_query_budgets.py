@@ -0,0 +1,120 @@
+from typing import List
+
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from messageboard import authentication
+from messageboard.tests.routes import CASES, Board, Case, route_names, seed_board
+
+# seed_database options for a board of N rows, and one ten times larger in
+# every table and every list
+SCALES = [
+    {"topics": 2, "threads": 5, "messages": 5},
+    {"topics": 20, "threads": 50, "messages": 50},
+]
+
+# The most queries each case of messageboard.tests.routes may run, whatever
+# the size of the board
+BUDGETS = {
+    # Pages
+    "topics": 3,
+    "threads": 2,
+    "messages": 2,
+    "messages (logged in)": 4,
+    "search": 2,
+    "export": 5,
+    "new_thread form": 3,
+    "new_thread": 6,
+    "new_message form": 4,
+    "new_message": 11,
+    "update_message form": 4,
+    "update_message": 14,
+    "delete_message form": 3,
+    "delete_message": 10,
+    # REST API
+    "api-root": 0,
+    "topic-list": 2,
+    "topic-list expanded": 4,
+    "topic-detail": 2,
+    "topic-list create": 4,
+    "thread-list": 2,
+    "thread-list expanded": 3,
+    "thread-detail": 2,
+    "thread-list create": 6,
+    "message-list": 2,
+    "message-list filtered": 2,
+    "message-detail": 2,
+    "message-list create": 10,
+    "message-list create 100": 15,
+    "message-search": 1,
+    "stats-list": 8,
+    "stats-words": 1,
+    # Accounts API
+    "accounts:create": 2,
+    "accounts:token": 2,
+    "accounts:token revoke": 2,
+    "accounts:me": 1,
+    "accounts:me update": 2,
+}
+
+
+class QueryBudgetTestCases(TestCase):
+    """
+    Every route runs at most its budgeted number of queries, and no more on a
+    board ten times larger: an N+1 anywhere fails here, listing the SQL.
+
+    Caches are cleared before each request, so the budgets are those of a
+    cold cache.
+    """
+
+    def measure(self, board: Board, case: Case) -> List[str]:
+        """
+        Makes the case's request, and returns the SQL it ran.
+        """
+        kwargs = case.request(board, 0)
+        if case.client == "api" and case.method != "GET":
+            kwargs["format"] = "json"
+        for cache in caches.all():
+            cache.clear()
+        authentication.cache.clear()
+
+        call = getattr(getattr(board, case.client), case.method.lower())
+        with CaptureQueriesContext(connection) as queries:
+            response = call(**kwargs)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        detail = b"" if response.streaming else response.content[:500]
+        self.assertEqual(response.status_code, case.status, (case.name, detail))
+        return [query["sql"] for query in queries]
+
+    def test_every_route_budgeted(self):
+        self.assertEqual(set(route_names()) - {case.route for case in CASES}, set())
+        self.assertEqual(len({case.name for case in CASES}), len(CASES))
+        self.assertEqual(set(BUDGETS), {case.name for case in CASES})
+
+    def test_query_budgets(self):
+        runs = []
+        for scale in SCALES:
+            board = seed_board("budget", users=5, **scale)
+            runs.append({case.name: self.measure(board, case) for case in CASES})
+
+        for case in CASES:
+            with self.subTest(case=case.name):
+                budget = BUDGETS[case.name]
+                counts = [len(run[case.name]) for run in runs]
+                sqls = runs[-1][case.name]
+                listing = "\n".join(f"{i}. {sql}" for i, sql in enumerate(sqls, 1))
+                self.assertLessEqual(
+                    max(counts),
+                    budget,
+                    f"{case.name} ran {counts} queries, over its budget of "
+                    f"{budget}:\n{listing}",
+                )
+                self.assertEqual(
+                    counts[0],
+                    counts[-1],
+                    f"{case.name} ran {counts} queries as the board grew "
+                    f"tenfold:\n{listing}",
+                )
@@ -0,0 +1,226 @@
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from django.utils import timezone
+
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+from messageboard.models import Message, Topic
+
+
+class ListMessagesQueryCountTestCases(TestCase):
+    """
+    Rendering a page of Messages costs a constant number of queries, however
+    many Messages the Thread holds.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.other = UserFactory()
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(topic=self.topic, author=self.author)
+        self.url = reverse(
+            "messages",
+            kwargs={"topic_slug": self.topic.slug, "thread_id": self.thread.id},
+        )
+
+    def add_messages(self, count):
+        """
+        Adds `count` Messages to the Thread, alternating between two authors.
+        """
+        now = timezone.now()
+        Message.objects.bulk_create(
+            Message(
+                content=f"Message {i}",
+                thread=self.thread,
+                author=self.author if i % 2 else self.other,
+                created_date=now,
+            )
+            for i in range(count)
+        )
+
+    def count_queries(self):
+        # bulk_create() bypasses the signals that change the Thread's cache
+        # version, and the rendering cost is what's measured here anyway
+        caches["pages"].clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_constant_queries_anonymous(self):
+        self.add_messages(10)
+        small = self.count_queries()
+        self.add_messages(9990)
+        large = self.count_queries()
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 2)
+
+    def test_constant_queries_author(self):
+        """
+        Edit and delete buttons on the author's Messages add no queries.
+        """
+        self.client.force_login(user=self.author)
+        self.add_messages(10)
+        small = self.count_queries()
+        self.add_messages(9990)
+        large = self.count_queries()
+
+        self.assertEqual(small, large)
+        # Session and User lookups, plus the Thread and the page of Messages
+        self.assertLessEqual(large, 4)
+
+    def test_edit_links(self):
+        """
+        Only the logged in author's Messages get edit and delete links.
+        """
+        self.client.force_login(user=self.author)
+        self.add_messages(2)
+        own, other = (
+            Message.objects.get(author=self.author),
+            Message.objects.get(author=self.other),
+        )
+        kwargs = {"topic_slug": self.topic.slug, "thread_id": self.thread.id}
+
+        response = self.client.get(self.url)
+
+        self.assertContains(
+            response, reverse("update_message", kwargs=dict(kwargs, pk=own.id))
+        )
+        self.assertContains(
+            response, reverse("delete_message", kwargs=dict(kwargs, pk=own.id))
+        )
+        self.assertNotContains(
+            response, reverse("update_message", kwargs=dict(kwargs, pk=other.id))
+        )
+
+
+class ExpandQueryCountTestCases(TestCase):
+    """
+    Expanding nested Threads and Messages on the API costs a query per level,
+    however big the board is.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+
+    def add_board(self, topics, threads, messages):
+        """
+        Adds `topics` Topics of `threads` Threads of `messages` Messages each.
+        """
+        for _ in range(topics):
+            topic = TopicFactory()
+            for _ in range(threads):
+                thread = ThreadFactory(topic=topic, author=self.author)
+                for i in range(messages):
+                    thread.create_message(content=f"Message {i}", author=self.author)
+
+    def count_queries(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_constant_queries(self):
+        self.add_board(1, 1, 1)
+        cases = [
+            (reverse("topic-list"), {"expand": "threads.messages"}),
+            (reverse("topic-list"), {"expand": "threads"}),
+            (reverse("thread-list"), {"expand": "messages"}),
+            (
+                reverse("topic-detail", args=[Topic.objects.get().id]),
+                {"expand": "threads.messages"},
+            ),
+        ]
+        small = [self.count_queries(url, params) for url, params in cases]
+        self.add_board(4, 4, 4)
+        large = [self.count_queries(url, params) for url, params in cases]
+
+        self.assertEqual(small, large)
+        # Validators, the page, then one query per expanded level
+        self.assertEqual(large, [4, 3, 3, 4])
+
+
+class MessageEditQueryCountTestCases(TestCase):
+    """
+    'MessageUpdate' and 'MessageDelete' fetch their Message, with its Thread,
+    Topic and author, once per request.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(topic=self.topic, author=self.author)
+        self.message = self.thread.create_message(
+            content="First message", author=self.author
+        )
+        self.client.force_login(user=self.author)
+
+    def url(self, name):
+        return reverse(
+            name,
+            kwargs={
+                "topic_slug": self.topic.slug,
+                "thread_id": self.thread.id,
+                "pk": self.message.id,
+            },
+        )
+
+    def view_queries(self, method, url, data=None):
+        """
+        Returns the response, and the queries the view ran before writing
+        anything, leaving out the session and user lookups of the login.
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = method(url, data or {})
+        sqls = [query["sql"] for query in queries]
+        sqls = [sql for sql in sqls if "django_session" not in sql]
+        sqls.remove(next(sql for sql in sqls if '"auth_user"' in sql))
+        reads = []
+        for sql in sqls:
+            if not sql.startswith("SELECT"):
+                break
+            reads.append(sql)
+        return response, reads
+
+    def test_update_queries(self):
+        response, reads = self.view_queries(self.client.get, self.url("update_message"))
+        self.assertContains(response, self.thread.title)
+        # The Message, and the choices of author
+        self.assertLessEqual(len(reads), 2, reads)
+
+        response, reads = self.view_queries(
+            self.client.post,
+            self.url("update_message"),
+            {"content": "Edited", "author": self.author.id},
+        )
+        self.assertRedirects(response, self.thread.get_url())
+        # The Message, then the form and the model each check the author chosen
+        self.assertEqual(sum("messageboard_" in sql for sql in reads), 1, reads)
+        self.assertLessEqual(len(reads), 3, reads)
+
+    def test_delete_queries(self):
+        response, reads = self.view_queries(self.client.get, self.url("delete_message"))
+        self.assertContains(response, "First message")
+        self.assertLessEqual(len(reads), 2, reads)
+
+        response, reads = self.view_queries(
+            self.client.post, self.url("delete_message")
+        )
+        self.assertRedirects(response, self.thread.get_url())
+        self.assertLessEqual(len(reads), 2, reads)
+        self.assertFalse(Message.objects.filter(pk=self.message.id).exists())
+
+    def test_other_users_forbidden(self):
+        self.client.force_login(user=UserFactory())
+        for name in ("update_message", "delete_message"):
+            self.assertEqual(self.client.get(self.url(name)).status_code, 403)
+        self.client.post(self.url("delete_message"))
+        self.assertTrue(Message.objects.filter(pk=self.message.id).exists())
+
+    def test_missing_message(self):
+        url = self.url("update_message")
+        self.message.delete()
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,152 @@
+from itertools import combinations, product
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+
+from messageboard.factories import (
+    MessageFactory,
+    ThreadFactory,
+    TopicFactory,
+    UserFactory,
+)
+from messageboard.models import Message, Thread
+from messageboard.pagination import encode_cursor, keyset_queryset
+
+DATE_FILTERS = {"created_after", "created_before"}
+
+
+def explain(queryset):
+    """
+    Returns the detail column of SQLite's EXPLAIN QUERY PLAN for a QuerySet, or
+    for SQL with its parameters already inlined.
+    """
+    if isinstance(queryset, str):
+        sql, params = queryset, ()
+    else:
+        sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class QueryPlanTestCases(TestCase):
+    """
+    The hot list queries are answered from an index: no full table scans and
+    no temporary B-tree for the ORDER BY.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(topic=self.topic, author=self.author)
+        MessageFactory(thread=self.thread, author=self.author)
+
+    def assertIndexedPlan(self, queryset, sorts=False):
+        """
+        Args:
+            sorts (bool): Allow a sort of the rows found through the index.
+        """
+        plan = explain(queryset)
+        for step in plan:
+            if not sorts:
+                self.assertNotIn("TEMP B-TREE", step, plan)
+            if step.startswith("SCAN"):
+                self.assertIn("USING", step, plan)
+
+    def test_list_threads_plan(self):
+        """
+        ListThreadsView: a Topic's Threads, newest first.
+        """
+        self.assertIndexedPlan(self.topic.threads)
+
+    def test_list_messages_plan(self):
+        """
+        ListMessagesView: a Thread's Messages, oldest first.
+        """
+        self.assertIndexedPlan(self.thread.messages)
+
+    def test_author_plans(self):
+        """
+        An author's Threads and Messages, by date.
+        """
+        self.assertIndexedPlan(self.author.thread_set.order_by("created_date"))
+        self.assertIndexedPlan(self.author.message_set.order_by("created_date"))
+
+    def test_keyset_page_plans(self):
+        """
+        Deep pages seek straight to the cursor through the index.
+        """
+        cursor = encode_cursor(self.thread.messages.get())
+        for kwargs in ({"after": cursor}, {"before": cursor}):
+            messages = keyset_queryset(
+                self.thread.message_set.all(), since=self.thread.created_date, **kwargs
+            )
+            self.assertIndexedPlan(messages[:51])
+            self.assertIndexedPlan(
+                keyset_queryset(self.topic.thread_set.all(), descending=True, **kwargs)[
+                    :26
+                ]
+            )
+
+    def test_api_list_plans(self):
+        """
+        The API's lists of all Threads and Messages, at any cursor.
+        """
+        cursor = encode_cursor(self.thread)
+        for model in (Thread, Message):
+            for kwargs in ({}, {"after": cursor}, {"before": cursor}):
+                queryset = keyset_queryset(model.objects.all(), **kwargs)
+                self.assertIndexedPlan(queryset[:101])
+
+    def assertIndexedListPlans(self, url, filters, sorted_filters=()):
+        """
+        Every combination of `filters`, in both orders, reads the page of the
+        list at `url` from an index. Combinations of only `sorted_filters` and
+        the date bounds may sort the rows they find.
+        """
+        combos = [
+            names
+            for size in range(len(filters) + 1)
+            for names in combinations(filters, size)
+        ]
+        for names, ordering in product(combos, ["created_date", "-created_date"]):
+            params = dict({name: filters[name] for name in names}, ordering=ordering)
+            with self.subTest(**params):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
+                (page,) = [q["sql"] for q in queries if "ORDER BY" in q["sql"]]
+
+                unsorted = set(names) - set(sorted_filters) - DATE_FILTERS
+                sorts = bool(set(names) & set(sorted_filters)) and not unsorted
+                self.assertIndexedPlan(page, sorts=sorts)
+
+    def test_api_thread_filter_plans(self):
+        self.assertIndexedListPlans(
+            reverse("thread-list"),
+            {
+                "topic": self.topic.id,
+                "author": self.author.id,
+                "created_after": "2020-01-01T00:00:00Z",
+                "created_before": "2030-01-01T00:00:00Z",
+            },
+        )
+
+    def test_api_message_filter_plans(self):
+        """
+        Messages have no Topic column: `topic` alone finds the Topic's Threads
+        and their Messages through indexes, then sorts those Messages.
+        """
+        self.assertIndexedListPlans(
+            reverse("message-list"),
+            {
+                "thread": self.thread.id,
+                "topic": self.topic.id,
+                "author": self.author.id,
+                "created_after": "2020-01-01T00:00:00Z",
+                "created_before": "2030-01-01T00:00:00Z",
+            },
+            sorted_filters=["topic"],
+        )
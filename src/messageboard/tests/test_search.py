@@ -0,0 +1,133 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.urls.base import reverse
+from rest_framework.test import APIClient
+
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+from messageboard.search import TABLE, search_messages
+
+
+class SearchTestCases(TestCase):
+    """
+    Automated tests for full-text search over Messages.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(topic=self.topic, author=self.author)
+        self.other_thread = ThreadFactory(topic=TopicFactory(), author=self.author)
+
+    def search(self, query, **kwargs):
+        return [message.id for message in search_messages(query, **kwargs)]
+
+    def test_index_follows_create_edit_delete(self):
+        """
+        The index tracks 'create_message', 'MessageUpdate' and 'MessageDelete'.
+        """
+        message = self.thread.create_message(
+            content="Purple elephants", author=self.author
+        )
+        self.assertEqual(self.search("elephant"), [message.id])
+
+        self.client.force_login(user=self.author)
+        kwargs = {
+            "topic_slug": self.topic.slug,
+            "thread_id": self.thread.id,
+            "pk": message.id,
+        }
+        self.client.post(
+            reverse("update_message", kwargs=kwargs),
+            {"content": "Orange giraffes", "author": self.author.id},
+        )
+        self.assertEqual(self.search("elephants"), [])
+        self.assertEqual(self.search("giraffes"), [message.id])
+
+        self.client.post(reverse("delete_message", kwargs=kwargs))
+        self.assertEqual(self.search("giraffes"), [])
+
+    def test_ranking_and_filters(self):
+        """
+        Results are ranked by relevance and can be limited to a Thread or Topic.
+        """
+        weak = self.thread.create_message(
+            content="A kettle, and a long story about many other things entirely.",
+            author=self.author,
+        )
+        strong = self.thread.create_message(
+            content="Kettle kettle kettle.", author=self.author
+        )
+        elsewhere = self.other_thread.create_message(
+            content="Kettle.", author=self.author
+        )
+
+        self.assertEqual(self.search("kettle")[-1], weak.id)
+        self.assertEqual(
+            self.search("kettle", thread_id=self.thread.id), [strong.id, weak.id]
+        )
+        self.assertEqual(
+            self.search("kettle", topic_id=self.other_thread.topic_id), [elsewhere.id]
+        )
+        self.assertEqual(len(self.search("kettle", limit=1, offset=1)), 1)
+
+    def test_snippet_highlighting(self):
+        """
+        Snippets wrap matches in <mark> and escape the rest of the content.
+        """
+        self.thread.create_message(content="<b>Bold</b> claims", author=self.author)
+
+        [result] = search_messages("claims")
+
+        self.assertEqual(result.snippet, "&lt;b&gt;Bold&lt;/b&gt; <mark>claims</mark>")
+
+    def test_query_syntax_is_literal(self):
+        """
+        FTS5 operators and punctuation in the query are treated as words.
+        """
+        message = self.thread.create_message(content="near or not", author=self.author)
+
+        self.assertEqual(self.search('"NEAR( OR NOT*'), [message.id])
+        self.assertEqual(self.search("!!!"), [])
+
+    def test_rebuild_command(self):
+        message = self.thread.create_message(content="Rebuilt", author=self.author)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {TABLE}")
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(self.search("rebuilt"), [message.id])
+
+    def test_search_endpoint(self):
+        """
+        The API search action is public and returns ranked results with snippets.
+        """
+        message = self.thread.create_message(
+            content="Searchable words", author=self.author
+        )
+
+        response = APIClient().get(
+            "/api/messages/search/", {"q": "words", "topic": self.topic.id}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["id"] for result in response.data], [message.id])
+        self.assertEqual(response.data[0]["snippet"], "Searchable <mark>words</mark>")
+
+        response = APIClient().get(
+            "/api/messages/search/", {"q": "words", "limit": 500}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_page(self):
+        self.thread.create_message(content="Findable words", author=self.author)
+
+        response = self.client.get(
+            reverse("search"), {"q": "findable", "topic": self.topic.slug}
+        )
+
+        self.assertContains(response, "<mark>Findable</mark> words")
+        self.assertContains(response, self.thread.get_url())
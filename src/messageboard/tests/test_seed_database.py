@@ -0,0 +1,59 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from messageboard.models import Message, Thread, Topic
+from messageboard.search import search_messages
+
+
+class SeedDatabaseTestCases(TestCase):
+    """
+    Automated tests for the 'seed_database' management command.
+    """
+
+    def seed(self, **options):
+        options = dict(
+            {"topics": 2, "threads": 3, "messages": 4, "users": 5, "seed": 1}, **options
+        )
+        call_command("seed_database", stdout=StringIO(), **options)
+
+    def test_sizes(self):
+        self.seed()
+
+        self.assertEqual(get_user_model().objects.count(), 5)
+        self.assertEqual(Topic.objects.count(), 2)
+        self.assertEqual(Thread.objects.count(), 6)
+        self.assertEqual(Message.objects.count(), 24)
+
+    def test_long_topic_slugs(self):
+        self.seed(topics=50)
+
+        slugs = [topic.slug for topic in Topic.objects.all()]
+        self.assertEqual(len(slugs), 50)
+        self.assertTrue(all(slug == Topic.make_slug(slug) for slug in slugs), slugs)
+
+    def test_derived_data(self):
+        """
+        Counters and the search index cover the bulk inserted rows.
+        """
+        self.seed()
+
+        for topic in Topic.objects.all():
+            self.assertEqual(topic.thread_count, 3)
+            self.assertEqual(topic.message_count, 12)
+        message = Message.objects.first()
+        word = message.content.split()[0].strip(".")
+        self.assertIn(message, search_messages(word, thread_id=message.thread_id))
+
+    def test_seed_is_repeatable(self):
+        """
+        The same seed produces the same content, with or without workers.
+        """
+        self.seed()
+        first = list(Message.objects.order_by("id").values_list("content", flat=True))
+        self.seed(workers=2)
+        second = list(Message.objects.order_by("id").values_list("content", flat=True))
+
+        self.assertEqual(first, second)
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+from messageboard.models import Message
+from messageboard.sqlite import configure_connection, retry_on_lock
+
+PRAGMAS = {"cache_size": -1234, "busy_timeout": 4321}
+
+
+class ConfigureConnectionTestCases(TestCase):
+    """
+    Automated tests for the PRAGMAs run on new SQLite connections.
+    """
+
+    def pragma(self, name: str):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_profile_applied(self):
+        with override_settings(MESSAGEBOARD_SQLITE_PRAGMAS=PRAGMAS):
+            configure_connection(sender=None, connection=connection)
+        self.assertEqual(self.pragma("cache_size"), -1234)
+        self.assertEqual(self.pragma("busy_timeout"), 4321)
+
+    def test_other_vendors_untouched(self):
+        other = mock.Mock(vendor="postgresql")
+        configure_connection(sender=None, connection=other)
+        other.cursor.assert_not_called()
+
+
+@override_settings(MESSAGEBOARD_DB_LOCK_RETRIES=2, MESSAGEBOARD_DB_LOCK_RETRY_DELAY=0)
+class RetryOnLockTestCases(TransactionTestCase):
+    """
+    Automated tests for retrying writes while the database is locked.
+    """
+
+    def setUp(self):
+        self.thread = ThreadFactory(topic=TopicFactory(), author=UserFactory())
+
+    def failing(self, *errors):
+        """
+        A write creating a Message, after raising each of `errors` in turn.
+        """
+        calls = []
+
+        @retry_on_lock
+        def write():
+            calls.append(transaction.get_connection().in_atomic_block)
+            message = self.thread.create_message(
+                content="Hi", author=self.thread.author
+            )
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+            return message
+
+        return write, calls
+
+    def test_retried(self):
+        write, calls = self.failing(
+            OperationalError("database is locked"),
+            OperationalError("database is locked"),
+        )
+        message = write()
+        self.assertEqual(calls, [True, True, True])
+        self.assertEqual(list(Message.objects.all()), [message])
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.message_count, 1)
+
+    def test_retries_bounded(self):
+        write, calls = self.failing(*[OperationalError("database is locked")] * 3)
+        with self.assertRaisesMessage(OperationalError, "database is locked"):
+            write()
+        self.assertEqual(len(calls), 3)
+        self.assertFalse(Message.objects.exists())
+
+    def test_other_errors_raised(self):
+        write, calls = self.failing(OperationalError("no such table: nowhere"))
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+
+    def test_enclosing_transaction_not_retried(self):
+        write, calls = self.failing(OperationalError("database is locked"))
+        with self.assertRaises(OperationalError):
+            with transaction.atomic():
+                write()
+        self.assertEqual(len(calls), 1)
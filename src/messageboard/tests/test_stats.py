@@ -0,0 +1,120 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls.base import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from messageboard.factories import (
+    MessageFactory,
+    ThreadFactory,
+    TopicFactory,
+    UserFactory,
+)
+from messageboard.stats import _author_stats, compute_board_stats
+
+
+class StatsTestCases(TestCase):
+    """
+    Automated tests for the `/api/stats/` report.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.alice = UserFactory(username="alice")
+        self.bob = UserFactory(username="bob")
+        self.busy = TopicFactory(title="Busy")
+        self.empty = TopicFactory(title="Empty")
+        # Threads with 1, 2 and 6 Messages
+        for count in (1, 2, 6):
+            thread = ThreadFactory(topic=self.busy, author=self.alice)
+            MessageFactory.create_batch(count, thread=thread, author=self.bob)
+        MessageFactory(thread=thread, author=self.alice)
+
+    def test_report(self):
+        stats = compute_board_stats()
+        self.assertEqual(stats["topic_count"], 2)
+        self.assertEqual(stats["thread_count"], 3)
+        self.assertEqual(stats["message_count"], 10)
+        self.assertEqual(stats["avg_messages_per_thread"], 3.33)
+        self.assertEqual(
+            stats["messages_per_thread"],
+            {"min": 1, "max": 7, "avg": 3.33, "p50": 2, "p90": 7, "p99": 7},
+        )
+        busy, empty = stats["topics"]
+        self.assertEqual(
+            (busy["title"], busy["thread_count"], busy["message_count"]),
+            ("Busy", 3, 10),
+        )
+        self.assertEqual(busy["avg_messages_per_thread"], 3.33)
+        self.assertEqual(empty["avg_messages_per_thread"], 0.0)
+        self.assertEqual(
+            stats["authors"],
+            [
+                {"username": "bob", "thread_count": 0, "message_count": 9},
+                {"username": "alice", "thread_count": 3, "message_count": 1},
+            ],
+        )
+
+    def test_authors_aggregated(self):
+        """
+        Authors and their usernames come from the two GROUP BY queries, not a
+        lookup binding every author's id.
+        """
+        thread = ThreadFactory(topic=self.busy, author=self.alice)
+        for _ in range(20):
+            MessageFactory(thread=thread, author=UserFactory())
+
+        with CaptureQueriesContext(connection) as queries:
+            authors = _author_stats()
+        self.assertEqual(len(queries), 2)
+        self.assertFalse([query for query in queries if " IN (" in query["sql"]])
+        self.assertEqual(len(authors), 22)
+        alice = [author for author in authors if author["username"] == "alice"]
+        self.assertEqual(alice[0]["thread_count"], 4)
+
+    def test_cache_counters(self):
+        """
+        The report includes this process's page and token cache counters.
+        """
+        before = compute_board_stats()["token_cache"]
+        client = APIClient()
+        token = Token.objects.create(user=self.alice)
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        for _ in range(2):
+            self.assertEqual(client.get(reverse("accounts:me")).status_code, 200)
+
+        stats = compute_board_stats()
+        self.assertEqual(stats["token_cache"]["hits"], before["hits"] + 1)
+        self.assertEqual(stats["token_cache"]["misses"], before["misses"] + 1)
+        self.assertIn("hit_rate", stats["token_cache"])
+        self.assertEqual(set(stats["page_cache"]), {"hits", "misses"})
+
+    def test_empty_board(self):
+        # Deleting the authors deletes their Threads and Messages
+        self.alice.delete()
+        self.bob.delete()
+        stats = compute_board_stats()
+        self.assertEqual(stats["message_count"], 0)
+        self.assertEqual(stats["avg_messages_per_thread"], 0.0)
+        self.assertIsNone(stats["messages_per_thread"]["p50"])
+        self.assertEqual(stats["authors"], [])
+
+    def test_endpoint_is_cached(self):
+        """
+        The report is public, sent with a max-age and recomputed at most once
+        per TTL.
+        """
+        client = APIClient()
+        with self.settings(MESSAGEBOARD_STATS_TTL=60):
+            response = client.get(reverse("stats-list"))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data["message_count"], 10)
+            self.assertIn("max-age=60", response["Cache-Control"])
+
+            MessageFactory(thread=self.busy.thread_set.first(), author=self.bob)
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(reverse("stats-list"))
+            self.assertEqual(len(queries), 0)
+            self.assertEqual(response.data["message_count"], 10)
@@ -0,0 +1,84 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+from django.test import LiveServerTestCase
+
+from messageboard.factories import ThreadFactory, TopicFactory, UserFactory
+from messageboard.models import Message
+
+# stats.py is a client script at the root of the repository
+sys.path.insert(
+    0,
+    os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    ),
+)
+
+import stats  # noqa: E402
+
+
+class StatsClientTestCases(LiveServerTestCase):
+    """
+    Automated tests for stats.py's API wrapper, against a live server.
+    """
+
+    def setUp(self):
+        author = UserFactory()
+        thread = ThreadFactory(
+            topic=TopicFactory(),
+            author=author,
+            created_date=datetime(2019, 1, 1, tzinfo=timezone.utc),
+        )
+        start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        # Uneven gaps, and Messages sharing a date, across the date ranges
+        self.contents = []
+        for i in range(30):
+            created = start + timedelta(hours=i * i // 3, microseconds=i % 2)
+            Message.objects.create(
+                content=f"Message {i}.",
+                thread=thread,
+                author=author,
+                created_date=created,
+            )
+            self.contents.append(f"Message {i}.")
+
+    def wrapper(self, concurrency: int) -> stats.MessageBoardAPIWrapper:
+        return stats.MessageBoardAPIWrapper(
+            f"{self.live_server_url}/api/", concurrency=concurrency
+        )
+
+    def test_messages_in_order(self):
+        for concurrency in (1, 3):
+            with self.subTest(concurrency=concurrency):
+                messages = list(self.wrapper(concurrency).iter_messages(page_size=2))
+                self.assertEqual(messages, self.contents)
+
+    def test_windows_cover_list(self):
+        windows = self.wrapper(3)._windows("messages/?page_size=100", 4)
+        self.assertEqual(len(windows), 4)
+        wrapper = self.wrapper(3)
+        counts = [
+            sum(len(page) for page in wrapper._walk(window)) for window in windows
+        ]
+        self.assertEqual(sum(counts), 30)
+        self.assertGreater(min(counts), 0)
+
+    def test_empty_list(self):
+        Message.objects.all().delete()
+        self.assertEqual(list(self.wrapper(3).iter_messages()), [])
+
+    def test_most_common_word(self):
+        self.assertEqual(self.wrapper(1).most_common_word(), "message")
+        Message.objects.all().delete()
+        self.assertIsNone(self.wrapper(1).most_common_word())
+
+    def test_parse_datetime(self):
+        self.assertEqual(
+            stats._parse_datetime("2020-01-01T10:00:00.5Z"),
+            datetime(2020, 1, 1, 10, 0, 0, 500000, tzinfo=timezone.utc),
+        )
+        self.assertEqual(
+            stats._parse_datetime("2020-01-01T12:00:00+02:00"),
+            datetime(2020, 1, 1, 10, tzinfo=timezone.utc),
+        )
@@ -0,0 +1,150 @@
+import os
+import random
+import sys
+from collections import Counter
+from unittest import SkipTest
+
+from django.test import SimpleTestCase
+
+from messageboard import tokens
+from messageboard.management.commands.seed_database import paragraph
+
+# textstats.py is a client module at the root of the repository
+sys.path.insert(
+    0,
+    os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    ),
+)
+
+import textstats  # noqa: E402
+
+
+def summary(stats: textstats.TextStats) -> tuple:
+    return (
+        list(stats.word_counts.items()),
+        stats.words,
+        stats.ended,
+        stats.open,
+        stats.most_common_word(),
+        stats.avg_words_per_sentence(),
+    )
+
+
+class TextStatsTestCases(SimpleTestCase):
+    """
+    Automated tests for the single-pass text statistics stats.py reports.
+    """
+
+    def assertSentences(self, text, ended, open):
+        stats = textstats.analyze(text)
+        self.assertEqual((stats.ended, stats.open), (ended, open), text)
+
+    def test_sentence_ends(self):
+        self.assertSentences("One. Two! Three?", 3, False)
+        self.assertSentences("Wait... what?!", 2, False)
+        self.assertSentences("Trailing words", 0, True)
+        self.assertSentences("Ended.  \n", 1, False)
+        self.assertSentences("Pi is 3.14 or so.", 1, False)
+        self.assertSentences("", 0, False)
+
+    def test_initials_and_abbreviations(self):
+        self.assertSentences("Dr. Smith met J. Doe.", 1, False)
+        self.assertSentences("Cats, dogs, etc. are pets.", 1, False)
+        self.assertSentences("See e.g. this. And i.e. that.", 2, False)
+        self.assertSentences("MR. Jones vs. Mrs. Smith.", 1, False)
+        self.assertSentences("It ended at Dr.", 0, True)
+
+    def test_words(self):
+        stats = textstats.analyze("The cat's hat, the CAT.")
+        self.assertEqual(
+            dict(stats.word_counts), {"the": 2, "cat": 2, "s": 1, "hat": 1}
+        )
+        self.assertEqual(stats.words, 6)
+
+    def test_words_match_board_counts(self):
+        """
+        The words are those the board's word counts split, from
+        messageboard.tokens.
+        """
+        rng = random.Random(0)
+        for text in [paragraph(rng) for _ in range(20)] + ["Ünïcode_2 don't 3.14"]:
+            self.assertEqual(
+                dict(textstats.analyze(text).word_counts),
+                dict(Counter(tokens.words(text))),
+                text,
+            )
+
+    def test_open_sentence_carries_over(self):
+        """
+        A message that doesn't end its sentence runs on into the next one.
+        """
+        stats = textstats.analyze("Hello there") + textstats.analyze("friend. Bye")
+        self.assertEqual((stats.ended, stats.open, stats.sentences), (1, True, 2))
+        self.assertEqual(stats.avg_words_per_sentence(), 2.0)
+
+        # Nothing to end or continue the sentence leaves it open
+        stats = stats + textstats.analyze("  ")
+        self.assertEqual((stats.ended, stats.open), (1, True))
+
+        stats = stats + textstats.analyze("now.")
+        self.assertEqual((stats.ended, stats.open, stats.sentences), (2, False, 2))
+
+    def test_merge_associative(self):
+        parts = [textstats.analyze(text) for text in ("A b", "c. D", "e", "f.", "")]
+        left = ((parts[0] + parts[1]) + parts[2]) + (parts[3] + parts[4])
+        right = parts[0] + (parts[1] + (parts[2] + (parts[3] + parts[4])))
+        self.assertEqual(summary(left), summary(right))
+        self.assertEqual(summary(left), summary(textstats.analyze("A b c. D e f.")))
+
+    def test_most_common_word_ties(self):
+        stats = textstats.analyze_all(["b a", "a b", "c"])
+        self.assertEqual(stats.most_common_word(), "b")
+        self.assertIsNone(textstats.TextStats().most_common_word())
+        self.assertEqual(textstats.TextStats().avg_words_per_sentence(), 0.0)
+
+    def test_analyze_all_adds_up_messages(self):
+        rng = random.Random(0)
+        messages = [paragraph(rng) for _ in range(200)] + ["Run on", "and on"]
+        total = textstats.TextStats()
+        for message in messages:
+            total.update(textstats.analyze(message))
+        self.assertEqual(summary(textstats.analyze_all(messages)), summary(total))
+
+    def test_parallel_matches_serial(self):
+        rng = random.Random(0)
+        messages = [paragraph(rng) for _ in range(1000)]
+        # Chunks ending mid-sentence, and ties between words
+        messages[99] = "no end here"
+        messages += ["tie breaker", "breaker tie"]
+        serial = textstats.analyze_all(messages)
+        for workers, chunk_size in ((2, 100), (3, 7)):
+            with self.subTest(workers=workers, chunk_size=chunk_size):
+                parallel = textstats.analyze_parallel(
+                    messages, workers=workers, chunk_size=chunk_size
+                )
+                self.assertEqual(summary(parallel), summary(serial))
+
+    def test_matches_textblob(self):
+        """
+        On seeded messages, the same results as the TextBlob analysis stats.py
+        used to run, where its English tokenizer data is installed.
+        """
+        try:
+            from textblob import TextBlob
+            from textblob.exceptions import MissingCorpusError
+        except ImportError:
+            raise SkipTest("TextBlob is not installed")
+
+        rng = random.Random(0)
+        messages = [paragraph(rng) for _ in range(500)]
+        try:
+            blob = TextBlob(" ".join(messages))
+            words, sentences = len(blob.words), len(blob.sentences)
+            word = sorted(blob.word_counts.items(), key=lambda x: x[1], reverse=True)
+        except MissingCorpusError:
+            raise SkipTest("The NLTK tokenizer data is not installed")
+
+        stats = textstats.analyze_all(messages)
+        self.assertEqual(stats.most_common_word(), word[0][0])
+        self.assertEqual(stats.avg_words_per_sentence(), round(words / sentences, 2))
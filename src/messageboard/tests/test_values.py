@@ -0,0 +1,146 @@
+import json
+import unittest
+from collections import OrderedDict
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls.base import reverse
+from rest_framework.renderers import JSONRenderer
+
+from messageboard import renderers
+from messageboard.factories import (
+    MessageFactory,
+    ThreadFactory,
+    TopicFactory,
+    UserFactory,
+)
+from messageboard.models import Message, Thread, Topic
+from messageboard.renderers import FastJSONRenderer
+from messageboard.serializers import (
+    MessageSerializer,
+    ThreadSerializer,
+    TopicSerializer,
+)
+
+# Strings JSON encoders tend to disagree on
+AWKWARD_TEXT = 'Quotes " and \\ slashes, tabs\t, \x00\x1f\x7f, “ünïcode” 🎉 \u2028\u2029'
+
+
+class ValuesSerializerTestCases(TestCase):
+    """
+    The lists and detail views built from `values_list()` rows send exactly
+    the bytes the ModelSerializers and DRF's JSONRenderer would.
+    """
+
+    def setUp(self):
+        author = UserFactory()
+        self.topic = TopicFactory(title="Topic " + AWKWARD_TEXT[:40])
+        self.thread = ThreadFactory(
+            topic=self.topic,
+            author=author,
+            title=AWKWARD_TEXT[:60],
+            created_date=datetime(2020, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        )
+        for content in (AWKWARD_TEXT, "Plain", ""):
+            self.thread.create_message(content=content, author=author)
+        # No Thread, no microseconds
+        MessageFactory(
+            thread=None,
+            author=author,
+            created_date=datetime(2021, 1, 1, tzinfo=timezone.utc),
+        )
+        ThreadFactory(topic=None, author=author)
+
+    def expected(self, serializer, paginated=True):
+        data = serializer.data
+        if paginated:
+            data = OrderedDict([("next", None), ("previous", None), ("results", data)])
+        return JSONRenderer().render(data)
+
+    def test_lists(self):
+        cases = [
+            ("topic-list", TopicSerializer, Topic.objects.order_by("id")),
+            (
+                "thread-list",
+                ThreadSerializer,
+                Thread.objects.order_by("created_date", "id"),
+            ),
+            (
+                "message-list",
+                MessageSerializer,
+                Message.objects.order_by("created_date", "id"),
+            ),
+        ]
+        for name, serializer_class, queryset in cases:
+            with self.subTest(name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(
+                    response.content,
+                    self.expected(serializer_class(queryset, many=True)),
+                )
+
+    def test_details(self):
+        for name, serializer_class, model in (
+            ("topic-detail", TopicSerializer, Topic),
+            ("thread-detail", ThreadSerializer, Thread),
+            ("message-detail", MessageSerializer, Message),
+        ):
+            for instance in model.objects.all():
+                with self.subTest(name, pk=instance.pk):
+                    response = self.client.get(reverse(name, args=[instance.pk]))
+                    expected = self.expected(serializer_class(instance), False)
+                    self.assertEqual(response.content, expected)
+        response = self.client.get(reverse("message-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_field_selection_uses_serializer(self):
+        response = self.client.get(reverse("message-list"), {"fields": "id"})
+        self.assertEqual(set(response.json()["results"][0]), {"id"})
+
+
+@unittest.skipIf(renderers.orjson is None, "orjson is not installed")
+class FastJSONRendererTestCases(TestCase):
+    """
+    FastJSONRenderer renders the same bytes as DRF's JSONRenderer.
+    """
+
+    def test_same_bytes(self):
+        data = {
+            "text": AWKWARD_TEXT,
+            "nested": [{"a": None, "b": True, 3: [1, -2, 10**18]}],
+            "when": datetime(2020, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+            "amount": Decimal("1.50"),
+            "empty": OrderedDict(),
+        }
+        fast = FastJSONRenderer().render(data)
+        self.assertEqual(fast, JSONRenderer().render(data))
+        self.assertEqual(json.loads(fast)["text"], AWKWARD_TEXT)
+
+    def test_floats(self):
+        for value in (1e16, 1e-6, 0.1, -2.5e-300, 123456789.125):
+            data = {"nested": [{"rank": value}], "when": (1, value)}
+            with self.subTest(value=value):
+                self.assertEqual(
+                    FastJSONRenderer().render(data), JSONRenderer().render(data)
+                )
+
+    def test_search_response(self):
+        """
+        Search results carry a float rank, rendered as JSONRenderer does.
+        """
+        author = UserFactory()
+        thread = ThreadFactory(topic=TopicFactory(), author=author)
+        for i in range(3):
+            thread.create_message(content="rank " * (i + 1), author=author)
+
+        response = self.client.get("/api/messages/search/", {"q": "rank"})
+        self.assertIsInstance(response.data[0]["rank"], float)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_indent_falls_back(self):
+        data = {"a": [1, 2]}
+        self.assertEqual(
+            FastJSONRenderer().render(data, "application/json; indent=2"),
+            JSONRenderer().render(data, "application/json; indent=2"),
+        )
@@ -0,0 +1,212 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls.base import reverse
+from rest_framework.test import APIClient
+
+from messageboard.factories import (
+    MessageFactory,
+    ThreadFactory,
+    TopicFactory,
+    UserFactory,
+)
+from messageboard.models import Message, WordCount
+from messageboard.tests.test_query_plans import explain
+from messageboard.wordcounts import BOARD, thread_scope, top_words, topic_scope
+
+
+class WordCountTestCases(TestCase):
+    """
+    Automated tests for the incrementally maintained word counts.
+    """
+
+    def setUp(self):
+        self.author = UserFactory()
+        self.topic = TopicFactory()
+        self.thread = ThreadFactory(topic=self.topic, author=self.author)
+
+    def counts(self, scope=BOARD):
+        return {row["word"]: row["count"] for row in top_words(scope, 1000)}
+
+    def assertCounts(self, expected, scopes=None):
+        scopes = scopes or [
+            BOARD,
+            topic_scope(self.topic.id),
+            thread_scope(self.thread.id),
+        ]
+        for scope in scopes:
+            self.assertEqual(self.counts(scope), expected, scope)
+
+    def snapshot(self):
+        return sorted(WordCount.objects.values_list("scope", "word", "count"))
+
+    def test_create_edit_delete(self):
+        """
+        'create_message', 'MessageUpdate' and 'MessageDelete' keep the board,
+        Topic and Thread counts in step.
+        """
+        message = self.thread.create_message(
+            content="The cat sat on the mat.", author=self.author
+        )
+        self.thread.create_message(content="A cat's life", author=self.author)
+        self.assertCounts(
+            {
+                "the": 2,
+                "cat": 2,
+                "sat": 1,
+                "on": 1,
+                "mat": 1,
+                "a": 1,
+                "s": 1,
+                "life": 1,
+            }
+        )
+
+        self.client.force_login(user=self.author)
+        kwargs = {
+            "topic_slug": self.topic.slug,
+            "thread_id": self.thread.id,
+            "pk": message.id,
+        }
+        self.client.post(
+            reverse("update_message", kwargs=kwargs),
+            {"content": "The dog sat", "author": self.author.id},
+        )
+        self.assertCounts(
+            {"the": 1, "dog": 1, "sat": 1, "a": 1, "cat": 1, "s": 1, "life": 1}
+        )
+
+        self.client.post(reverse("delete_message", kwargs=kwargs))
+        self.assertCounts({"a": 1, "cat": 1, "s": 1, "life": 1})
+
+    def test_edit_without_loaded_content(self):
+        """
+        Saving a Message loaded without its content still counts the change.
+        """
+        message = self.thread.create_message(content="old words", author=self.author)
+        message = Message.objects.only("thread").get(pk=message.pk)
+        message.content = "new words"
+        message.save()
+        self.assertCounts({"new": 1, "words": 1})
+
+    def test_moves_and_deletes(self):
+        """
+        Moving a Message or Thread moves its words; deleting a Thread or Topic
+        drops their counts.
+        """
+        MessageFactory(content="alpha", thread=self.thread, author=self.author)
+        message = MessageFactory(content="beta", thread=self.thread, author=self.author)
+        other_topic = TopicFactory()
+        other_thread = ThreadFactory(topic=other_topic, author=self.author)
+
+        message.thread = other_thread
+        message.save()
+        self.assertEqual(self.counts(topic_scope(self.topic.id)), {"alpha": 1})
+        self.assertEqual(self.counts(thread_scope(other_thread.id)), {"beta": 1})
+
+        self.thread.topic = other_topic
+        self.thread.save()
+        self.assertEqual(self.counts(topic_scope(self.topic.id)), {})
+        self.assertEqual(
+            self.counts(topic_scope(other_topic.id)), {"alpha": 1, "beta": 1}
+        )
+
+        self.thread.delete()
+        self.assertEqual(self.counts(thread_scope(self.thread.id)), {})
+        self.assertEqual(self.counts(topic_scope(other_topic.id)), {"beta": 1})
+        self.assertEqual(self.counts(), {"alpha": 1, "beta": 1})
+
+        other_topic.delete()
+        self.assertEqual(self.counts(topic_scope(other_topic.id)), {})
+
+    def test_thread_moves_without_reading_messages(self):
+        """
+        A Thread's words move between Topics as its stored counts, added to or
+        subtracted from words the Topics share, without tokenizing its
+        Messages again.
+        """
+        self.thread.create_message(content="shared shared own", author=self.author)
+        other_topic = TopicFactory()
+        ThreadFactory(topic=other_topic, author=self.author).create_message(
+            content="shared other", author=self.author
+        )
+
+        self.thread.topic = other_topic
+        with CaptureQueriesContext(connection) as queries:
+            self.thread.save()
+        # The counters are recounted with aggregates, but no content is read
+        self.assertFalse([query for query in queries if '"content"' in query["sql"]])
+        self.assertEqual(
+            self.counts(topic_scope(other_topic.id)),
+            {"shared": 3, "own": 1, "other": 1},
+        )
+
+        self.thread.delete()
+        self.assertEqual(
+            self.counts(topic_scope(other_topic.id)), {"shared": 1, "other": 1}
+        )
+
+    def test_author_deletion_matches_rebuild(self):
+        other = UserFactory()
+        self.thread.create_message(content="mine", author=self.author)
+        self.thread.create_message(content="theirs", author=other)
+        kept = ThreadFactory(topic=self.topic, author=other)
+        kept.create_message(content="mine again", author=self.author)
+        kept.create_message(content="theirs again", author=other)
+
+        self.author.delete()
+        incremental = self.snapshot()
+        call_command("rebuild_word_counts", stdout=StringIO())
+        self.assertEqual(self.snapshot(), incremental)
+
+    def test_rebuild_matches_incremental(self):
+        for thread in (self.thread, ThreadFactory(topic=TopicFactory())):
+            MessageFactory.create_batch(5, thread=thread, author=self.author)
+        MessageFactory(author=self.author)
+        incremental = self.snapshot()
+
+        output = StringIO()
+        call_command("rebuild_word_counts", stdout=output)
+        self.assertEqual(self.snapshot(), incremental)
+        self.assertIn(f"Word counts written: {len(incremental)}", output.getvalue())
+
+    def test_top_words_endpoint(self):
+        self.thread.create_message(content="b b a c c c", author=self.author)
+        ThreadFactory(topic=TopicFactory()).create_message(
+            content="a a a a", author=self.author
+        )
+
+        client = APIClient()
+        url = reverse("stats-words")
+        response = client.get(url, {"top": 2})
+        self.assertEqual(
+            response.data, [{"word": "a", "count": 5}, {"word": "c", "count": 3}]
+        )
+        response = client.get(url, {"top": 1, "topic": self.topic.id})
+        self.assertEqual(response.data, [{"word": "c", "count": 3}])
+        response = client.get(url, {"thread": self.thread.id})
+        self.assertEqual([row["word"] for row in response.data], ["c", "b", "a"])
+
+        response = client.get(url, {"thread": 1, "topic": 1})
+        self.assertEqual(response.status_code, 400)
+
+    def test_top_words_plan(self):
+        """
+        A scope's top words are read in order off the index.
+        """
+        queryset = (
+            WordCount.objects.filter(scope=BOARD)
+            .order_by("-count", "word")
+            .values("word", "count")[:10]
+        )
+        plan = explain(queryset)
+        self.assertTrue(
+            any(
+                "USING COVERING INDEX wordcount_scope_top_idx" in step for step in plan
+            ),
+            plan,
+        )
+        self.assertFalse(any("TEMP B-TREE" in step for step in plan), plan)
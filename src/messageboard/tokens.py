@@ -0,0 +1,19 @@
+"""
+Word tokenization for the word counts the board keeps (wordcounts), agreeing
+with TextBlob on ordinary prose: runs of letters and digits, in lowercase.
+"Don't" is the two words "don" and "t".
+
+textstats.py, the standalone client script, splits words with the same pattern.
+"""
+
+import re
+from typing import List
+
+WORD_RE = re.compile(r"\w+")
+
+
+def words(text: str) -> List[str]:
+    """
+    Splits text into lowercase words.
+    """
+    return WORD_RE.findall(text.lower())
@@ -6,19 +6,27 @@ from rest_framework import routers
 from messageboard.views import (
     AddMessageView,
     AddThreadView,
+    ExportBoardView,
     ListMessagesView,
     ListThreadsView,
     ListTopicsView,
     MessageUpdate,
     MessageDelete,
+    SearchMessagesView,
+)
+from messageboard.viewsets import (
+    MessageViewSet,
+    StatsViewSet,
+    ThreadViewSet,
+    TopicViewSet,
 )
-from messageboard.viewsets import MessageViewSet, ThreadViewSet, TopicViewSet
 
 
 router = routers.DefaultRouter()
 router.register(r"topics", TopicViewSet)
 router.register(r"threads", ThreadViewSet)
 router.register(r"messages", MessageViewSet)
+router.register(r"stats", StatsViewSet, basename="stats")
 
 urlpatterns = [
     url(r"^$", ListTopicsView.as_view(), name="topics"),
@@ -48,5 +56,7 @@ urlpatterns = [
         MessageDelete.as_view(),
         name="delete_message",
     ),
+    path("search/", SearchMessagesView.as_view(), name="search"),
+    path("api/export/", ExportBoardView.as_view(), name="export"),
     path("api/", include(router.urls)),
 ]
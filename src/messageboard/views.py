@@ -1,19 +1,53 @@
+from functools import partial
 from typing import Any, Dict, Optional
 
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, render
+from django.template.loader import render_to_string
 from django.urls.base import reverse
 from django.views import View
 from django.views.generic.edit import DeleteView, UpdateView
 
-from messageboard.forms import AddMessageForm, AddThreadForm
+from messageboard import conditional, pagecache
+from messageboard.export import iter_board_json
+from messageboard.forms import AddMessageForm, AddThreadForm, SearchForm
 from messageboard.models import Message, Thread, Topic
+from messageboard.search import search_messages
 
 
-class ListTopicsView(View):
+class ConditionalGetMixin:
     """
-    Displays all Topics in the message board.
+    Answers GET requests with 304 Not Modified while the client's copy of the
+    page matches the validators from `get_validators`, without rendering it.
+    """
+
+    def get_validators(self, request, **kwargs) -> Optional[conditional.Validators]:
+        """
+        Args:
+            request (django.core.handlers.wsgi.WSGIRequest): Incoming HTTP GET request.
+            kwargs: The view's URL keyword arguments.
+
+        Returns:
+            Optional[messageboard.conditional.Validators]: Validators of the page,
+                or None to always render it.
+        """
+        return None
+
+    def dispatch(self, request, *args, **kwargs):
+        validators = None
+        if request.method in ("GET", "HEAD"):
+            validators = self.get_validators(request, **kwargs)
+        return conditional.respond(
+            request, validators, partial(super().dispatch, request, *args, **kwargs)
+        )
+
+
+class ListTopicsView(ConditionalGetMixin, View):
+    """
+    Displays all Topics in the message board. The list is served from the page
+    cache until a Topic changes, and not sent at all to clients that already
+    have it.
 
     Django Class-based views docs:
     https://docs.djangoproject.com/en/2.2/topics/class-based-views/
@@ -27,18 +61,36 @@ class ListTopicsView(View):
         Returns:
             django.http.response.HttpResponse: Rendered List of Topics.
         """
+        topic_list = pagecache.cached(
+            pagecache.topic_list_key(), self.render_topic_list
+        )
+        return render(request, "messageboard/topics.html", {"topic_list": topic_list})
+
+    def get_validators(self, request, **kwargs) -> conditional.Validators:
+        return conditional.topic_list(request.user.pk or 0)
+
+    @staticmethod
+    def render_topic_list() -> str:
+        """
+        Returns:
+            str: Rendered rows of the Topic list.
+        """
         topics = Topic.objects.all()
-        return render(request, "messageboard/topics.html", {"topics": topics})
+        return render_to_string("messageboard/topic_list.html", {"topics": topics})
 
 
-class ListThreadsView(View):
+class ListThreadsView(ConditionalGetMixin, View):
     """
-    Displays all Threads for a given Topic.
+    Displays all Threads for a given Topic. Each page of Threads is served from
+    the page cache until the Topic changes, and not sent at all to clients that
+    already have it.
 
     Django Class-based views docs:
     https://docs.djangoproject.com/en/2.2/topics/class-based-views/
     """
 
+    _topic = None
+
     def get(self, request, topic_slug):
         """
         Args:
@@ -48,10 +100,52 @@ class ListThreadsView(View):
         Returns:
             django.http.response.HttpResponse: Rendered list of Threads.
         """
-        topic = get_object_or_404(Topic, slug=topic_slug)
-        threads = topic.threads
+        topic = self.get_topic(topic_slug)
+        after, before = request.GET.get("after"), request.GET.get("before")
+        try:
+            thread_list = pagecache.cached(
+                pagecache.thread_list_key(topic, after, before),
+                lambda: self.render_thread_list(topic, after, before),
+            )
+        except ValueError:
+            raise Http404("Invalid page cursor")
         return render(
-            request, "messageboard/threads.html", {"topic": topic, "threads": threads}
+            request,
+            "messageboard/threads.html",
+            {"topic": topic, "thread_list": thread_list},
+        )
+
+    def get_validators(self, request, topic_slug) -> conditional.Validators:
+        return conditional.topic(self.get_topic(topic_slug), request.user.pk or 0)
+
+    def get_topic(self, topic_slug: str) -> Topic:
+        """
+        Returns the Topic with the given slug, loaded once per request, or a 404.
+        """
+        if self._topic is None:
+            self._topic = get_object_or_404(Topic, slug=topic_slug)
+        return self._topic
+
+    @staticmethod
+    def render_thread_list(topic: Topic, after: str, before: str) -> str:
+        """
+        Args:
+            topic (messageboard.models.Topic): Topic to list the Threads of.
+            after (str): Cursor of the Thread before the page, if any.
+            before (str): Cursor of the Thread after the page, if any.
+
+        Raises:
+            ValueError: A cursor is malformed.
+
+        Returns:
+            str: Rendered page of Threads, with its pagination links.
+        """
+        # The page shows each Thread's author
+        threads = topic.thread_set.select_related("author")
+        page = topic.paginate_threads(after=after, before=before, queryset=threads)
+        return render_to_string(
+            "messageboard/thread_list.html",
+            {"threads": page.object_list, "page": page},
         )
 
 
@@ -129,14 +223,20 @@ class AddThreadView(LoginRequiredMixin, View):
         return render(request, self.template_name, {"form": form, "topic": topic})
 
 
-class ListMessagesView(View):
+class ListMessagesView(ConditionalGetMixin, View):
     """
-    Displays all Messages for a given Thread.
+    Displays all Messages for a given Thread. For anonymous visitors each page
+    of Messages is served from the page cache until the Thread changes; users
+    who are logged in get their own edit and delete buttons, so their pages
+    aren't cached. Either way, clients that already have the page don't get it
+    again.
 
     Django Class-based views docs:
     https://docs.djangoproject.com/en/2.2/topics/class-based-views/
     """
 
+    _thread = None
+
     def get(self, request, topic_slug, thread_id):
         """
         Args:
@@ -147,14 +247,88 @@ class ListMessagesView(View):
         Returns:
             django.http.response.HttpResponse: Rendered List of Messages.
         """
-        thread = get_object_or_404(Thread, pk=thread_id)
-        messages = thread.messages
+        thread = self.get_thread(thread_id)
+        after, before = request.GET.get("after"), request.GET.get("before")
+        try:
+            if request.user.is_authenticated:
+                message_list = self.render_message_list(request, thread, after, before)
+            else:
+                message_list = pagecache.cached(
+                    pagecache.message_list_key(thread, after, before),
+                    lambda: self.render_message_list(request, thread, after, before),
+                )
+        except ValueError:
+            raise Http404("Invalid page cursor")
+
         return render(
             request,
             "messageboard/messages.html",
-            {"thread": thread, "messages": messages},
+            {"thread": thread, "message_list": message_list},
+        )
+
+    def get_validators(self, request, topic_slug, thread_id) -> conditional.Validators:
+        return conditional.thread(self.get_thread(thread_id), request.user.pk or 0)
+
+    def get_thread(self, thread_id: str) -> Thread:
+        """
+        Returns the Thread with the given ID, loaded once per request with its
+        Topic and author, or a 404.
+        """
+        if self._thread is None:
+            self._thread = get_object_or_404(
+                Thread.objects.select_related("topic", "author"), pk=thread_id
+            )
+        return self._thread
+
+    def render_message_list(self, request, thread, after, before) -> str:
+        """
+        Args:
+            request (django.core.handlers.wsgi.WSGIRequest): Incoming HTTP request.
+            thread (messageboard.models.Thread): Thread to list the Messages of.
+            after (str): Cursor of the Message before the page, if any.
+            before (str): Cursor of the Message after the page, if any.
+
+        Raises:
+            ValueError: A cursor is malformed.
+
+        Returns:
+            str: Rendered page of Messages, with its pagination links.
+        """
+        messages = thread.message_set.select_related("author").only(
+            "content", "created_date", "thread_id", "author__username"
+        )
+        page = thread.paginate_messages(after=after, before=before, queryset=messages)
+        self.set_message_urls(request, thread, page.object_list)
+        return render_to_string(
+            "messageboard/message_list.html",
+            {"messages": page.object_list, "page": page},
         )
 
+    @staticmethod
+    def set_message_urls(request, thread, messages):
+        """
+        Sets `update_url` and `delete_url` on the Messages the user may edit.
+        Each URL is reversed once per page and filled in per Message, rather
+        than reversed per row.
+
+        Args:
+            request (django.core.handlers.wsgi.WSGIRequest): Incoming HTTP request.
+            thread (messageboard.models.Thread): Thread the Messages belong to.
+            messages (List[messageboard.models.Message]): Messages on the page.
+        """
+        if not request.user.is_authenticated:
+            return
+
+        kwargs = {"topic_slug": thread.topic.slug, "thread_id": thread.id, "pk": 0}
+        # Split each URL around its (last) "/0/" segment, the placeholder pk
+        update_url = reverse("update_message", kwargs=kwargs).rpartition("/0/")
+        delete_url = reverse("delete_message", kwargs=kwargs).rpartition("/0/")
+        for message in messages:
+            if message.author_id == request.user.id:
+                pk = f"/{message.id}/"
+                message.update_url = update_url[0] + pk + update_url[2]
+                message.delete_url = delete_url[0] + pk + delete_url[2]
+
 
 class AddMessageView(LoginRequiredMixin, View):
     """
@@ -228,47 +402,136 @@ class AddMessageView(LoginRequiredMixin, View):
         return render(request, self.template_name, {"form": form, "thread": thread})
 
 
-class MessageUpdate(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
-    model = Message
-    fields = ["content", "author"]
+class SearchMessagesView(View):
+    """
+    Full-text search over Message content, optionally within a Topic or Thread.
 
-    def get_success_url(self) -> str:
-        obj = Message.objects.get(pk=self.kwargs["pk"])
-        return reverse(
-            "messages",
-            kwargs={"topic_slug": obj.topic.slug, "thread_id": obj.thread_id},
+    Django Class-based views docs:
+    https://docs.djangoproject.com/en/2.2/topics/class-based-views/
+    """
+
+    form_class = SearchForm
+    template_name = "messageboard/search.html"
+    results_per_page = 20
+
+    def get(self, request):
+        """
+        Args:
+            request (django.core.handlers.wsgi.WSGIRequest): Incoming HTTP GET request.
+
+        Returns:
+            django.http.response.HttpResponse: Search form and ranked results.
+        """
+        form = self.form_class(request.GET or None)
+        context = {
+            "form": form,
+            "messages": [],
+            "next_query": None,
+            "previous_query": None,
+        }
+        if not form.is_valid():
+            return render(request, self.template_name, context)
+
+        topic = form.cleaned_data["topic"]
+        offset = form.cleaned_data["offset"] or 0
+        # Fetch one extra result to tell whether there is a next page
+        messages = search_messages(
+            form.cleaned_data["q"],
+            thread_id=form.cleaned_data["thread"],
+            topic_id=topic.id if topic else None,
+            limit=self.results_per_page + 1,
+            offset=offset,
         )
+        context["messages"] = messages[: self.results_per_page]
+        if len(messages) > self.results_per_page:
+            context["next_query"] = self.page_query(
+                request, offset + self.results_per_page
+            )
+        if offset:
+            context["previous_query"] = self.page_query(
+                request, max(offset - self.results_per_page, 0)
+            )
+        return render(request, self.template_name, context)
+
+    @staticmethod
+    def page_query(request, offset):
+        """
+        Returns the current query string with `offset` replaced.
+        """
+        query = request.GET.copy()
+        query["offset"] = offset
+        return query.urlencode()
 
-    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
-        context = super().get_context_data(**kwargs)
-        message = context["object"]
-        context["thread"] = message.thread
-        return context
 
-    def test_func(self) -> Optional[bool]:
-        obj = Message.objects.get(pk=self.kwargs["pk"])
-        # print(f"sup?:{self.request.user.username}, {obj.author}")
-        # print('blah')
-        return self.request.user == obj.author
+class ExportBoardView(View):
+    """
+    Streams the whole message board as nested Topic > Thread > Message JSON,
+    in the same shape as the results of `/api/topics/?expand=threads.messages`.
+
+    Django Class-based views docs:
+    https://docs.djangoproject.com/en/2.2/topics/class-based-views/
+    """
+
+    chunk_size = 2000
+
+    def get(self, request):
+        """
+        Args:
+            request (django.core.handlers.wsgi.WSGIRequest): Incoming HTTP GET request.
+
+        Returns:
+            django.http.StreamingHttpResponse: The board as a JSON list of Topics.
+        """
+        return StreamingHttpResponse(
+            iter_board_json(chunk_size=self.chunk_size),
+            content_type="application/json",
+        )
 
 
-class MessageDelete(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class MessageObjectMixin:
+    """
+    Fetches the Message once per request, along with its Thread, Topic and
+    author, for the permission check, the page and the redirect back to the
+    Thread.
+    """
+
     model = Message
+    _message = None
+
+    def get_queryset(self):
+        return Message.objects.select_related("thread__topic", "author")
+
+    def get_object(self, queryset=None) -> Message:
+        if self._message is None:
+            self._message = super().get_object(queryset)
+        return self._message
 
     def get_success_url(self) -> str:
-        obj = Message.objects.get(pk=self.kwargs["pk"])
+        message = self.get_object()
         return reverse(
             "messages",
-            kwargs={"topic_slug": obj.topic.slug, "thread_id": obj.thread_id},
+            kwargs={
+                "topic_slug": message.topic.slug,
+                "thread_id": message.thread_id,
+            },
         )
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        message = context["object"]
-        context["thread"] = message.thread
-        print(context)
+        context["thread"] = self.get_object().thread
         return context
 
     def test_func(self) -> Optional[bool]:
-        obj = Message.objects.get(pk=self.kwargs["pk"])
-        return self.request.user == obj.author
+        return self.request.user == self.get_object().author
+
+
+class MessageUpdate(
+    MessageObjectMixin, LoginRequiredMixin, UserPassesTestMixin, UpdateView
+):
+    fields = ["content", "author"]
+
+
+class MessageDelete(
+    MessageObjectMixin, LoginRequiredMixin, UserPassesTestMixin, DeleteView
+):
+    pass
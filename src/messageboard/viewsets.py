@@ -1,25 +1,276 @@
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
+from functools import partial
+from typing import Dict, Optional, Set, Tuple
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.http import Http404
+from rest_flex_fields import EXPAND_PARAM, FIELDS_PARAM, OMIT_PARAM
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers import BrowsableAPIRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
 
+from messageboard import conditional, wordcounts
+from messageboard.authentication import CachedTokenAuthentication
 from messageboard.models import Topic, Thread, Message
+from messageboard.pagination import IdCursorPagination, KeysetCursorPagination
+from messageboard.renderers import FastJSONRenderer
+from messageboard.search import search_messages
 from messageboard.serializers import (
     TopicSerializer,
     ThreadSerializer,
     MessageSerializer,
+    MessageFilterSerializer,
+    MessageSearchQuerySerializer,
+    MessageSearchSerializer,
+    ThreadFilterSerializer,
+    ValuesSerializer,
+    WordCountQuerySerializer,
+    preload_related,
 )
+from messageboard.sqlite import retry_on_lock
+from messageboard.stats import board_stats
+
+# ValuesSerializer of each ModelSerializer class, built on first use
+_values_serializers = {}
+
+
+def unique_fields(serializer) -> Dict[str, Tuple[str, str]]:
+    """
+    The fields of a serializer checked for uniqueness against the table.
+
+    Returns:
+        Dict[str, Tuple[str, str]]: Source and error message of each field, by
+            name.
+    """
+    return {
+        name: (field.source, validator.message)
+        for name, field in serializer.fields.items()
+        for validator in field.validators
+        if isinstance(validator, UniqueValidator)
+    }
 
 
 class BaseAuthViewSet(viewsets.ModelViewSet):
-    authentication_classes = (TokenAuthentication,)
+    """
+    Answers `list` and `retrieve` with 304 Not Modified while the client's
+    copy matches the validators from `get_list_validators` or
+    `get_object_validators`, without loading or serializing any rows.
+
+    Lists are paginated with cursors on `(created_date, id)`, and filtered by
+    the query parameters `filter_serializer_class` validates.
+
+    Unless fields are expanded or picked with `expand`, `fields` or `omit`,
+    `list` and `retrieve` build their rows from `values_list()` with a
+    ValuesSerializer rather than through model instances and the
+    ModelSerializer; the JSON is the same.
+
+    Where `batch_create` is set, `create` also takes a JSON list of items and
+    inserts the valid ones together; see `create_batch`.
+
+    Writes are retried while another connection holds the database lock.
+    """
+
+    authentication_classes = (CachedTokenAuthentication,)
+    renderer_classes = (FastJSONRenderer, BrowsableAPIRenderer)
+    pagination_class = KeysetCursorPagination
+    filter_serializer_class = None
+    # Whether `create` accepts a list of items, for models whose manager has
+    # `create_batch`
+    batch_create = False
+    # Read-only actions anyone may use
+    public_actions = ["list", "retrieve"]
 
     def get_permissions(self):
-        if self.action in ["list", "retrieve"]:
+        if self.action in self.public_actions:
             permission_classes = []
         else:
             permission_classes = [IsAuthenticated]
         return [permission() for permission in permission_classes]
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != "list" or self.filter_serializer_class is None:
+            return queryset
+
+        params = self.filter_serializer_class(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        self.keyset_options = {
+            "descending": params.validated_data["ordering"] == "-created_date",
+            "since": params.validated_data.get("created_after"),
+        }
+        return params.filter(queryset)
+
+    def get_expanded(self) -> Set[str]:
+        """
+        The `expand` paths requested, with every prefix of each:
+        "threads.messages" gives {"threads", "threads.messages"}. "~all"
+        expands every field on the first level.
+        """
+        expanded = set()
+        for path in self.request.query_params.get("expand", "").split(","):
+            parts = path.split(".")
+            if parts[0] == "~all":
+                expandable = self.get_serializer_class().Meta.expandable_fields
+                expanded.update(expandable)
+            elif parts[0]:
+                expanded.update(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+        return expanded
+
+    def get_vary(self) -> tuple:
+        """
+        What a representation depends on besides the rows: the response format,
+        and the user, whom the browsable API shows.
+        """
+        return self.request.accepted_renderer.format, self.request.user.pk or 0
+
+    def get_list_validators(self) -> Optional[conditional.Validators]:
+        return None
+
+    def get_object_validators(self) -> Optional[conditional.Validators]:
+        return None
+
+    def list(self, request, *args, **kwargs):
+        if self.use_values():
+            render = self.list_values
+        else:
+            render = partial(super().list, request, *args, **kwargs)
+        return conditional.respond(request, self.get_list_validators(), render)
+
+    def retrieve(self, request, *args, **kwargs):
+        if self.use_values():
+            render = self.retrieve_values
+        else:
+            render = partial(super().retrieve, request, *args, **kwargs)
+        return conditional.respond(request, self.get_object_validators(), render)
+
+    def create(self, request, *args, **kwargs):
+        if self.batch_create and isinstance(request.data, list):
+            return self.create_batch(request.data)
+        return super().create(request, *args, **kwargs)
+
+    @retry_on_lock
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+
+    @retry_on_lock
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+
+    @retry_on_lock
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+
+    @retry_on_lock
+    def create_batch(self, items: list) -> Response:
+        """
+        Validates each item, then inserts all the valid ones in one
+        transaction, with counters, search and word counts updated once for
+        the batch rather than once per row.
+
+        An item repeating a unique value of an earlier item in the batch is
+        invalid too.
+
+        Responds 201 with the created rows and the errors of the invalid
+        items, keyed by their index in the list, if anything was created, and
+        otherwise 400 with the errors.
+        """
+        max_size = settings.MESSAGEBOARD_API_MAX_BATCH_SIZE
+        if not items:
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: ["Expected a non-empty list."]}
+            )
+        if len(items) > max_size:
+            raise ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        f"At most {max_size} items can be created at once."
+                    ]
+                }
+            )
+
+        serializer = self.get_serializer()
+        preload_related(serializer, items)
+        model = self.queryset.model
+        unique = unique_fields(serializer)
+        accepted = set()
+        instances, errors = [], {}
+        for index, item in enumerate(items):
+            try:
+                data = serializer.run_validation(item)
+                values = {
+                    (name, data.get(source)) for name, (source, _) in unique.items()
+                }
+                # Values the table doesn't have yet, but an earlier item does
+                repeated = {name: [unique[name][1]] for name, _ in values & accepted}
+                if repeated:
+                    raise ValidationError(repeated, code="unique")
+            except ValidationError as exc:
+                errors[index] = exc.detail
+            else:
+                accepted |= values
+                instances.append(model(**data))
+
+        model.objects.create_batch(instances)
+        created = self.get_serializer(instances, many=True).data
+        return Response(
+            {"created": created, "errors": errors},
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST,
+        )
+
+    def use_values(self) -> bool:
+        """
+        Whether the response can be built by a ValuesSerializer: every field
+        is shown, and none expanded.
+        """
+        params = self.request.query_params
+        return not any(
+            name in params for name in (EXPAND_PARAM, FIELDS_PARAM, OMIT_PARAM)
+        )
+
+    def get_values_serializer(self) -> ValuesSerializer:
+        serializer_class = self.get_serializer_class()
+        if serializer_class not in _values_serializers:
+            _values_serializers[serializer_class] = ValuesSerializer(serializer_class)
+        return _values_serializers[serializer_class]
+
+    def list_values(self) -> Response:
+        values = self.get_values_serializer()
+        rows = values.rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(values.represent(rows))
+        return self.get_paginated_response(values.represent(page))
+
+    def retrieve_values(self) -> Response:
+        values = self.get_values_serializer()
+        rows = values.rows(self.filter_queryset(self.get_queryset()))
+        try:
+            row = rows.filter(pk=self.kwargs["pk"]).first()
+        except (TypeError, ValueError):
+            row = None
+        if row is None:
+            raise Http404
+        return Response(values.represent([row])[0])
+
+    def get_validated_row(self, *fields: str):
+        """
+        Returns `fields` of the requested row, or None if there is no such row.
+        """
+        try:
+            return (
+                self.get_queryset()
+                .filter(pk=self.kwargs["pk"])
+                .values_list(*fields)
+                .first()
+            )
+        except (TypeError, ValueError):
+            return None
+
 
 class TopicViewSet(BaseAuthViewSet):
     """
@@ -36,6 +287,21 @@ class TopicViewSet(BaseAuthViewSet):
 
     serializer_class = TopicSerializer
     queryset = Topic.objects.all()
+    pagination_class = IdCursorPagination
+
+    def get_queryset(self):
+        # Expanded Threads and Messages are prefetched, a query per level
+        expanded = self.get_expanded()
+        if "threads" in expanded:
+            return self.queryset.with_threads(messages="threads.messages" in expanded)
+        return super().get_queryset()
+
+    def get_list_validators(self) -> conditional.Validators:
+        return conditional.topic_list(*self.get_vary())
+
+    def get_object_validators(self) -> Optional[conditional.Validators]:
+        row = self.get_validated_row("modified_date", "thread_count")
+        return row and conditional.validators(*row, *self.get_vary())
 
 
 class ThreadViewSet(BaseAuthViewSet):
@@ -53,6 +319,21 @@ class ThreadViewSet(BaseAuthViewSet):
 
     serializer_class = ThreadSerializer
     queryset = Thread.objects.all()
+    filter_serializer_class = ThreadFilterSerializer
+    batch_create = True
+
+    def get_queryset(self):
+        # Expanded Messages are prefetched with a single query
+        if "messages" in self.get_expanded():
+            return self.queryset.with_messages()
+        return super().get_queryset()
+
+    def get_list_validators(self) -> conditional.Validators:
+        return conditional.thread_list(*self.get_vary())
+
+    def get_object_validators(self) -> Optional[conditional.Validators]:
+        row = self.get_validated_row("modified_date", "message_count")
+        return row and conditional.validators(*row, *self.get_vary())
 
 
 class MessageViewSet(BaseAuthViewSet):
@@ -70,3 +351,83 @@ class MessageViewSet(BaseAuthViewSet):
 
     serializer_class = MessageSerializer
     queryset = Message.objects.all()
+    filter_serializer_class = MessageFilterSerializer
+    batch_create = True
+    public_actions = BaseAuthViewSet.public_actions + ["search"]
+
+    def get_list_validators(self) -> Optional[conditional.Validators]:
+        return conditional.message_list(*self.get_vary())
+
+    def get_object_validators(self) -> Optional[conditional.Validators]:
+        # Every change to a Message marks its Thread as modified, except for
+        # Messages without a Thread, which are never answered with 304, like
+        # the list while it holds any
+        row = self.get_validated_row("thread__modified_date", "id")
+        return row and row[0] and conditional.validators(*row, *self.get_vary())
+
+    @action(detail=False)
+    def search(self, request):
+        """
+        Full-text search over Message content, best match first.
+
+        Query parameters:
+            q: Words to search for; every word must match.
+            thread: Only search this Thread id.
+            topic: Only search this Topic id.
+            limit: Maximum number of results (default 20, at most 100).
+            offset: Number of results to skip.
+        """
+        params = MessageSearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        messages = search_messages(
+            params.validated_data["q"],
+            thread_id=params.validated_data.get("thread"),
+            topic_id=params.validated_data.get("topic"),
+            limit=params.validated_data["limit"],
+            offset=params.validated_data["offset"],
+        )
+        return Response(MessageSearchSerializer(messages, many=True).data)
+
+
+class StatsViewSet(viewsets.ViewSet):
+    """
+    Django REST Framework Viewset for board-wide statistics.
+
+    Every figure is computed with SQL aggregates over the counters kept on
+    Topics and Threads, so clients no longer download each Message to count
+    them. The report is cached for `MESSAGEBOARD_STATS_TTL` seconds.
+    """
+
+    authentication_classes = ()
+    permission_classes = ()
+
+    def list(self, request):
+        """
+        Totals, per-topic counts, messages per thread (min, max, average and
+        percentiles) and per-author totals.
+        """
+        response = Response(board_stats())
+        patch_cache_control(
+            response, public=True, max_age=settings.MESSAGEBOARD_STATS_TTL
+        )
+        return response
+
+    @action(detail=False)
+    def words(self, request):
+        """
+        The most used words on the whole board, or in one Topic or Thread.
+
+        Query parameters:
+            top: Number of words (default 10, at most 1000).
+            topic: Only count this Topic id.
+            thread: Only count this Thread id.
+        """
+        params = WordCountQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        if "thread" in params.validated_data:
+            scope = wordcounts.thread_scope(params.validated_data["thread"])
+        elif "topic" in params.validated_data:
+            scope = wordcounts.topic_scope(params.validated_data["topic"])
+        else:
+            scope = wordcounts.BOARD
+        return Response(wordcounts.top_words(scope, params.validated_data["top"]))
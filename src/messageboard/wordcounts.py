@@ -0,0 +1,264 @@
+"""
+Word frequencies of Message content, per board, Topic and Thread.
+
+The WordCount table holds one row per (scope, word) with the number of times
+the word is used in that scope's Messages. It is kept in step by the handlers
+in messageboard.signals, which apply only the words a write adds or removes,
+and can be rebuilt wholesale with `rebuild` (or the `rebuild_word_counts`
+management command).
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from django.db import connection
+
+from messageboard import tokens
+from messageboard.models import Message, Thread, WordCount
+
+TABLE = WordCount._meta.db_table
+
+# Scope of the whole board
+BOARD = ""
+
+# Longer "words" are almost always pasted noise; they aren't counted
+MAX_WORD_LENGTH = WordCount._meta.get_field("word").max_length
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits text into lowercase words, as `messageboard.tokens` does.
+    """
+    return [word for word in tokens.words(text) if len(word) <= MAX_WORD_LENGTH]
+
+
+def topic_scope(topic_id: int) -> str:
+    return f"topic:{topic_id}"
+
+
+def thread_scope(thread_id: int) -> str:
+    return f"thread:{thread_id}"
+
+
+def scopes(thread_id: Optional[int], topic_id: Optional[int] = None) -> List[str]:
+    """
+    Returns the scopes a Message in the given Thread and Topic counts towards.
+    """
+    found = [BOARD]
+    if thread_id is not None:
+        found.append(thread_scope(thread_id))
+    if topic_id is not None:
+        found.append(topic_scope(topic_id))
+    return found
+
+
+def message_scopes(thread_id: Optional[int]) -> List[str]:
+    """
+    Returns the scopes a Message in the given Thread counts towards, looking
+    up the Thread's Topic.
+    """
+    if thread_id is None:
+        return scopes(None)
+    topic_id = (
+        Thread.objects.filter(pk=thread_id).values_list("topic_id", flat=True).first()
+    )
+    return scopes(thread_id, topic_id)
+
+
+def add_counts(counts: Counter, in_scopes: Iterable[str]) -> None:
+    """
+    Adds `counts` to each scope with one upsert per (scope, word).
+    """
+    rows = [
+        (scope, word, count)
+        for scope in in_scopes
+        for word, count in counts.items()
+        if count > 0
+    ]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {TABLE} (scope, word, count) VALUES (%s, %s, %s) "
+            f"ON CONFLICT (scope, word) DO UPDATE SET count = count + excluded.count",
+            rows,
+        )
+
+
+def subtract_counts(counts: Counter, in_scopes: Iterable[str]) -> None:
+    """
+    Subtracts `counts` from each scope, dropping words no longer used.
+    """
+    in_scopes = list(in_scopes)
+    rows = [
+        (count, scope, word)
+        for scope in in_scopes
+        for word, count in counts.items()
+        if count > 0
+    ]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"UPDATE {TABLE} SET count = MAX(count - %s, 0) "
+            f"WHERE scope = %s AND word = %s",
+            rows,
+        )
+    WordCount.objects.filter(scope__in=in_scopes, count=0).delete()
+
+
+def add_message(content: str, thread_id: Optional[int]) -> None:
+    add_counts(Counter(tokenize(content)), message_scopes(thread_id))
+
+
+def add_messages(messages: Iterable[Message]) -> None:
+    """
+    Adds the words of many new Messages, e.g. a batch created together, with
+    one upsert per scope rather than per Message.
+    """
+    per_thread: Dict[Optional[int], Counter] = {}
+    for message in messages:
+        per_thread.setdefault(message.thread_id, Counter()).update(
+            tokenize(message.content)
+        )
+    topic_ids = dict(
+        Thread.objects.filter(pk__in=[pk for pk in per_thread if pk is not None])
+        .values_list("id", "topic_id")
+    )
+
+    totals: Dict[str, Counter] = {}
+    for thread_id, counts in per_thread.items():
+        for scope in scopes(thread_id, topic_ids.get(thread_id)):
+            totals.setdefault(scope, Counter()).update(counts)
+    for scope, counts in totals.items():
+        add_counts(counts, [scope])
+
+
+def remove_message(content: str, thread_id: Optional[int]) -> None:
+    subtract_counts(Counter(tokenize(content)), message_scopes(thread_id))
+
+
+def change_message(
+    old_content: str,
+    old_thread_id: Optional[int],
+    content: str,
+    thread_id: Optional[int],
+) -> None:
+    """
+    Applies an edited Message: only the difference between its old and new
+    words is written, unless it also moved to another Thread.
+    """
+    if old_thread_id != thread_id:
+        remove_message(old_content, old_thread_id)
+        add_message(content, thread_id)
+        return
+    if old_content == content:
+        return
+
+    old, new = Counter(tokenize(old_content)), Counter(tokenize(content))
+    in_scopes = message_scopes(thread_id)
+    subtract_counts(old - new, in_scopes)
+    add_counts(new - old, in_scopes)
+
+
+def _write(counts: Dict[str, Counter]) -> int:
+    """
+    Inserts fresh rows for scopes with no existing rows.
+
+    Returns:
+        int: Number of rows inserted.
+    """
+    rows = [
+        (scope, word, count)
+        for scope, words in counts.items()
+        for word, count in words.items()
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {TABLE} (scope, word, count) VALUES (%s, %s, %s)", rows
+        )
+    return len(rows)
+
+
+def move_thread(
+    thread_id: int, old_topic_id: Optional[int], topic_id: Optional[int]
+) -> None:
+    """
+    Moves a Thread's words from one Topic's counts to another's, e.g. after
+    the Thread moved between them, or out of its Topic when it is deleted.
+    The Thread's own counts are applied with one statement per Topic, without
+    reading its Messages.
+    """
+    if old_topic_id == topic_id:
+        return
+    source = thread_scope(thread_id)
+    with connection.cursor() as cursor:
+        if old_topic_id is not None:
+            cursor.execute(
+                f"UPDATE {TABLE} SET count = MAX(count - ("
+                f"SELECT moved.count FROM {TABLE} AS moved "
+                f"WHERE moved.scope = %s AND moved.word = {TABLE}.word), 0) "
+                f"WHERE scope = %s AND word IN ("
+                f"SELECT word FROM {TABLE} WHERE scope = %s)",
+                [source, topic_scope(old_topic_id), source],
+            )
+            WordCount.objects.filter(scope=topic_scope(old_topic_id), count=0).delete()
+        if topic_id is not None:
+            # "WHERE true" lets SQLite tell the upsert clause from a join
+            cursor.execute(
+                f"INSERT INTO {TABLE} (scope, word, count) "
+                f"SELECT %s, word, count FROM {TABLE} WHERE scope = %s AND true "
+                f"ON CONFLICT (scope, word) DO UPDATE SET count = count + excluded.count",
+                [topic_scope(topic_id), source],
+            )
+
+
+def drop_scope(scope: str) -> None:
+    WordCount.objects.filter(scope=scope).delete()
+
+
+def rebuild(chunk_size: int = 2000) -> int:
+    """
+    Rebuilds every count from the Message table in one pass.
+
+    Messages are read in Thread order, so only the current Thread's counts,
+    the Topics' and the board's are held in memory at once.
+
+    Returns:
+        int: Number of rows written.
+    """
+    WordCount.objects.all().delete()
+    rows = (
+        Message.objects.order_by("thread_id")
+        .values_list("content", "thread_id", "thread__topic_id")
+        .iterator(chunk_size=chunk_size)
+    )
+
+    written = 0
+    totals = {BOARD: Counter()}
+    current_thread, thread_counts = None, Counter()
+    for content, thread_id, topic_id in rows:
+        if thread_id != current_thread:
+            if current_thread is not None:
+                written += _write({thread_scope(current_thread): thread_counts})
+            current_thread, thread_counts = thread_id, Counter()
+        words = tokenize(content)
+        totals[BOARD].update(words)
+        if thread_id is not None:
+            thread_counts.update(words)
+        if topic_id is not None:
+            totals.setdefault(topic_scope(topic_id), Counter()).update(words)
+    if current_thread is not None:
+        written += _write({thread_scope(current_thread): thread_counts})
+    return written + _write(totals)
+
+
+def top_words(scope: str = BOARD, limit: int = 10) -> List[dict]:
+    """
+    Returns the `limit` most used words in a scope, most used first.
+    """
+    return list(
+        WordCount.objects.filter(scope=scope)
+        .order_by("-count", "word")
+        .values("word", "count")[:limit]
+    )
@@ -1,8 +1,31 @@
-import json
-from typing import Dict, List
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TypeVar
+from urllib.parse import urlencode
 
 import requests
-from textblob import TextBlob, download_corpora
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from textstats import analyze_parallel
+
+T = TypeVar("T")
+
+
+def _parse_datetime(value: str) -> datetime:
+    """
+    Parses a date-time as the API formats them: ISO 8601 with an offset, or
+    "Z" for UTC, and optional microseconds.
+    """
+    if value.endswith("Z"):
+        value = value[:-1] + "+0000"
+    elif value[-3] == ":":
+        value = value[:-3] + value[-2:]
+    return datetime.strptime(
+        value, "%Y-%m-%dT%H:%M:%S.%f%z" if "." in value else "%Y-%m-%dT%H:%M:%S%z"
+    )
 
 
 class MessageBoardAPIWrapper:
@@ -10,53 +33,164 @@ class MessageBoardAPIWrapper:
     Wrapper around the messageboard API
 
     http://localhost:8080/api/
+
+    Requests go through one keep-alive session with a connection pool sized to
+    `concurrency`. Lists are split into date ranges, walked concurrently. Failed
+    GETs (connection errors, 429 and 5xx responses) are retried with exponential
+    backoff.
     """
 
-    def __init__(self, base_api_url: str = "http://localhost:8080/api/"):
+    def __init__(
+        self,
+        base_api_url: str = "http://localhost:8080/api/",
+        concurrency: int = 8,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30,
+    ):
         self.base_api_url = base_api_url
-        self.messages = [message["content"] for message in self._api_get("messages/")]
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+        )
+        adapter = HTTPAdapter(pool_maxsize=self.concurrency, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _get(self, url: str):
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _api_get(self, query: str):
+        return self._get(f"{self.base_api_url}{query}")
+
+    def _map(self, func: Callable[[str], T], items: Iterable[str]) -> Iterator[T]:
+        """
+        Calls `func` on each of `items` with up to `concurrency` calls in
+        flight, yielding the results in order. Only a bounded window of items is
+        in flight or waiting to be consumed at a time.
+        """
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while True:
+                window = list(islice(items, self.concurrency * 2))
+                if not window:
+                    return
+                yield from executor.map(func, window)
+
+    def _walk(self, query: str) -> Iterator[List[dict]]:
+        """
+        Yields each page of results of a list endpoint, following its cursor
+        `next` links and fetching the next page while this one is consumed.
+        Accepts unpaginated responses (a plain list) as a single page.
+        """
+        page = self._api_get(query)
+        if isinstance(page, list):
+            yield page
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            while True:
+                future = executor.submit(self._get, page["next"]) if page["next"] else None
+                yield page["results"]
+                if future is None:
+                    return
+                page = future.result()
+
+    def _windows(self, query: str, count: int) -> List[str]:
+        """
+        Splits a list endpoint ordered by `created_date` into `count` queries
+        over consecutive `created_after` (inclusive) and `created_before`
+        (exclusive) ranges, spanning its first to its last row.
+        """
+        first = self._api_get(f"{query}&page_size=1&ordering=created_date")
+        last = self._api_get(f"{query}&page_size=1&ordering=-created_date")
+        if not first["results"]:
+            return [query]
+
+        start = _parse_datetime(first["results"][0]["created_date"])
+        end = _parse_datetime(last["results"][0]["created_date"])
+        end += timedelta(microseconds=1)
+        step = (end - start) / count
+        bounds = [start + step * i for i in range(count)] + [end]
+        return [
+            f"{query}&"
+            + urlencode(
+                {
+                    "created_after": after.isoformat(),
+                    "created_before": before.isoformat(),
+                }
+            )
+            for after, before in zip(bounds, bounds[1:])
+        ]
+
+    def _iter_pages(self, query: str) -> Iterator[List[dict]]:
+        """
+        Yields each page of results of a list endpoint ordered by
+        `created_date`, in order. The list is split into date ranges, and up to
+        `concurrency` ranges are walked at once.
+        """
+        if self.concurrency == 1:
+            yield from self._walk(query)
+            return
 
-        # Make sure the default tokenizers are downloaded for word/sentence analysis
-        try:
-            download_corpora.nltk.find("tokenizers/punkt")
-        except LookupError:
-            download_corpora.nltk.download("punkt")
+        windows = self._windows(query, self.concurrency * 4)
+        for pages in self._map(lambda window: list(self._walk(window)), windows):
+            yield from pages
+
+    def _iter_results(self, query: str) -> Iterator[dict]:
+        for results in self._iter_pages(query):
+            yield from results
+
+    def iter_messages(self, page_size: int = 1000) -> Iterator[str]:
+        """
+        Yields the content of every message, oldest first, following the API's
+        cursor pages. The server caps `page_size`.
+        """
+        for message in self._iter_results(f"messages/?page_size={page_size}"):
+            yield message["content"]
 
-    def _api_get(self, query: str) -> List[dict]:
-        result = requests.get(f"{self.base_api_url}{query}")
-        return result.json()
+    def stats(self) -> dict:
+        """
+        Returns the board statistics the server computes in SQL.
+        """
+        return self._api_get("stats/")
 
     def num_messages(self) -> int:
         """
         Returns the total number of messages.
         """
 
-        return len(self.messages)
+        return self.stats()["message_count"]
 
-    def most_common_word(self) -> str:
+    def most_common_word(self) -> Optional[str]:
         """
-        Returns the most frequently used word in messages.
+        Returns the most frequently used word in messages, or None if there
+        are no words yet.
         """
-        words = TextBlob(" ".join(self.messages))
-        return sorted(words.word_counts.items(), key=lambda x: x[1], reverse=True)[0][0]
+        words = self._api_get("stats/words/?top=1")
+        return words[0]["word"] if words else None
 
     def avg_num_words_per_sentence(self) -> float:
         """
         Returns the average number of words per sentence.
         """
-        words = TextBlob(" ".join(self.messages))
-        return round(len(words.words) / len(words.sentences), 2)
+        return analyze_parallel(self.iter_messages()).avg_words_per_sentence()
 
     def avg_num_msg_thread_topic(self) -> Dict[str, float]:
         """
         Returns the average number of messages per thread, per topic.
         """
-        topics = self._api_get("topics/")
-        topics_dict = {}
-        for topic in topics:
-            topics_dict[topic["title"]] = round(topic["message_count"] / topic["thread_count"], 2)
-
-        return topics_dict
+        return {
+            topic["title"]: topic["avg_messages_per_thread"]
+            for topic in self.stats()["topics"]
+        }
 
     def _as_dict(self) -> dict:
         """
@@ -67,19 +201,31 @@ class MessageBoardAPIWrapper:
     def to_json(self) -> None:
         """
         Dumps the entire messageboard to a JSON file.
+
+        Streams the export endpoint straight to disk, so neither the server nor
+        this script holds the whole board in memory.
         """
 
-        with open("messageboard.json", "w") as f:
-            # f.write(json.dumps(self._as_dict(), indent=4))
-            f.write(json.dumps(self._api_get("topics/?expand=threads.messages"), indent=4))
+        url = f"{self.base_api_url}export/"
+        with self.session.get(url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            with open("messageboard.json", "wb") as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    f.write(chunk)
 
 
 def main():
     """
     Returns information about the messageboard application
     """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--api-url", default="http://localhost:8080/api/")
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Maximum requests in flight."
+    )
+    args = parser.parse_args()
 
-    messageboard = MessageBoardAPIWrapper()
+    messageboard = MessageBoardAPIWrapper(args.api_url, concurrency=args.concurrency)
 
     print(f"Total number of messages: {messageboard.num_messages()}")
     print(f"Most common word: {messageboard.most_common_word()}")
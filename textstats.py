@@ -0,0 +1,163 @@
+"""
+Single-pass text statistics over a stream of messages.
+
+Each message is tokenized exactly once, producing its word counts, word total
+and sentence count together. Results from separate messages (or separate
+worker processes) are merged by adding them up, so a corpus can be analyzed
+as a stream, in shards across a process pool, without ever joining it into
+one string.
+
+Tokenization follows what TextBlob reports for the space-joined messages on
+ordinary prose:
+
+- words are runs of letters and digits, counted in lowercase, the same split
+  as the board's own word counts (`messageboard.tokens`);
+- a sentence ends at `.`, `!` or `?` followed by whitespace, except for a
+  `.` after an initial ("J.") or a common abbreviation ("Dr.");
+- a message that doesn't end a sentence runs on into the next message.
+"""
+
+import os
+import re
+from collections import Counter
+from itertools import islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+# The same as messageboard.tokens.WORD_RE; this script doesn't import the server
+WORD_RE = re.compile(r"\w+")
+SENTENCE_END_RE = re.compile(r"[.!?]+(?=\s|$)")
+
+ABBREVIATIONS = frozenset(
+    ["dr", "e.g", "etc", "i.e", "jr", "mr", "mrs", "ms", "no", "sr", "st", "vs"]
+)
+
+
+class TextStats:
+    """
+    Word counts, word total and sentence total of some text. Adding two
+    TextStats gives the statistics of the two texts joined by a space.
+
+    Attributes:
+        word_counts (Counter): Uses of each lowercase word.
+        words (int): Number of words.
+        ended (int): Number of sentences ended.
+        open (bool): Whether the text ends in the middle of a sentence.
+    """
+
+    __slots__ = ("word_counts", "words", "ended", "open")
+
+    def __init__(
+        self,
+        word_counts: Counter = None,
+        words: int = 0,
+        ended: int = 0,
+        open: bool = False,
+    ):
+        self.word_counts = Counter() if word_counts is None else word_counts
+        self.words = words
+        self.ended = ended
+        self.open = open
+
+    @property
+    def sentences(self) -> int:
+        return self.ended + self.open
+
+    def update(self, other: "TextStats") -> "TextStats":
+        """
+        Adds `other`, the text following this one, in place.
+        """
+        self.word_counts.update(other.word_counts)
+        self.words += other.words
+        self.ended += other.ended
+        if other.ended or other.open:
+            # An open sentence here is either ended by `other` or still open
+            self.open = other.open
+        return self
+
+    def __add__(self, other: "TextStats") -> "TextStats":
+        merged = TextStats(Counter(self.word_counts), self.words, self.ended, self.open)
+        return merged.update(other)
+
+    def most_common_word(self) -> Optional[str]:
+        """
+        Returns the most used word. Ties go to the word seen first.
+        """
+        common = self.word_counts.most_common(1)
+        return common[0][0] if common else None
+
+    def avg_words_per_sentence(self) -> float:
+        return round(self.words / self.sentences, 2) if self.sentences else 0.0
+
+
+def _sentences(text: str) -> Tuple[int, bool]:
+    """
+    Returns the number of sentences `text` ends, and whether it ends in the
+    middle of one.
+    """
+    ended, tail = 0, 0
+    for match in SENTENCE_END_RE.finditer(text):
+        if match.group() == ".":
+            # An initial or abbreviation doesn't end the sentence
+            end = match.start()
+            start = max(text.rfind(" ", 0, end), text.rfind("\n", 0, end)) + 1
+            token = text[start:end]
+            if (len(token) == 1 and token.isalpha()) or token.lower() in ABBREVIATIONS:
+                continue
+        ended, tail = ended + 1, match.end()
+    return ended, tail < len(text) and not text[tail:].isspace()
+
+
+def analyze(text: str) -> TextStats:
+    """
+    Tokenizes one message.
+    """
+    words = WORD_RE.findall(text.lower())
+    return TextStats(Counter(words), len(words), *_sentences(text))
+
+
+def analyze_all(texts: Iterable[str]) -> TextStats:
+    """
+    Tokenizes a stream of messages in this process.
+    """
+    # The same as adding up `analyze` of each message, without building the
+    # intermediate TextStats
+    word_counts, words, ended, open = Counter(), 0, 0, False
+    for text in texts:
+        tokens = WORD_RE.findall(text.lower())
+        word_counts.update(tokens)
+        words += len(tokens)
+        text_ended, text_open = _sentences(text)
+        ended += text_ended
+        if text_ended or text_open:
+            open = text_open
+    return TextStats(word_counts, words, ended, open)
+
+
+def _chunks(texts: Iterable[str], size: int) -> Iterator[List[str]]:
+    texts = iter(texts)
+    while True:
+        chunk = list(islice(texts, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def analyze_parallel(
+    texts: Iterable[str], workers: int = None, chunk_size: int = 1000
+) -> TextStats:
+    """
+    Tokenizes a stream of messages across a process pool: chunks of
+    `chunk_size` messages are analyzed by `workers` processes (default: one
+    per CPU) and the partial results merged in stream order as they come
+    back, so the result, ties included, is the same as `analyze_all`.
+    """
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        return analyze_all(texts)
+
+    stats = TextStats()
+    with Pool(workers) as pool:
+        for partial in pool.imap(analyze_all, _chunks(texts, chunk_size)):
+            stats.update(partial)
+    return stats